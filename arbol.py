@@ -0,0 +1,313 @@
+from array import array
+from tablas_compiladas import ACEPTAR
+from simbolos import ID_FIN
+
+class ArbolSintactico:
+    """
+    Árbol sintáctico guardado en arreglos paralelos (un índice por nodo) en vez de un objeto por nodo.
+
+    Cada nodo ocupa una posición en cinco arreglos de enteros, asi un árbol de millones de nodos
+    ocupa unos 20 bytes por nodo. Los hijos de un nodo forman una lista enlazada: 'primer_hijo'
+    apunta al primero y 'siguiente_hermano' a cada uno de los siguientes (-1 si no hay).
+
+    Atributos:
+    - simbolos (TablaSimbolos): La tabla de símbolos de la gramática.
+    - simbolo (array): Por nodo, el id del terminal (>= 0) o -(id + 1) si es un no terminal.
+    - primer_hijo (array): Por nodo, su primer hijo o -1.
+    - siguiente_hermano (array): Por nodo, el siguiente hijo del mismo padre o -1.
+    - inicio (array): Por nodo, la posición del primer token que cubre.
+    - fin (array): Por nodo, la posición siguiente al último token que cubre (igual a inicio si no cubre ninguno).
+    - raiz (int): El nodo raíz, o -1 si la cadena no fue aceptada.
+    """
+
+    def __init__(self, simbolos):
+        self.simbolos = simbolos
+        self.simbolo = array('i')
+        self.primer_hijo = array('i')
+        self.siguiente_hermano = array('i')
+        self.inicio = array('i')
+        self.fin = array('i')
+        self.raiz = -1
+
+    def __len__(self):
+        return len(self.simbolo)
+
+    def codigo(self, nombre):
+        """Código de un símbolo en el arreglo 'simbolo': su id si es terminal, -(id + 1) si es no terminal."""
+        id_no_terminal = self.simbolos.id_no_terminal.get(nombre)
+        if id_no_terminal is not None:
+            return -id_no_terminal - 1
+        return self.simbolos.agregar_terminal(nombre)
+
+    def agregar(self, codigo, inicio, fin=-1):
+        """Crea un nodo sin hijos y devuelve su índice."""
+        self.simbolo.append(codigo)
+        self.primer_hijo.append(-1)
+        self.siguiente_hermano.append(-1)
+        self.inicio.append(inicio)
+        self.fin.append(fin)
+        return len(self.simbolo) - 1
+
+    def enlazar(self, padre, hijos):
+        """Hace de la lista 'hijos' (índices de nodos, en orden) los hijos de 'padre'."""
+        if hijos:
+            self.primer_hijo[padre] = hijos[0]
+            for anterior, siguiente in zip(hijos, hijos[1:]):
+                self.siguiente_hermano[anterior] = siguiente
+
+    def completar_intervalos(self):
+        """
+        Calcula el 'fin' de cada no terminal a partir de sus hijos (lo usan los parsers descendentes,
+        que crean cada nodo antes de saber dónde termina). Los hijos siempre se crean después que su
+        padre, asi que basta con recorrer los nodos de atrás hacia adelante.
+        """
+        primer_hijo = self.primer_hijo
+        siguiente_hermano = self.siguiente_hermano
+        fin = self.fin
+        for k in range(len(self.simbolo) - 1, -1, -1):
+            if self.simbolo[k] < 0:
+                hijo = primer_hijo[k]
+                if hijo == -1:
+                    fin[k] = self.inicio[k]
+                    continue
+                while siguiente_hermano[hijo] != -1:
+                    hijo = siguiente_hermano[hijo]
+                fin[k] = fin[hijo]
+
+    def es_terminal(self, nodo):
+        return self.simbolo[nodo] >= 0
+
+    def nombre(self, nodo):
+        """Nombre del símbolo del nodo."""
+        codigo = self.simbolo[nodo]
+        if codigo >= 0:
+            return self.simbolos.terminales[codigo]
+        return self.simbolos.no_terminales[-codigo - 1]
+
+    def hijos(self, nodo):
+        """Itera los hijos de un nodo, de izquierda a derecha."""
+        hijo = self.primer_hijo[nodo]
+        while hijo != -1:
+            yield hijo
+            hijo = self.siguiente_hermano[hijo]
+
+    def preorden(self, nodo=None):
+        """
+        Itera los nodos del subárbol de 'nodo' (por defecto, de la raíz) en preorden: cada nodo antes que sus hijos.
+        El recorrido es iterativo, asi que la profundidad del árbol no está limitada por la recursión de Python.
+        """
+        if nodo is None:
+            nodo = self.raiz
+        if nodo < 0:
+            return
+        primer_hijo = self.primer_hijo
+        siguiente_hermano = self.siguiente_hermano
+
+        yield nodo
+        pendientes = [] # Hermanos que faltan por visitar en cada nivel
+        k = primer_hijo[nodo]
+        while True:
+            while k != -1:
+                yield k
+                pendientes.append(siguiente_hermano[k])
+                k = primer_hijo[k]
+            while k == -1:
+                if not pendientes:
+                    return
+                k = pendientes.pop()
+
+    def postorden(self, nodo=None):
+        """Itera los nodos del subárbol de 'nodo' (por defecto, de la raíz) en postorden: cada nodo después de sus hijos."""
+        if nodo is None:
+            nodo = self.raiz
+        if nodo < 0:
+            return
+        primer_hijo = self.primer_hijo
+        siguiente_hermano = self.siguiente_hermano
+
+        camino = [nodo] # Los nodos desde 'nodo' hasta el actual
+        k = primer_hijo[nodo]
+        while camino:
+            while k != -1:
+                camino.append(k)
+                k = primer_hijo[k]
+            k = camino.pop()
+            yield k
+            k = siguiente_hermano[k] if camino else -1
+
+    def a_tuplas(self, nodo=None):
+        """
+        Convierte el subárbol de 'nodo' (por defecto, de la raíz) en tuplas anidadas, para depurar.
+
+        Los terminales quedan como su nombre y los no terminales como (nombre, hijo1, hijo2, ...); por
+        ejemplo ('S', ('A', 'a', ('A',)), ('B', 'b')). La conversión solo se hace al llamar este método.
+        """
+        if nodo is None:
+            nodo = self.raiz
+        if nodo < 0:
+            return None
+        convertidos = [] # Pila de subárboles ya convertidos, en postorden
+        for k in self.postorden(nodo):
+            if self.simbolo[k] >= 0:
+                convertidos.append(self.nombre(k))
+                continue
+            n = 0
+            hijo = self.primer_hijo[k]
+            while hijo != -1:
+                n += 1
+                hijo = self.siguiente_hermano[hijo]
+            hijos = convertidos[len(convertidos) - n:]
+            del convertidos[len(convertidos) - n:]
+            convertidos.append((self.nombre(k), *hijos))
+        return convertidos[0]
+
+
+def construir_arbol_ll1(tokens, tabla):
+    """
+    Igual que parse_ll1_compilado, pero construye el árbol sintáctico de la cadena.
+
+    Usa una expansión por producción (celdas y cuerpos de la tabla), no las cadenas de expansiones
+    de parse_ll1_compilado, porque cada producción aplicada es un nodo del árbol.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaLL1Compilada): La tabla compilada.
+
+    Retorna:
+    - ArbolSintactico o None: El árbol, o None si la cadena no es aceptada.
+    """
+    ancho = tabla.ancho
+    celdas = tabla.celdas
+    cuerpos = tabla.cuerpos
+    arbol = ArbolSintactico(tabla.simbolos)
+    primer_hijo, siguiente_hermano, inicio, fin = arbol.primer_hijo, arbol.siguiente_hermano, arbol.inicio, arbol.fin
+    # Los nodos se agregan directamente a los arreglos (sin pasar por ArbolSintactico.agregar)
+    nuevo_simbolo = arbol.simbolo.append
+    nuevo_hijo = primer_hijo.append
+    nuevo_hermano = siguiente_hermano.append
+    nuevo_inicio = inicio.append
+    nuevo_fin = fin.append
+
+    # Código de nodo (ver ArbolSintactico.simbolo) de cada código de la pila
+    codigo_nodo = list(range(ancho)) + [-n - 1 for n in range(len(tabla.simbolos.no_terminales))]
+    # Por producción, los códigos de nodo de sus hijos de izquierda a derecha
+    hijos_produccion = [tuple(codigo_nodo[c] for c in reversed(codigos)) for codigos in cuerpos]
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    posicion = 0
+    pila = [ID_FIN, tabla.inicial]
+    nodos = [-1, arbol.agregar(codigo_nodo[tabla.inicial], 0)] # El nodo de cada elemento de la pila
+    total = 1 # Cantidad de nodos
+    while True:
+        tope = pila.pop()
+        nodo = nodos.pop()
+        if tope < ancho:
+            if tope != actual:
+                return None
+            if tope == ID_FIN:
+                arbol.raiz = 0
+                arbol.completar_intervalos()
+                return arbol
+            inicio[nodo] = posicion
+            posicion += 1
+            fin[nodo] = posicion
+            actual = next(entrada, ID_FIN)
+        else:
+            p = celdas[(tope - ancho) * ancho + actual]
+            if p < 0:
+                return None
+            inicio[nodo] = posicion
+            codigos = cuerpos[p] # Ya invertidos: el primer hijo es el último código
+            if codigos:
+                # Los hijos quedan en índices consecutivos, de izquierda a derecha
+                primer_hijo[nodo] = total
+                for c in hijos_produccion[p]:
+                    total += 1
+                    nuevo_simbolo(c)
+                    nuevo_hijo(-1)
+                    nuevo_hermano(total)
+                    nuevo_inicio(posicion)
+                    nuevo_fin(-1)
+                siguiente_hermano[-1] = -1
+                pila.extend(codigos)
+                nodos.extend(range(total - 1, total - len(codigos) - 1, -1))
+
+
+def construir_arbol_slr1(tokens, tabla):
+    """
+    Igual que parse_slr1_compilado, pero construye el árbol sintáctico de la cadena.
+
+    Junto a la pila de estados se lleva la pila de nodos: un shift crea una hoja y un reduce crea
+    el nodo del no terminal y le cuelga los nodos que saca de la pila.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+
+    Retorna:
+    - ArbolSintactico o None: El árbol, o None si la cadena no es aceptada.
+    """
+    ancho = tabla.ancho
+    acciones = tabla.acciones
+    ancho_goto = tabla.ancho_goto
+    goto = tabla.goto
+    cabezas = tabla.cabezas
+    longitudes = tabla.longitudes
+    arbol = ArbolSintactico(tabla.simbolos)
+    siguiente_hermano, inicio, fin = arbol.siguiente_hermano, arbol.inicio, arbol.fin
+    nuevo_simbolo = arbol.simbolo.append
+    nuevo_hijo = arbol.primer_hijo.append
+    nuevo_hermano = siguiente_hermano.append
+    nuevo_inicio = inicio.append
+    nuevo_fin = fin.append
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    posicion = 0
+    pila = [0]
+    nodos = [] # El nodo de cada símbolo de la pila (la pila de estados tiene uno más: el estado 0)
+    total = 0 # Cantidad de nodos
+    while True:
+        accion = acciones[pila[-1] * ancho + actual]
+        if accion > 0:
+            # Shift: una hoja para el terminal
+            pila.append(accion - 1)
+            nodos.append(total)
+            total += 1
+            nuevo_simbolo(actual)
+            nuevo_hijo(-1)
+            nuevo_hermano(-1)
+            nuevo_inicio(posicion)
+            posicion += 1
+            nuevo_fin(posicion)
+            actual = next(entrada, ID_FIN)
+        elif accion < ACEPTAR:
+            # Reduce: el nodo del no terminal toma como hijos los n nodos del tope
+            p = -accion - 1
+            n = longitudes[p]
+            nuevo_simbolo(-cabezas[p] - 1)
+            nuevo_hermano(-1)
+            if n:
+                primero = nodos[-n]
+                anterior = primero
+                for hijo in nodos[len(nodos) - n + 1:]:
+                    siguiente_hermano[anterior] = hijo
+                    anterior = hijo
+                del pila[-n:]
+                del nodos[-n:]
+                nuevo_hijo(primero)
+                nuevo_inicio(inicio[primero])
+                nuevo_fin(fin[anterior])
+            else:
+                nuevo_hijo(-1)
+                nuevo_inicio(posicion)
+                nuevo_fin(posicion)
+            pila.append(goto[pila[-1] * ancho_goto + cabezas[p]])
+            nodos.append(total)
+            total += 1
+        elif accion == ACEPTAR:
+            arbol.raiz = nodos[-1]
+            return arbol
+        else:
+            return None
@@ -0,0 +1,402 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from first import calcular_conjuntos_first
+from follow import calcular_conjuntos_follow
+from verificador_ll1 import es_gramatica_ll1
+from verificador_slr1 import analizar_slr1
+from tabla_ll1 import construir_tabla_ll1
+from tablas_compiladas import compilar_tabla_ll1, compilar_tabla_slr1, parse_ll1_compilado, parse_slr1_compilado
+from tablas_comprimidas import comprimir_tabla_slr1
+
+# Versión del formato del archivo de resultados
+VERSION_RESULTADOS = 1
+ESCALAS = (4, 16, 64)
+TAMANOS = (1000, 10000, 100000)
+REPETICIONES = 3
+# Una medición es una regresión si tarda más que la base por encima de este factor (0.25 = 25% más)
+UMBRAL = 0.25
+# Diferencias menores a esto (en segundos) se consideran ruido del reloj
+MINIMO_SEGUNDOS = 0.0005
+FASES = ('first', 'follow', 'll1', 'slr1', 'tablas')
+
+
+# --- Familias de gramáticas sintéticas ---
+# Cada familia es una pareja de funciones: la gramática de una escala y una cadena aceptada de
+# más o menos 'n' terminales para esa gramática. El símbolo inicial siempre es 'S'.
+
+def gramatica_expresiones(niveles):
+    """
+    Gramática de expresiones con 'niveles' niveles de precedencia, todos asociativos a izquierda:
+    S -> S o0 E1 | E1, E1 -> E1 o1 E2 | E2, ..., y el último nivel -> ( S ) | id. Es SLR(1) pero no LL(1).
+    """
+    nombres = ['S'] + [f'E{i}' for i in range(1, niveles)] + ['P']
+    gramatica = {}
+    for i in range(niveles):
+        gramatica[nombres[i]] = [(nombres[i], f'o{i}', nombres[i + 1]), (nombres[i + 1],)]
+    gramatica['P'] = [('(', 'S', ')'), ('id',)]
+    return gramatica
+
+def entrada_expresiones(niveles, n, azar):
+    """Operandos 'id' con operadores de cualquier nivel, y algunos paréntesis anidados."""
+    cadena = []
+    abiertos = 0
+    while len(cadena) < n:
+        if abiertos < 50 and azar.random() < 0.1:
+            cadena.append('(')
+            abiertos += 1
+            continue
+        cadena.append('id')
+        while abiertos and azar.random() < 0.1:
+            cadena.append(')')
+            abiertos -= 1
+        cadena.append(f'o{azar.randrange(niveles)}')
+    cadena.append('id')
+    cadena.extend(')' * abiertos)
+    return cadena
+
+def gramatica_anulables(largo):
+    """
+    Cadena de 'largo' no terminales anulables: S -> B S | e, B -> A1 A2 ... An x, Ai -> ai | e.
+    First(B) y cada Follow(Ai) juntan los terminales de toda la cadena. Es LL(1) y SLR(1).
+    """
+    gramatica = {'S': [('B', 'S'), ()], 'B': [tuple(f'A{i}' for i in range(1, largo + 1)) + ('x',)]}
+    for i in range(1, largo + 1):
+        gramatica[f'A{i}'] = [(f'a{i}',), ()]
+    return gramatica
+
+def entrada_anulables(largo, n, azar):
+    """Bloques de algunos ai (en orden) terminados en 'x'."""
+    cadena = []
+    while len(cadena) < n:
+        cadena.extend(f'a{i}' for i in range(1, largo + 1) if azar.random() < 0.5)
+        cadena.append('x')
+    return cadena
+
+def gramatica_alternativas(ancho):
+    """
+    Una alternativa muy ancha: S -> I S | e, I -> k0 V | k1 V | ... (ancho alternativas), V -> id | num.
+    Es LL(1) y SLR(1).
+    """
+    return {
+        'S': [('I', 'S'), ()],
+        'I': [(f'k{i}', 'V') for i in range(ancho)],
+        'V': [('id',), ('num',)],
+    }
+
+def entrada_alternativas(ancho, n, azar):
+    """Parejas ki id / ki num al azar."""
+    cadena = []
+    while len(cadena) < n:
+        cadena.append(f'k{azar.randrange(ancho)}')
+        cadena.append(azar.choice(('id', 'num')))
+    return cadena
+
+def gramatica_recursion_izquierda(profundidad):
+    """
+    Recursión a izquierda anidada: S -> S a0 | N1, N1 -> N1 a1 | N2, ..., y el último -> b.
+    Es SLR(1) pero no LL(1).
+    """
+    nombres = ['S'] + [f'N{i}' for i in range(1, profundidad + 1)]
+    gramatica = {}
+    for i in range(profundidad):
+        gramatica[nombres[i]] = [(nombres[i], f'a{i}'), (nombres[i + 1],)]
+    gramatica[nombres[-1]] = [('b',)]
+    return gramatica
+
+def entrada_recursion_izquierda(profundidad, n, azar):
+    """Una 'b' seguida de ai de niveles decrecientes."""
+    niveles = sorted((azar.randrange(profundidad) for _ in range(n - 1)), reverse=True)
+    return ['b'] + [f'a{i}' for i in niveles]
+
+def gramatica_recursion_derecha(profundidad):
+    """
+    Recursión a derecha anidada: S -> a0 S | N1, N1 -> a1 N1 | N2, ..., y el último -> b.
+    Es LL(1) y SLR(1); la pila del SLR(1) crece con toda la entrada.
+    """
+    nombres = ['S'] + [f'N{i}' for i in range(1, profundidad + 1)]
+    gramatica = {}
+    for i in range(profundidad):
+        gramatica[nombres[i]] = [(f'a{i}', nombres[i]), (nombres[i + 1],)]
+    gramatica[nombres[-1]] = [('b',)]
+    return gramatica
+
+def entrada_recursion_derecha(profundidad, n, azar):
+    """ai de niveles crecientes terminados en una 'b'."""
+    niveles = sorted(azar.randrange(profundidad) for _ in range(n - 1))
+    return [f'a{i}' for i in niveles] + ['b']
+
+FAMILIAS = {
+    'expresiones': (gramatica_expresiones, entrada_expresiones),
+    'anulables': (gramatica_anulables, entrada_anulables),
+    'alternativas': (gramatica_alternativas, entrada_alternativas),
+    'recursion_izquierda': (gramatica_recursion_izquierda, entrada_recursion_izquierda),
+    'recursion_derecha': (gramatica_recursion_derecha, entrada_recursion_derecha),
+}
+
+
+# --- Mediciones ---
+
+def medir_fases(gramatica):
+    """
+    Ejecuta una vez cada fase del análisis de la gramática y mide su tiempo por separado.
+
+    Las fases son las de cache.construir_analisis: 'first', 'follow', 'll1' (verificación),
+    'slr1' (autómata LR(0), tablas y conflictos) y 'tablas' (tabla LL(1) si corresponde,
+    tablas compiladas y compresión de las tablas SLR(1) sin conflictos).
+
+    Parametros:
+    - gramatica (dict): La gramática (con símbolo inicial 'S').
+
+    Retorna:
+    - (segundos, tabla_ll1, tabla_slr1, estados): Los segundos de cada fase, las tablas compiladas
+      (tabla_ll1 es None si la gramática no es LL(1), tabla_slr1 es None si tiene conflictos)
+      y la cantidad de estados LR(0).
+    """
+    segundos = {}
+    reloj = time.perf_counter
+
+    inicio = reloj()
+    conjuntos_first = calcular_conjuntos_first(gramatica)
+    segundos['first'] = reloj() - inicio
+
+    inicio = reloj()
+    conjuntos_follow = calcular_conjuntos_follow(gramatica, conjuntos_first)
+    segundos['follow'] = reloj() - inicio
+
+    inicio = reloj()
+    es_ll1 = es_gramatica_ll1(gramatica, conjuntos_first, conjuntos_follow)
+    segundos['ll1'] = reloj() - inicio
+
+    inicio = reloj()
+    tabla_acciones, tabla_goto, conflictos = analizar_slr1(gramatica, conjuntos_follow)
+    segundos['slr1'] = reloj() - inicio
+
+    simbolos = conjuntos_first.simbolos
+    inicio = reloj()
+    tabla_ll1 = None
+    if es_ll1:
+        tabla_ll1 = compilar_tabla_ll1(construir_tabla_ll1(gramatica, conjuntos_first, conjuntos_follow), 'S', simbolos)
+    tabla_slr1 = compilar_tabla_slr1(tabla_acciones, tabla_goto, simbolos)
+    if not conflictos:
+        comprimir_tabla_slr1(tabla_slr1)
+    segundos['tablas'] = reloj() - inicio
+
+    return segundos, tabla_ll1, tabla_slr1 if not conflictos else None, len(tabla_acciones)
+
+def medir_parse(funcion_parse, tabla, cadena, repeticiones):
+    """
+    Mide el mejor tiempo de analizar una cadena con un driver compilado.
+
+    Parametros:
+    - funcion_parse (function): parse_ll1_compilado o parse_slr1_compilado.
+    - tabla: La tabla compilada que usa el driver.
+    - cadena (list): Los terminales de la entrada (deben formar una cadena aceptada).
+    - repeticiones (int): Cuántas veces se analiza; se guarda el menor tiempo.
+
+    Retorna:
+    - float: Los segundos del análisis más rápido. Lanza RuntimeError si la cadena no es aceptada.
+    """
+    tokens = tabla.codificar(cadena)
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        acepta = funcion_parse(tokens, tabla)
+        segundos = time.perf_counter() - inicio
+        if not acepta:
+            raise RuntimeError("La cadena generada para el benchmark no es aceptada por la gramatica.")
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return mejor
+
+def medir_caso(familia, escala, tamanos=TAMANOS, repeticiones=REPETICIONES, semilla=0):
+    """
+    Mide todas las fases de una familia en una escala, y el rendimiento de los parsers que le sirven.
+
+    Parametros:
+    - familia (str): Una clave de FAMILIAS.
+    - escala (int): El parámetro de tamaño de la gramática (niveles, largo, ancho o profundidad).
+    - tamanos (iterable): Las cantidades aproximadas de tokens de las cadenas a analizar.
+    - repeticiones (int): Cuántas veces se repite cada medición; se guarda el menor tiempo.
+    - semilla (int): Semilla de las cadenas generadas, para que las corridas sean comparables.
+
+    Retorna:
+    - dict: El resultado del caso: familia, escala, tamaño de la gramática, si es LL(1)/SLR(1), los
+      segundos de cada fase y, por parser y tamaño de entrada, segundos y tokens por segundo.
+    """
+    generar_gramatica, generar_entrada = FAMILIAS[familia]
+    gramatica = generar_gramatica(escala)
+
+    fases = {}
+    for _ in range(repeticiones):
+        segundos, tabla_ll1, tabla_slr1, estados = medir_fases(gramatica)
+        for fase, valor in segundos.items():
+            fases[fase] = min(fases.get(fase, valor), valor)
+
+    parse = []
+    azar = random.Random(semilla)
+    for n in tamanos:
+        cadena = generar_entrada(escala, n, azar)
+        for parser, funcion_parse, tabla in (('ll1', parse_ll1_compilado, tabla_ll1), ('slr1', parse_slr1_compilado, tabla_slr1)):
+            if tabla is None:
+                continue
+            segundos = medir_parse(funcion_parse, tabla, cadena, repeticiones)
+            parse.append({
+                "parser": parser,
+                "tokens": len(cadena),
+                "segundos": segundos,
+                "tokens_por_segundo": len(cadena) / segundos if segundos else 0.0,
+            })
+
+    return {
+        "familia": familia,
+        "escala": escala,
+        "no_terminales": len(gramatica),
+        "producciones": sum(len(producciones) for producciones in gramatica.values()),
+        "estados_lr0": estados,
+        "es_ll1": tabla_ll1 is not None,
+        "es_slr1": tabla_slr1 is not None,
+        "fases": fases,
+        "parse": parse,
+    }
+
+def ejecutar_benchmark(familias=None, escalas=ESCALAS, tamanos=TAMANOS, repeticiones=REPETICIONES, progreso=None):
+    """
+    Mide cada familia en cada escala (ver medir_caso).
+
+    Parametros:
+    - familias (iterable, opcional): Las familias a medir (por defecto, todas).
+    - escalas (iterable), tamanos (iterable), repeticiones (int): Ver medir_caso.
+    - progreso (function, opcional): Se llama con cada caso apenas termina.
+
+    Retorna:
+    - dict: Los resultados en el formato del archivo: versión, entorno, parámetros y la lista de casos.
+    """
+    casos = []
+    for familia in familias or FAMILIAS:
+        for escala in escalas:
+            caso = medir_caso(familia, escala, tamanos, repeticiones)
+            casos.append(caso)
+            if progreso is not None:
+                progreso(caso)
+    return {
+        "version": VERSION_RESULTADOS,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "repeticiones": repeticiones,
+        "casos": casos,
+    }
+
+def mediciones(resultados):
+    """
+    Aplana los resultados a un diccionario (familia, escala, medición) → segundos.
+
+    Las mediciones de parse se nombran 'parse_<parser>@<tokens>'.
+    """
+    planos = {}
+    for caso in resultados["casos"]:
+        clave = (caso["familia"], caso["escala"])
+        for fase, segundos in caso["fases"].items():
+            planos[clave + (fase,)] = segundos
+        for medicion in caso["parse"]:
+            planos[clave + (f'parse_{medicion["parser"]}@{medicion["tokens"]}',)] = medicion["segundos"]
+    return planos
+
+def comparar_resultados(actuales, base, umbral=UMBRAL, minimo=MINIMO_SEGUNDOS):
+    """
+    Compara dos corridas del benchmark, medición por medición.
+
+    Solo se comparan las mediciones presentes en ambas (mismos casos, fases y tamaños de entrada).
+
+    Parametros:
+    - actuales (dict), base (dict): Resultados en el formato de ejecutar_benchmark.
+    - umbral (float): Aumento relativo a partir del cual una medición es una regresión.
+    - minimo (float): Diferencia absoluta (en segundos) por debajo de la cual no hay regresión.
+
+    Retorna:
+    - list: Tuplas (familia, escala, medicion, segundos_base, segundos_actuales, razon, es_regresion),
+      en el orden de los resultados actuales.
+    """
+    anteriores = mediciones(base)
+    comparacion = []
+    for clave, segundos in mediciones(actuales).items():
+        if clave not in anteriores:
+            continue
+        anterior = anteriores[clave]
+        razon = segundos / anterior if anterior else float('inf')
+        regresion = segundos > anterior * (1 + umbral) and segundos - anterior > minimo
+        comparacion.append(clave + (anterior, segundos, razon, regresion))
+    return comparacion
+
+
+# --- Línea de comandos ---
+
+def _lista_enteros(texto):
+    return [int(valor) for valor in texto.split(',') if valor]
+
+def leer_argumentos(argumentos=None):
+    """
+    Lee las opciones de la línea de comandos del benchmark.
+
+    Parametros:
+    - argumentos (list, opcional): Los argumentos a leer; por defecto, los de sys.argv.
+
+    Retorna:
+    - argparse.Namespace: Las opciones leídas.
+    """
+    lector = argparse.ArgumentParser(description="Benchmark de First, Follow, verificaciones, tablas y parsers sobre gramáticas sintéticas.")
+    lector.add_argument('--familias', nargs='+', choices=list(FAMILIAS), help="familias a medir (por defecto, todas)")
+    lector.add_argument('--escalas', type=_lista_enteros, default=list(ESCALAS),
+                        help=f"tamaños de las gramáticas, separados por comas (por defecto {','.join(map(str, ESCALAS))})")
+    lector.add_argument('--tamanos', type=_lista_enteros, default=list(TAMANOS),
+                        help=f"tokens de las cadenas analizadas, separados por comas (por defecto {','.join(map(str, TAMANOS))})")
+    lector.add_argument('--repeticiones', type=int, default=REPETICIONES, help="repeticiones de cada medición; se guarda la menor")
+    lector.add_argument('--salida', help="archivo JSON donde se guardan los resultados")
+    lector.add_argument('--base', help="archivo JSON de una corrida anterior con el cual comparar")
+    lector.add_argument('--umbral', type=float, default=UMBRAL, help=f"aumento relativo que cuenta como regresión (por defecto {UMBRAL})")
+    return lector.parse_args(argumentos)
+
+def _mostrar_caso(caso):
+    fases = '  '.join(f"{fase} {caso['fases'][fase] * 1000:8.2f} ms" for fase in FASES)
+    print(f"{caso['familia']:<20} {caso['escala']:>5}  {caso['estados_lr0']:>6} states  {fases}")
+    for medicion in caso['parse']:
+        print(f"{'':<28}parse {medicion['parser']:<4} {medicion['tokens']:>8} tokens  "
+              f"{medicion['segundos'] * 1000:9.2f} ms  {medicion['tokens_por_segundo']:12.0f} tokens/s")
+
+def main(argumentos=None):
+    """
+    Ejecuta el benchmark, guarda los resultados y los compara con una corrida base.
+
+    Retorna:
+    - int: 0 si no hay regresiones (o no hay base), 1 si alguna medición empeoró más que el umbral.
+    """
+    opciones = leer_argumentos(argumentos)
+    base = None
+    if opciones.base:
+        try:
+            with open(opciones.base, encoding='utf-8') as archivo:
+                base = json.load(archivo)
+        except FileNotFoundError:
+            print(f"Error: No se encontro el archivo '{opciones.base}'.")
+            return 1
+
+    resultados = ejecutar_benchmark(opciones.familias, opciones.escalas, opciones.tamanos, opciones.repeticiones, _mostrar_caso)
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, indent=2)
+        print(f"Results in '{opciones.salida}'.")
+
+    if base is None:
+        return 0
+    comparacion = comparar_resultados(resultados, base, opciones.umbral)
+    regresiones = [fila for fila in comparacion if fila[-1]]
+    print(f"\nCompared {len(comparacion)} measurements against '{opciones.base}': {len(regresiones)} regressions.")
+    for familia, escala, medicion, anterior, segundos, razon, _ in regresiones:
+        print(f"  {familia} {escala} {medicion}: {anterior * 1000:.2f} ms -> {segundos * 1000:.2f} ms ({razon:.2f}x)")
+    return 1 if regresiones else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,411 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from first import calcular_conjuntos_first
+from follow import calcular_conjuntos_follow
+from verificador_ll1 import es_gramatica_ll1
+from verificador_slr1 import analizar_slr1
+from verificador_lalr1 import analizar_lalr1
+from tabla_ll1 import construir_tabla_ll1
+from tablas_compiladas import TablaLL1Compilada, TablaSLR1Compilada, compilar_tabla_ll1, compilar_tabla_slr1
+from tablas_comprimidas import TablaSLR1Comprimida, comprimir_tabla_slr1
+from simbolos import TablaSimbolos, cuerpo
+from estadisticas import contar, fase, medido
+
+# Versión del formato de los archivos del cache. Se cambia cada vez que cambia el formato o la
+# forma de calcular cualquiera de los artefactos, asi los archivos viejos dejan de ser válidos.
+VERSION_FORMATO = 4
+
+# Directorio del cache por defecto (relativo al directorio de trabajo)
+DIRECTORIO_CACHE = '.cache_gramaticas'
+
+# Arreglos de una TablaSLR1Comprimida, en el orden en que se guardan como secciones
+ARREGLOS_COMPRIMIDOS = ('defectos', 'base', 'valores', 'verificacion', 'goto_defectos', 'goto_base', 'goto_valores', 'goto_verificacion')
+
+# Encabezado del archivo: firma, versión del formato y largo en bytes de los metadatos JSON.
+# A continuación van los metadatos y, alineadas a 8 bytes, las secciones binarias.
+MAGIA = b'LFGRAMC\0'
+ENCABEZADO = struct.Struct('<8sII')
+ALINEACION = 8
+
+
+class AnalisisGramatica:
+    """
+    Todo el análisis de una gramática que no depende de las cadenas a analizar.
+
+    Atributos:
+    - clave (str): El hash de la gramática normalizada (ver clave_gramatica).
+    - simbolos (TablaSimbolos): Ids de terminales y no terminales, incluidos los declarados con %token.
+    - conjuntos_first (VistaConjuntos): Los conjuntos First.
+    - conjuntos_follow (VistaConjuntos): Los conjuntos Follow.
+    - es_ll1 (bool): Si la gramática es LL(1).
+    - tabla_ll1 (TablaLL1Compilada o None): La tabla LL(1) compilada (solo si la gramática es LL(1)).
+    - tabla_slr1 (TablaSLR1Compilada): Las tablas ACTION y GOTO compiladas. Si hay conflictos, cada
+      celda conserva la primera acción registrada (ver analizar_slr1).
+    - conflictos_slr1 (list): Los conflictos SLR(1), como los devuelve analizar_slr1.
+    - tabla_lalr1 (TablaSLR1Compilada): Las tablas LALR(1) compiladas. Solo se calculan si hay
+      conflictos SLR(1); si no, es la misma tabla_slr1 (acepta exactamente las mismas cadenas).
+    - conflictos_lalr1 (list): Los conflictos LALR(1), como los devuelve analizar_lalr1.
+    - comprimida_slr1 (TablaSLR1Comprimida o None): tabla_slr1 comprimida (solo si la gramática es SLR(1)).
+    - comprimida_lalr1 (TablaSLR1Comprimida o None): tabla_lalr1 comprimida (solo si la gramática es LALR(1)).
+    - desde_cache (bool): Si el análisis se cargó de un archivo del cache.
+    """
+
+    def __init__(self, clave, simbolos, first_bits, follow_bits, es_ll1, tabla_ll1, tabla_slr1, conflictos_slr1,
+                 tabla_lalr1=None, conflictos_lalr1=(), comprimida_slr1=None, comprimida_lalr1=None, desde_cache=False):
+        self.clave = clave
+        self.simbolos = simbolos
+        self.conjuntos_first = simbolos.vista(first_bits)
+        self.conjuntos_follow = simbolos.vista(follow_bits)
+        self.es_ll1 = es_ll1
+        self.tabla_ll1 = tabla_ll1
+        self.tabla_slr1 = tabla_slr1
+        self.conflictos_slr1 = conflictos_slr1
+        self.tabla_lalr1 = tabla_slr1 if tabla_lalr1 is None else tabla_lalr1
+        self.conflictos_lalr1 = list(conflictos_lalr1)
+        self.comprimida_slr1 = comprimida_slr1
+        self.comprimida_lalr1 = comprimida_slr1 if tabla_lalr1 is None else comprimida_lalr1
+        self.desde_cache = desde_cache
+        self._mapa = None # El mmap del que leen las tablas cargadas del cache
+
+    @property
+    def es_slr1(self):
+        return not self.conflictos_slr1
+
+    @property
+    def es_lalr1(self):
+        return not self.conflictos_lalr1
+
+
+def _normalizar_produccion(no_terminal, produccion):
+    """(no_terminal, produccion) como lista JSON: [no_terminal, [símbolos...]]."""
+    return [no_terminal, list(cuerpo(produccion))]
+
+
+def _normalizar_accion(accion):
+    tipo, valor = accion
+    if tipo == 'reduce':
+        return [tipo, _normalizar_produccion(*valor)]
+    return [tipo, valor]
+
+
+def _leer_accion(accion):
+    tipo, valor = accion
+    if tipo == 'reduce':
+        return (tipo, (valor[0], tuple(valor[1])))
+    return (tipo, valor)
+
+
+def _aplanar(tuplas):
+    """Una lista de tuplas de enteros como dos arreglos: los valores seguidos y dónde empieza cada tupla."""
+    inicios = array('i', [0])
+    for tupla in tuplas:
+        inicios.append(inicios[-1] + len(tupla))
+    return array('i', [v for tupla in tuplas for v in tupla]), inicios
+
+
+def _desaplanar(valores, inicios):
+    return [tuple(valores[inicios[k]:inicios[k + 1]]) for k in range(len(inicios) - 1)]
+
+
+def clave_gramatica(gramatica, patrones=None):
+    """
+    Calcula la clave del cache de una gramática: el hash SHA-256 de su forma normalizada.
+
+    La forma normalizada son las producciones como listas de símbolos, en el orden de la gramática
+    (que fija los ids), junto con los terminales declarados con %token y la versión del formato.
+    Asi 'aA' y ('a', 'A') o 'e' y () dan la misma clave.
+
+    Parametros:
+    - gramatica (dict): La gramática del lenguaje.
+    - patrones (dict, opcional): Los patrones léxicos (terminal → expresión regular).
+
+    Retorna:
+    - str: La clave en hexadecimal.
+    """
+    normalizada = {
+        "version": VERSION_FORMATO,
+        "gramatica": [[nt, [list(cuerpo(p)) for p in producciones]] for nt, producciones in gramatica.items()],
+        "tokens": list(patrones or {}),
+    }
+    texto = json.dumps(normalizada, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def construir_analisis(gramatica, patrones=None, clave=None):
+    """
+    Calcula desde cero First, Follow, las verificaciones y las tablas compiladas (y comprimidas).
+
+    Las tablas LALR(1) solo se calculan si la gramática tiene conflictos SLR(1): toda gramática
+    SLR(1) es LALR(1) y las tablas SLR(1) ya la analizan.
+
+    Parametros:
+    - gramatica (dict): La gramática del lenguaje (con símbolo inicial 'S').
+    - patrones (dict, opcional): Los patrones léxicos; sus terminales se registran en la tabla de símbolos.
+    - clave (str, opcional): La clave ya calculada con clave_gramatica.
+
+    Retorna:
+    - AnalisisGramatica: El análisis completo.
+    """
+    conjuntos_first = calcular_conjuntos_first(gramatica)
+    conjuntos_follow = calcular_conjuntos_follow(gramatica, conjuntos_first)
+    simbolos = conjuntos_first.simbolos
+    # Mismo orden en el que los registra el Lexer, para que los ids coincidan
+    for terminal in patrones or {}:
+        simbolos.agregar_terminal(terminal)
+
+    es_ll1 = es_gramatica_ll1(gramatica, conjuntos_first, conjuntos_follow)
+    tabla_ll1 = None
+    if es_ll1:
+        tabla_ll1 = compilar_tabla_ll1(construir_tabla_ll1(gramatica, conjuntos_first, conjuntos_follow), 'S', simbolos)
+    with fase('slr1'):
+        tabla_acciones, tabla_goto, conflictos = analizar_slr1(gramatica, conjuntos_follow)
+        tabla_slr1 = compilar_tabla_slr1(tabla_acciones, tabla_goto, simbolos)
+    tabla_lalr1 = None
+    conflictos_lalr1 = []
+    if conflictos:
+        with fase('lalr1'):
+            tabla_acciones, tabla_goto, conflictos_lalr1 = analizar_lalr1(gramatica, simbolos)
+            tabla_lalr1 = compilar_tabla_slr1(tabla_acciones, tabla_goto, simbolos)
+    # Solo se comprimen las tablas sin conflictos, que son las que se usan para analizar
+    comprimida_slr1 = comprimir_tabla_slr1(tabla_slr1) if not conflictos else None
+    comprimida_lalr1 = comprimir_tabla_slr1(tabla_lalr1) if tabla_lalr1 is not None and not conflictos_lalr1 else None
+
+    if clave is None:
+        clave = clave_gramatica(gramatica, patrones)
+    return AnalisisGramatica(clave, simbolos, conjuntos_first.bits, conjuntos_follow.bits,
+                             es_ll1, tabla_ll1, tabla_slr1, conflictos, tabla_lalr1, conflictos_lalr1,
+                             comprimida_slr1, comprimida_lalr1)
+
+
+@medido('guardar_cache')
+def guardar_analisis(analisis, ruta):
+    """
+    Escribe el análisis en un archivo binario que cargar_analisis puede mapear en memoria.
+
+    Los nombres de los símbolos, las producciones y los conflictos van en un bloque JSON corto; los
+    conjuntos First/Follow (filas de bits de ancho fijo) y las tablas (enteros de máquina) van en
+    secciones binarias alineadas. El archivo se escribe aparte y se renombra al final, asi otro
+    proceso nunca ve un archivo a medio escribir.
+
+    Parametros:
+    - analisis (AnalisisGramatica): El análisis a guardar.
+    - ruta (str): El archivo de destino.
+    """
+    simbolos = analisis.simbolos
+    bytes_fila = (len(simbolos.terminales) + 7) // 8
+
+    def filas(bits):
+        return b''.join(b.to_bytes(bytes_fila, 'little') for b in bits)
+
+    secciones = [
+        ('first', 'B', filas(analisis.conjuntos_first.bits)),
+        ('follow', 'B', filas(analisis.conjuntos_follow.bits)),
+    ]
+    meta = {
+        "clave": analisis.clave,
+        "orden_bytes": sys.byteorder,
+        "tam_entero": array('i').itemsize,
+        "terminales": simbolos.terminales,
+        "no_terminales": simbolos.no_terminales,
+        "bytes_fila": bytes_fila,
+        "es_ll1": analisis.es_ll1,
+        "conflictos_slr1": [[i, simbolo, [_normalizar_accion(a) for a in acciones]]
+                            for i, simbolo, acciones in analisis.conflictos_slr1],
+        "conflictos_lalr1": [[i, simbolo, [_normalizar_accion(a) for a in acciones]]
+                             for i, simbolo, acciones in analisis.conflictos_lalr1],
+    }
+
+    tabla = analisis.tabla_ll1
+    if tabla is not None:
+        cuerpos, inicio_cuerpos = _aplanar(tabla.cuerpos)
+        cadenas, inicio_cadenas = _aplanar(tabla.cadenas)
+        secciones += [
+            ('ll1_celdas', 'i', array('i', tabla.celdas).tobytes()),
+            ('ll1_cuerpos', 'i', cuerpos.tobytes()),
+            ('ll1_inicio_cuerpos', 'i', inicio_cuerpos.tobytes()),
+            ('ll1_predicciones', 'i', array('i', tabla.predicciones).tobytes()),
+            ('ll1_cadenas', 'i', cadenas.tobytes()),
+            ('ll1_inicio_cadenas', 'i', inicio_cadenas.tobytes()),
+        ]
+        meta["ll1"] = {"ancho": tabla.ancho, "inicial": tabla.inicial,
+                       "producciones": [_normalizar_produccion(*p) for p in tabla.producciones]}
+
+    # Las tablas LALR(1) solo se guardan si son distintas de las SLR(1)
+    prefijos = ['slr1'] if analisis.tabla_lalr1 is analisis.tabla_slr1 else ['slr1', 'lalr1']
+    for prefijo in prefijos:
+        tabla = getattr(analisis, 'tabla_' + prefijo)
+        secciones += [
+            (prefijo + '_acciones', 'i', array('i', tabla.acciones).tobytes()),
+            (prefijo + '_goto', 'i', array('i', tabla.goto).tobytes()),
+            (prefijo + '_cabezas', 'i', array('i', tabla.cabezas).tobytes()),
+            (prefijo + '_longitudes', 'i', array('i', tabla.longitudes).tobytes()),
+        ]
+        meta[prefijo] = {"ancho": tabla.ancho, "ancho_goto": tabla.ancho_goto,
+                         "producciones": [_normalizar_produccion(*p) for p in tabla.producciones]}
+        comprimida = getattr(analisis, 'comprimida_' + prefijo)
+        if comprimida is not None:
+            secciones += [(f'{prefijo}c_{nombre}', 'i', array('i', getattr(comprimida, nombre)).tobytes())
+                          for nombre in ARREGLOS_COMPRIMIDOS]
+            meta[prefijo]["comprimida"] = True
+
+    # Posición (relativa al inicio de los datos) y largo en bytes de cada sección
+    indice = {}
+    desplazamiento = 0
+    for nombre, tipo, datos in secciones:
+        indice[nombre] = [tipo, desplazamiento, len(datos)]
+        desplazamiento += -(-len(datos) // ALINEACION) * ALINEACION
+    meta["secciones"] = indice
+
+    texto_meta = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    inicio_datos = -(-(ENCABEZADO.size + len(texto_meta)) // ALINEACION) * ALINEACION
+
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, 'wb') as archivo:
+        archivo.write(ENCABEZADO.pack(MAGIA, VERSION_FORMATO, len(texto_meta)))
+        archivo.write(texto_meta)
+        archivo.write(b'\0' * (inicio_datos - ENCABEZADO.size - len(texto_meta)))
+        for nombre, tipo, datos in secciones:
+            archivo.write(datos)
+            archivo.write(b'\0' * (-len(datos) % ALINEACION))
+    os.replace(temporal, ruta)
+
+
+@medido('cargar_cache')
+def cargar_analisis(ruta, clave):
+    """
+    Carga un análisis guardado con guardar_analisis mapeando el archivo en memoria.
+
+    Solo se validan el encabezado, los metadatos y los límites de las secciones: las tablas quedan
+    como vistas (memoryview) sobre el archivo mapeado, sin copiarlas. Las filas de First/Follow y los
+    cuerpos y cadenas de expansiones LL(1) (que son pocos) sí se convierten a objetos de Python.
+
+    Parametros:
+    - ruta (str): El archivo del cache.
+    - clave (str): La clave esperada (ver clave_gramatica).
+
+    Retorna:
+    - AnalisisGramatica o None: El análisis, o None si el archivo no existe o no es válido
+      (otra versión del formato, otra clave, otra arquitectura o un archivo truncado).
+    """
+    try:
+        archivo = open(ruta, 'rb')
+    except OSError:
+        return None
+    with archivo:
+        try:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+    analisis = _leer_analisis(mapa, clave)
+    if analisis is None:
+        mapa.close()
+    return analisis
+
+
+def _leer_analisis(mapa, clave):
+    """Interpreta el contenido de un archivo del cache ya mapeado; None si no es válido."""
+    if len(mapa) < ENCABEZADO.size:
+        return None
+    magia, version, largo_meta = ENCABEZADO.unpack_from(mapa, 0)
+    if magia != MAGIA or version != VERSION_FORMATO or ENCABEZADO.size + largo_meta > len(mapa):
+        return None
+    try:
+        meta = json.loads(mapa[ENCABEZADO.size:ENCABEZADO.size + largo_meta].decode('utf-8'))
+    except ValueError:
+        return None
+    if meta.get("clave") != clave or meta.get("orden_bytes") != sys.byteorder or meta.get("tam_entero") != array('i').itemsize:
+        return None
+
+    datos = memoryview(mapa)
+    inicio_datos = -(-(ENCABEZADO.size + largo_meta) // ALINEACION) * ALINEACION
+    vistas = {}
+    for nombre, (tipo, desplazamiento, largo) in meta["secciones"].items():
+        inicio = inicio_datos + desplazamiento
+        if inicio + largo > len(mapa):
+            return None
+        vistas[nombre] = datos[inicio:inicio + largo].cast(tipo)
+
+    simbolos = TablaSimbolos({nt: [] for nt in meta["no_terminales"]})
+    for terminal in meta["terminales"]:
+        simbolos.agregar_terminal(terminal)
+
+    bytes_fila = meta["bytes_fila"]
+    def filas(vista):
+        return [int.from_bytes(vista[i:i + bytes_fila], 'little') for i in range(0, len(vista), bytes_fila)]
+
+    tabla_ll1 = None
+    if "ll1" in meta:
+        datos_ll1 = meta["ll1"]
+        cuerpos = _desaplanar(vistas["ll1_cuerpos"], vistas["ll1_inicio_cuerpos"])
+        cadenas = _desaplanar(vistas["ll1_cadenas"], vistas["ll1_inicio_cadenas"])
+        producciones = [(nt, tuple(simbolos_prod)) for nt, simbolos_prod in datos_ll1["producciones"]]
+        tabla_ll1 = TablaLL1Compilada(simbolos, datos_ll1["ancho"], vistas["ll1_celdas"], cuerpos, producciones,
+                                      datos_ll1["inicial"], vistas["ll1_predicciones"], cadenas)
+
+    def tabla_lr(prefijo):
+        datos_lr = meta[prefijo]
+        producciones = [(nt, tuple(simbolos_prod)) for nt, simbolos_prod in datos_lr["producciones"]]
+        return TablaSLR1Compilada(simbolos, datos_lr["ancho"], vistas[prefijo + "_acciones"], datos_lr["ancho_goto"],
+                                  vistas[prefijo + "_goto"], vistas[prefijo + "_cabezas"], vistas[prefijo + "_longitudes"],
+                                  producciones)
+
+    def conflictos(nombre):
+        return [(i, simbolo, tuple(_leer_accion(a) for a in acciones)) for i, simbolo, acciones in meta[nombre]]
+
+    def comprimida(prefijo, tabla):
+        if not meta[prefijo].get("comprimida"):
+            return None
+        arreglos = [vistas[f'{prefijo}c_{nombre}'] for nombre in ARREGLOS_COMPRIMIDOS]
+        return TablaSLR1Comprimida(simbolos, tabla.ancho, *arreglos, tabla.cabezas, tabla.longitudes, tabla.producciones)
+
+    tabla_slr1 = tabla_lr("slr1")
+    tabla_lalr1 = tabla_lr("lalr1") if "lalr1" in meta else None
+    analisis = AnalisisGramatica(clave, simbolos, filas(vistas["first"]), filas(vistas["follow"]),
+                                 meta["es_ll1"], tabla_ll1, tabla_slr1, conflictos("conflictos_slr1"),
+                                 tabla_lalr1, conflictos("conflictos_lalr1"), comprimida("slr1", tabla_slr1),
+                                 comprimida("lalr1", tabla_lalr1) if tabla_lalr1 is not None else None, desde_cache=True)
+    analisis._mapa = mapa
+    return analisis
+
+
+def obtener_analisis(gramatica, patrones=None, directorio=DIRECTORIO_CACHE):
+    """
+    Devuelve el análisis de la gramática, cargándolo del cache si ya se calculó antes.
+
+    Si en el directorio hay un archivo válido para la clave de la gramática, se mapea en memoria;
+    si no, se calcula todo y se guarda para la próxima vez. Un cache que no se puede escribir
+    (por ejemplo un directorio de solo lectura) no es un error: solo se pierde la reutilización.
+
+    Parametros:
+    - gramatica (dict): La gramática del lenguaje (con símbolo inicial 'S').
+    - patrones (dict, opcional): Los patrones léxicos (terminal → expresión regular).
+    - directorio (str o None): El directorio del cache; con None no se usa el cache.
+
+    Retorna:
+    - AnalisisGramatica: El análisis completo (ver el atributo desde_cache).
+    """
+    clave = clave_gramatica(gramatica, patrones)
+    if directorio is None:
+        return construir_analisis(gramatica, patrones, clave)
+
+    ruta = os.path.join(directorio, clave + '.bin')
+    analisis = cargar_analisis(ruta, clave)
+    if analisis is not None:
+        contar('cache.aciertos')
+        return analisis
+
+    contar('cache.fallos')
+    analisis = construir_analisis(gramatica, patrones, clave)
+    try:
+        os.makedirs(directorio, exist_ok=True)
+        guardar_analisis(analisis, ruta)
+    except OSError:
+        pass
+    return analisis
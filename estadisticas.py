@@ -0,0 +1,179 @@
+import cProfile
+import functools
+import io
+import pstats
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+# Las estadísticas que se están registrando; None cuando la instrumentación está apagada
+_activas = None
+_SIN_MEDIR = nullcontext()
+# Cantidad de funciones que se muestran de cada perfil de cProfile
+LINEAS_PERFIL = 15
+
+
+class Estadisticas:
+    """
+    Tiempos por fase y contadores de una corrida del análisis (First, Follow, verificaciones, tablas, parse).
+
+    Mientras están activas ('with estadisticas:' o activar), las funciones instrumentadas miden sus
+    fases y suman sus contadores aquí. Apagadas, cada punto de medición cuesta una comparación con
+    None por llamada a la función (nunca por ítem, estado o token): los contadores se calculan al
+    final de cada función y solo si hay estadísticas activas.
+
+    Las fases anidadas se nombran con la ruta de las fases que las contienen ('slr1.automata_lr0').
+
+    Atributos:
+    - tiempos (dict): fase → segundos acumulados, en el orden en que empezó cada fase.
+    - llamadas (Counter): fase → cantidad de veces que se midió.
+    - contadores (Counter): nombre → valor acumulado (ver los puntos de medición en cada módulo).
+    - perfilar (set): Fases (por nombre o por ruta) que se ejecutan bajo cProfile.
+    - medir_memoria (set): Fases (por nombre o por ruta) cuya memoria se mide con tracemalloc.
+    - perfiles (dict): ruta → texto de pstats con las funciones de mayor tiempo acumulado.
+    - memoria (dict): ruta → (bytes que siguen asignados al terminar, pico de bytes) de la fase.
+    """
+
+    def __init__(self, perfilar=(), medir_memoria=()):
+        self.tiempos = {}
+        self.llamadas = Counter()
+        self.contadores = Counter()
+        self.perfilar = set(perfilar or ())
+        self.medir_memoria = set(medir_memoria or ())
+        self.perfiles = {}
+        self.memoria = {}
+        self._ruta = []
+        self._perfil = None
+        self._anteriores = []
+
+    def __enter__(self):
+        self._anteriores.append(activar(self))
+        return self
+
+    def __exit__(self, *excepcion):
+        activar(self._anteriores.pop())
+        return False
+
+    def contar(self, nombre, cantidad=1):
+        """Suma 'cantidad' al contador 'nombre'."""
+        self.contadores[nombre] += cantidad
+
+    @contextmanager
+    def fase(self, nombre):
+        """
+        Mide el tiempo de la fase 'nombre' (y, si se pidió, su perfil y su memoria) mientras dura el bloque.
+
+        Parametros:
+        - nombre (str): El nombre de la fase; se anida bajo las fases que estén en curso.
+        """
+        self._ruta.append(nombre)
+        ruta = '.'.join(self._ruta)
+        self.tiempos.setdefault(ruta, 0.0)
+        perfil = None
+        if self._perfil is None and (nombre in self.perfilar or ruta in self.perfilar):
+            # cProfile no admite dos perfiles activos a la vez: las fases internas quedan en el de afuera
+            perfil = self._perfil = cProfile.Profile()
+        memoria = (nombre in self.medir_memoria or ruta in self.medir_memoria) and not tracemalloc.is_tracing()
+        if memoria:
+            tracemalloc.start()
+        if perfil is not None:
+            perfil.enable()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            if perfil is not None:
+                perfil.disable()
+                self._perfil = None
+                texto = io.StringIO()
+                pstats.Stats(perfil, stream=texto).sort_stats('cumulative').print_stats(LINEAS_PERFIL)
+                self.perfiles[ruta] = texto.getvalue()
+            if memoria:
+                self.memoria[ruta] = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            self.tiempos[ruta] += segundos
+            self.llamadas[ruta] += 1
+            self._ruta.pop()
+
+    def a_dict(self):
+        """
+        Retorna:
+        - dict: Las estadísticas en forma serializable a JSON: tiempos, llamadas, contadores y memoria.
+        """
+        return {
+            "tiempos": dict(self.tiempos),
+            "llamadas": dict(self.llamadas),
+            "contadores": dict(sorted(self.contadores.items())),
+            "memoria": {ruta: {"actual": actual, "pico": pico} for ruta, (actual, pico) in self.memoria.items()},
+        }
+
+    def informe(self):
+        """
+        Retorna:
+        - str: Un informe legible de tiempos por fase (anidadas con sangría), contadores, memoria y perfiles.
+        """
+        lineas = [f"{'Phase':<36}{'Time (ms)':>12}{'Calls':>8}"]
+        for ruta, segundos in self.tiempos.items():
+            partes = ruta.split('.')
+            nombre = '  ' * (len(partes) - 1) + partes[-1]
+            lineas.append(f"{nombre:<36}{segundos * 1000:>12.3f}{self.llamadas[ruta]:>8}")
+        if self.contadores:
+            lineas.append("Counters:")
+            lineas.extend(f"  {nombre:<34}{valor:>12}" for nombre, valor in sorted(self.contadores.items()))
+        for ruta, (actual, pico) in self.memoria.items():
+            lineas.append(f"Memory of '{ruta}': {pico / 1024:.1f} KiB peak, {actual / 1024:.1f} KiB still allocated")
+        for ruta, texto in self.perfiles.items():
+            lineas.append(f"Profile of '{ruta}':")
+            lineas.append(texto.rstrip())
+        return '\n'.join(lineas)
+
+
+def activar(estadisticas):
+    """
+    Define las estadísticas en las que registran las funciones instrumentadas.
+
+    Parametros:
+    - estadisticas (Estadisticas o None): Las estadísticas a usar; None apaga la instrumentación.
+
+    Retorna:
+    - Estadisticas o None: Las que estaban activas antes.
+    """
+    global _activas
+    anteriores = _activas
+    _activas = estadisticas
+    return anteriores
+
+def activas():
+    """Devuelve las estadísticas activas, o None si la instrumentación está apagada."""
+    return _activas
+
+def fase(nombre):
+    """
+    Context manager que mide la fase 'nombre' en las estadísticas activas; sin ellas no hace nada.
+    """
+    if _activas is None:
+        return _SIN_MEDIR
+    return _activas.fase(nombre)
+
+def contar(nombre, cantidad=1):
+    """Suma 'cantidad' al contador 'nombre' de las estadísticas activas, si las hay."""
+    if _activas is not None:
+        _activas.contadores[nombre] += cantidad
+
+def medido(nombre):
+    """
+    Decorador que mide cada llamada a la función como la fase 'nombre' (ver fase).
+
+    Solo conviene para funciones que se llaman una vez por análisis, no por ítem o por token.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def funcion_medida(*args, **kwargs):
+            if _activas is None:
+                return funcion(*args, **kwargs)
+            with _activas.fase(nombre):
+                return funcion(*args, **kwargs)
+        return funcion_medida
+    return decorador
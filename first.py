@@ -1,67 +1,165 @@
+from grafos import propagar_en_digrafo
+from simbolos import TablaSimbolos, VistaConjuntos, BIT_EPSILON, EPSILON
+from estadisticas import activas, medido
+
 def calcular_conjuntos_first(gramatica):
     """
     Calcula los conjuntos First para todos los no terminales en la gramatica.
 
+    Los conjuntos se calculan como bitmasks (ver calcular_first_bits) y se devuelven
+    como una vista de diccionario, que se usa igual que el diccionario de conjuntos de siempre.
+
     Parametros:
     - gramatica (dict): Un diccionario que representa la gramatica, donde las claves son no terminales y los valores
                         son listas de producciones.
 
     Retorna:
-    - first (dict): Un diccionario donde cada clave es un no terminal y cada valor es el conjunto First 
-                    de ese no terminal.
+    - first (VistaConjuntos): Un diccionario (de solo lectura) donde cada clave es un no terminal y cada valor
+                              es el conjunto First de ese no terminal.
+    """
+    simbolos = TablaSimbolos(gramatica)
+    return simbolos.vista(calcular_first_bits(gramatica, simbolos))
+
+@medido('first')
+def calcular_first_bits(gramatica, simbolos):
+    """
+    Calcula los conjuntos First de todos los no terminales como bitmasks.
+
+    Primero se calculan los no terminales anulables (los que derivan 'e'). Luego se arma el grafo
+    de dependencias: A depende de B si B aparece en una producción de A precedido solo por simbolos
+    anulables, y por lo tanto First(B) ⊆ First(A). Cada componente fuertemente conexa de ese grafo
+    comparte el mismo First, asi que propagar_en_digrafo lo resuelve con una pasada por componente,
+    correcta con cualquier tipo de recursión (izquierda, mutua, ...).
+
+    Parametros:
+    - gramatica (dict): El diccionario que representa la gramatica.
+    - simbolos (TablaSimbolos): La tabla de símbolos de la gramatica.
+
+    Retorna:
+    - list: El bitmask First de cada no terminal, indexado por su id en 'simbolos'.
     """
-    # Inicializamos el conjunto First 
-    # Cada no terminal empieza con un conjunto vacio
-    first = {nt: set() for nt in gramatica}
+    anulables = calcular_anulables(gramatica)
 
-    # Recorremos cada no terminal y calculamos su conjunto FIRST usando recursión.
-    for no_terminal in gramatica:
-        calcular_first(no_terminal, gramatica, first, set())
+    # Terminales que aparecen directamente al inicio (efectivo) de cada no terminal,
+    # y no terminales de los que depende su First, por id
+    id_no_terminal = simbolos.id_no_terminal
+    directos = [0] * len(simbolos.no_terminales)
+    dependencias = [()] * len(simbolos.no_terminales)
+    for no_terminal, producciones in gramatica.items():
+        k = id_no_terminal[no_terminal]
+        directos[k], nombres = aportes_first(producciones, gramatica, anulables, simbolos)
+        dependencias[k] = [id_no_terminal[dependencia] for dependencia in nombres]
+
+    # Cada componente comparte los terminales; 'e' depende de cada no terminal
+    first = propagar_en_digrafo([id_no_terminal[no_terminal] for no_terminal in gramatica], dependencias, directos)
+    for no_terminal in anulables:
+        first[id_no_terminal[no_terminal]] |= BIT_EPSILON
+
+    registro = activas()
+    if registro is not None:
+        registro.contar('first.dependencias', sum(len(d) for d in dependencias))
     return first
 
-def calcular_first(simbolo, gramatica, first, visitados):
+def aportes_first(producciones, gramatica, anulables, simbolos):
+    """
+    Recorre las producciones de un no terminal A y obtiene lo que aportan a First(A).
+
+    Parametros:
+    - producciones (list): Las producciones de A.
+    - gramatica (dict): El diccionario que representa la gramatica.
+    - anulables (set): Los no terminales anulables.
+    - simbolos (TablaSimbolos): La tabla de símbolos de la gramatica.
+
+    Retorna:
+    - (directos, dependencias): El bitmask de los terminales con los que empieza (efectivamente) alguna
+      producción, y el conjunto de no terminales B con First(B) ⊆ First(A).
+    """
+    directos = 0
+    dependencias = set()
+    for produccion in producciones:
+        # Recorremos los símbolos de la producción, de izquierda a derecha
+        for simbolo in produccion:
+            if simbolo in gramatica:
+                dependencias.add(simbolo)
+                # Si el no terminal no deriva 'e', dejamos de analizar la producción
+                if simbolo not in anulables:
+                    break
+            elif simbolo != EPSILON:
+                # Un terminal corta la producción
+                directos |= simbolos.bit(simbolo)
+                break
+    return directos, dependencias
+
+def calcular_anulables(gramatica):
     """
-    Calcula recursivamente el conjunto First para un simbolo dado.
+    Calcula el conjunto de no terminales que pueden derivar la cadena vacia ('e').
+
+    Cada producción lleva la cuenta de cuantos de sus no terminales aún no se sabe si son
+    anulables; cuando la cuenta llega a cero, la cabeza de la producción es anulable.
+    Cada ocurrencia se visita una sola vez, asi que el costo es lineal en el tamaño de la gramatica.
+
+    Parametros:
+    - gramatica (dict): El diccionario que representa la gramatica.
+
+    Retorna:
+    - set: Los no terminales anulables.
+    """
+    anulables = set()
+    pendientes = [] # No terminales recien descubiertos como anulables, por propagar
+    faltantes = [] # Por producción: cuantos no terminales faltan por confirmar
+    cabezas = [] # Por producción: el no terminal de la izquierda
+    ocurrencias = {nt: [] for nt in gramatica} # no terminal → producciones donde aparece
+
+    for no_terminal, producciones in gramatica.items():
+        for produccion in producciones:
+            # Un terminal (distinto de 'e') impide que la producción derive 'e'
+            if any(simbolo not in gramatica and simbolo != EPSILON for simbolo in produccion):
+                continue
+            k = len(faltantes)
+            cabezas.append(no_terminal)
+            faltantes.append(0)
+            for simbolo in produccion:
+                if simbolo in gramatica:
+                    faltantes[k] += 1
+                    ocurrencias[simbolo].append(k)
+            if faltantes[k] == 0 and no_terminal not in anulables:
+                anulables.add(no_terminal)
+                pendientes.append(no_terminal)
+
+    while pendientes:
+        for k in ocurrencias[pendientes.pop()]:
+            faltantes[k] -= 1
+            if faltantes[k] == 0 and cabezas[k] not in anulables:
+                anulables.add(cabezas[k])
+                pendientes.append(cabezas[k])
+
+    return anulables
+
+def calcular_first(simbolo, gramatica, first, visitados=None):
+    """
+    Devuelve el conjunto First para un simbolo dado.
+
+    Se conserva por compatibilidad: si 'first' aún no tiene el conjunto del simbolo, se calculan
+    todos con calcular_conjuntos_first y se vuelcan en 'first'.
 
     Parametros:
     - simbolo (str): El simbolo (no terminal o terminal) para calcular el conjunto First.
     - gramatica (dict): El diccionario que representa la gramatica.
     - first (dict): El diccionario que contiene los conjuntos First.
-    - visitados (set): Un conjunto para rastrear los no terminales visitados y evitar bucles de recursion.
+    - visitados (set): Ya no se usa; se mantiene para no romper llamadas existentes.
 
     Retorna:
     - set: El conjunto First para el simbolo dado.
     """
-     # Si el simbolo ya fue visitado, retornamos su conjunto First (evitamos recalcularlo, previene bucles)
-    if simbolo in visitados:
-        return first[simbolo]
-    
-    # --- Caso base: el simbolo no es una clave en el diccionario gramatica
     # Si el simbolo es terminal, su conjunto First es el mismo
-    if simbolo not in gramatica:  
+    if simbolo not in gramatica:
         return {simbolo}
-    
-    # --- Marcado de visita
-    # Marcamos el simbolo actual como visitado para evitar bucles
-    visitados.add(simbolo)
-
-    #--- Recorrido de producciones
-    # Recorremos cada producción del no terminal actual
-    for produccion in gramatica[simbolo]:
-        # Recorremos los símbolos de la producción, de izquierda a derecha
-        for caracter in produccion:
-            # Calculamos el conjunto First del caracter actual
-            first_del_caracter = calcular_first(caracter, gramatica, first, visitados)
-            # Agregamos todos los elementos de First menos 'ε'
-            first[simbolo].update(first_del_caracter - {'e'})
-            # Si el carácter actual no puede derivar 'ε', dejamos de analizar la producción
-            if 'e' not in first_del_caracter:
-                break
-        else:
-            # Si todos los símbolos de la producción pueden producir 'ε', se agrega al FIRST
-            first[simbolo].add('e')
-            
-    # Quitamos el simbolo de visitados al terminar (permite reutilizarlo en otras ramas)
-    visitados.remove(simbolo)
-    
+
+    # Una vista ya trae todos los conjuntos calculados
+    if isinstance(first, VistaConjuntos):
+        return first[simbolo]
+
+    if not first.get(simbolo):
+        for no_terminal, conjunto in calcular_conjuntos_first(gramatica).items():
+            first.setdefault(no_terminal, set()).update(conjunto)
     return first[simbolo]
@@ -1,55 +1,107 @@
+from grafos import propagar_en_digrafo
+from simbolos import como_bits, BIT_EPSILON, FIN
+from estadisticas import activas, medido
 
 def calcular_conjuntos_follow(gramatica, conjuntos_first):
     """
     Calcula los conjuntos Follow para todos los no terminales en la gramatica.
 
+    Los conjuntos se calculan como bitmasks (ver calcular_follow_bits) y se devuelven
+    como una vista de diccionario, que se usa igual que el diccionario de conjuntos de siempre.
+
     Parametros:
     - gramatica (dict): Un diccionario que representa la gramatica.
     - conjuntos_first (dict): Un diccionario con los conjuntos First para cada no terminal.
 
     Retorna:
-    - follow (dict): Un diccionario donde cada clave es un no terminal y cada valor es 
-                     el conjunto Follow de ese no terminal.
+    - follow (VistaConjuntos): Un diccionario (de solo lectura) donde cada clave es un no terminal y cada valor es
+                               el conjunto Follow de ese no terminal.
+    """
+    simbolos, first_bits = como_bits(conjuntos_first, gramatica)
+    return simbolos.vista(calcular_follow_bits(gramatica, simbolos, first_bits))
+
+@medido('follow')
+def calcular_follow_bits(gramatica, simbolos, first_bits):
     """
-    # Inicializamos el conjunto Follow de cada no terminal como un conjunto vacio
-    follow = {nt: set() for nt in gramatica}
+    Calcula los conjuntos Follow de todos los no terminales como bitmasks.
+
+    En vez de recorrer la gramatica una y otra vez hasta que nada cambie, se recorre cada
+    producción una sola vez para armar:
+    - los aportes directos: terminales que Follow(B) recibe de lo que sigue a B (reglas 1 y 2).
+    - las inclusiones Follow(A) ⊆ Follow(B): cuando A -> αBβ y β puede derivar 'e' (regla 3).
+    Los no terminales de una misma componente fuertemente conexa del grafo de inclusiones tienen
+    el mismo Follow, asi que propagar_en_digrafo resuelve cada componente una sola vez, en orden topológico.
+
+    Parametros:
+    - gramatica (dict): Un diccionario que representa la gramatica.
+    - simbolos (TablaSimbolos): La tabla de símbolos de la gramatica.
+    - first_bits (list): El bitmask First de cada no terminal, indexado por id.
+
+    Retorna:
+    - list: El bitmask Follow de cada no terminal, indexado por su id en 'simbolos'.
+    """
+    id_no_terminal = simbolos.id_no_terminal
+    directos = [0] * len(simbolos.no_terminales)
+    incluye = [set() for _ in simbolos.no_terminales] # B → {A : Follow(A) ⊆ Follow(B)}, por id
 
     # Agregamos '$' al conjunto Follow del símbolo inicial (Por convención el símbolo inicial (S) siempre contiene el marcador de fin de cadena)
-    follow['S'].add('$')
-
-    # Usamos un ciclo para aplicar cambios hasta que no haya mas modificaciones
-    cambio = True
-    while cambio:
-        cambio = False
-        # Recorremos cada no terminal y sus producciones
-        for no_terminal in gramatica:
-            for produccion in gramatica[no_terminal]:
-
-                # Inicializamos la cola con el Follow del no_terminal actual
-                # Esta cola se usa para propagar símbolos hacia la izquierda, se va llenando con los First y Follow correspondientes
-                # Esta 'cola' se usará para arrastrar" los símbolos Follow a través de la producción en reversa.
-                cola = follow[no_terminal].copy()
-
-                # Recorremos la producción al revés (de derecha a izquierda)
-                for simbolo in reversed(produccion):
-                    if simbolo in gramatica:  # Es un no terminal
-
-                        # Regla 3:  A -> αB
-                        # Actualizamos el conjunto Follow del simbolo actual si hay elementos nuevos en la cola para agregar
-                        if cola - follow[simbolo]:
-                            follow[simbolo].update(cola)
-                            cambio = True # Indicamos que hubo un cambio y debemos seguir iterando
-
-                        # Regla 2: A -> αBβ
-                        # Si 'ε' esta en First, agregamos tambien los terminales de First menos 'ε' a la cola
-                        if 'e' in conjuntos_first[simbolo]:
-                            cola.update(conjuntos_first[simbolo] - {'e'})
-                        else:
-                            # Si 'ε' no esta en First, la cola se convierte en First del simbolo
-                            cola = conjuntos_first[simbolo].copy()
-                    else:
-                        # Caso Base: el simbolo es un terminal
-                        # Si es un terminal, la cola pasa a ser solo ese terminal (se convierte en {simbolo})
-                        cola = {simbolo}
-    
-    return follow
\ No newline at end of file
+    directos[id_no_terminal['S']] |= simbolos.bit(FIN)
+
+    for no_terminal, producciones in gramatica.items():
+        for simbolo, (cola, hereda) in aportes_follow(no_terminal, producciones, simbolos, first_bits).items():
+            directos[id_no_terminal[simbolo]] |= cola
+            if hereda:
+                incluye[id_no_terminal[simbolo]].add(id_no_terminal[no_terminal])
+
+    # No hay punto fijo que iterar: propagar_en_digrafo resuelve cada componente una vez
+    follow = propagar_en_digrafo([id_no_terminal[no_terminal] for no_terminal in gramatica], incluye, directos)
+
+    registro = activas()
+    if registro is not None:
+        registro.contar('follow.inclusiones', sum(len(origenes) for origenes in incluye))
+    return follow
+
+def aportes_follow(no_terminal, producciones, simbolos, first_bits):
+    """
+    Recorre las producciones de un no terminal A y obtiene lo que aportan al Follow de cada
+    no terminal B que aparece en ellas.
+
+    Parametros:
+    - no_terminal (str): El no terminal A.
+    - producciones (list): Las producciones de A.
+    - simbolos (TablaSimbolos): La tabla de símbolos de la gramatica.
+    - first_bits (list): El bitmask First de cada no terminal, indexado por id.
+
+    Retorna:
+    - dict: B → (terminales, hereda): los terminales que siguen a B en alguna producción de A (reglas 1 y 2)
+      y si Follow(A) ⊆ Follow(B) (regla 3; nunca para B = A, que no aporta nada).
+    """
+    id_no_terminal = simbolos.id_no_terminal
+    aportes = {}
+    for produccion in producciones:
+        # 'cola' son los terminales que pueden aparecer justo despues del simbolo actual dentro de la producción;
+        # 'hereda' indica si ademas puede seguirle cualquier cosa de Follow(no_terminal)
+        cola = 0
+        hereda = True
+
+        # Recorremos la producción al revés (de derecha a izquierda)
+        for simbolo in reversed(produccion):
+            id_simbolo = id_no_terminal.get(simbolo)
+            if id_simbolo is not None:  # Es un no terminal
+                # Regla 2: A -> αBβ, los terminales de First(β) van directo a Follow(B)
+                # Regla 3: A -> αB (o β anulable), Follow(A) ⊆ Follow(B)
+                terminales, incluido = aportes.get(simbolo, (0, False))
+                aportes[simbolo] = (terminales | cola, incluido or (hereda and simbolo != no_terminal))
+
+                first_simbolo = first_bits[id_simbolo]
+                if first_simbolo & BIT_EPSILON:
+                    cola |= first_simbolo & ~BIT_EPSILON
+                else:
+                    # Si 'ε' no esta en First, la cola se convierte en First del simbolo
+                    cola = first_simbolo
+                    hereda = False
+            else:
+                # Caso Base: el simbolo es un terminal, la cola pasa a ser solo ese terminal
+                cola = simbolos.bit(simbolo)
+                hereda = False
+    return aportes
@@ -0,0 +1,316 @@
+from tablas_compiladas import compilar_tabla_ll1, compilar_tabla_slr1, ACEPTAR
+from simbolos import formatear_produccion, ID_FIN
+
+# Cantidad máxima de terminales que se comparan uno por uno en una condición; con más se usa un frozenset
+MAX_COMPARACIONES = 3
+
+
+def generar_parser_ll1(tabla_ll1, simbolo_inicial='S', simbolos=None):
+    """
+    Genera el código de un módulo de Python independiente con un parser LL(1) para la tabla dada.
+
+    Parametros:
+    - tabla_ll1 (dict): La tabla de construir_tabla_ll1 (de una gramática LL(1)).
+    - simbolo_inicial (str): El simbolo inicial de la gramatica.
+    - simbolos (TablaSimbolos, opcional): Tabla de símbolos para los ids de los terminales (ver compilar_tabla_ll1).
+
+    Retorna:
+    - str: El código del módulo (ver generar_modulo_ll1).
+    """
+    return generar_modulo_ll1(compilar_tabla_ll1(tabla_ll1, simbolo_inicial, simbolos))
+
+def generar_parser_slr1(tabla_acciones, tabla_goto, simbolos=None):
+    """
+    Genera el código de un módulo de Python independiente con un parser SLR(1) para las tablas dadas.
+
+    Parametros:
+    - tabla_acciones (dict), tabla_goto (dict): Las tablas de construir_tabla_slr1 (o de analizar_lalr1).
+    - simbolos (TablaSimbolos, opcional): Tabla de símbolos para los ids de los terminales (ver compilar_tabla_slr1).
+
+    Retorna:
+    - str: El código del módulo (ver generar_modulo_slr1).
+    """
+    return generar_modulo_slr1(compilar_tabla_slr1(tabla_acciones, tabla_goto, simbolos))
+
+
+def generar_modulo_ll1(tabla):
+    """
+    Genera un parser descendente recursivo a partir de una tabla LL(1) compilada.
+
+    Cada no terminal es una función que recibe el token de anticipación, elige la producción con
+    comparaciones contra constantes (la fila de la tabla ya resuelta en el código), reconoce los
+    terminales del cuerpo en línea, llama a las funciones de sus no terminales y devuelve la nueva
+    anticipación. La recursión por la cola (A -> ... A) se convierte en un ciclo, asi las listas
+    largas no agotan la pila de Python. Si una entrada anida más de lo que permite el límite de
+    recursión, el módulo la vuelve a analizar con un driver de pila explícita sobre la tabla (las
+    cadenas de expansiones de TablaLL1Compilada), que también va incluida en el módulo.
+
+    Parametros:
+    - tabla (TablaLL1Compilada): La tabla compilada.
+
+    Retorna:
+    - str: El código del módulo: solo importa functools, y expone TERMINALES, analizar(tokens) y analizar_ids(ids).
+    """
+    simbolos = tabla.simbolos
+    ancho = tabla.ancho
+    celdas = tabla.celdas
+    no_terminales = simbolos.no_terminales
+    conjuntos = {}
+    lineas = _encabezado('LL(1)', tabla.producciones, simbolos.terminales)
+    lineas += [
+        f"_ANCHO = {ancho}",
+        f"_INICIAL = {tabla.inicial}",
+        "",
+        "",
+        "class _Rechazo(Exception):",
+        "    pass",
+        "",
+    ]
+
+    funciones = []
+    for n, nombre in enumerate(no_terminales):
+        # Terminales de cada producción en la fila del no terminal, en el orden de las producciones
+        grupos = {}
+        for t in range(ancho):
+            p = celdas[n * ancho + t]
+            if p >= 0:
+                grupos.setdefault(p, []).append(t)
+        cuerpos = {p: tuple(reversed(tabla.cuerpos[p])) for p in grupos}
+        ciclo = any(cuerpo and cuerpo[-1] == ancho + n for cuerpo in cuerpos.values())
+
+        funciones += ["", f"def _n{n}(t, siguiente):", f"    # {nombre}"]
+        sangria = '    '
+        if ciclo:
+            funciones.append("    while True:")
+            sangria = '        '
+        for k, p in enumerate(sorted(grupos)):
+            terminales = grupos[p]
+            cuerpo = cuerpos[p]
+            funciones.append(f"{sangria}{'if' if k == 0 else 'elif'} {_condicion(terminales, conjuntos)}:"
+                             f"  # {nombre} -> {formatear_produccion(tabla.producciones[p][1])}")
+            for i, codigo in enumerate(cuerpo):
+                if codigo < ancho:
+                    # El primer terminal ya se comparó al elegir la producción
+                    if i > 0 or terminales != [codigo]:
+                        funciones += [f"{sangria}    if t != {codigo}:", f"{sangria}        raise _Rechazo"]
+                    funciones.append(f"{sangria}    t = siguiente()")
+                elif i == len(cuerpo) - 1 and codigo == ancho + n:
+                    funciones.append(f"{sangria}    continue")
+                else:
+                    funciones.append(f"{sangria}    t = _n{codigo - ancho}(t, siguiente)")
+            if not cuerpo or cuerpo[-1] != ancho + n:
+                funciones.append(f"{sangria}    return t")
+        if grupos:
+            funciones += [f"{sangria}else:", f"{sangria}    raise _Rechazo"]
+        else:
+            funciones.append(f"{sangria}raise _Rechazo")
+
+    for nombre, valores in conjuntos.items():
+        lineas.append(f"{nombre} = frozenset({valores!r})")
+    lineas += funciones
+
+    # Driver de pila explícita para las entradas demasiado anidadas: por no terminal, la tupla de
+    # códigos a apilar (ya invertida) de cada anticipación, o None
+    filas = []
+    for n in range(len(no_terminales)):
+        fila = []
+        for t in range(ancho):
+            c = tabla.predicciones[n * ancho + t]
+            fila.append(None if c < 0 else tuple(tabla.cadenas[c]))
+        filas.append(tuple(fila))
+    lineas += [
+        "",
+        "",
+        f"_FILAS = {tuple(filas)!r}",
+        "",
+        "",
+        "def _analizar_con_pila(ids):",
+        "    siguiente = partial(next, iter(ids), _FIN)",
+        "    t = siguiente()",
+        "    pila = [_FIN, _INICIAL]",
+        "    while True:",
+        "        x = pila.pop()",
+        "        if x < _ANCHO:",
+        "            if x != t:",
+        "                return False",
+        "            if x == _FIN:",
+        "                return True",
+        "            t = siguiente()",
+        "        else:",
+        "            cadena = _FILAS[x - _ANCHO][t] if t < _ANCHO else None",
+        "            if cadena is None:",
+        "                return False",
+        "            pila.extend(cadena)",
+        "",
+        "",
+        "def analizar_ids(ids):",
+        '    """',
+        "    Analiza una secuencia de ids de terminales (los índices de TERMINALES), sin el '$' final.",
+        "    Retorna True si la cadena es aceptada y False si no.",
+        '    """',
+        "    if not hasattr(ids, '__len__'):",
+        "        ids = list(ids)",
+        "    siguiente = partial(next, iter(ids), _FIN)",
+        "    try:",
+        f"        return _n{tabla.inicial - ancho}(siguiente(), siguiente) == _FIN",
+        "    except _Rechazo:",
+        "        return False",
+        "    except RecursionError:",
+        "        return _analizar_con_pila(ids)",
+    ]
+    lineas += _funcion_analizar()
+    return '\n'.join(lineas) + '\n'
+
+
+def generar_modulo_slr1(tabla, nombre='SLR(1)'):
+    """
+    Genera un parser ascendente a partir de tablas SLR(1) (o LALR(1)) compiladas.
+
+    Las tablas quedan como constantes del módulo: una tupla por estado con la acción de cada terminal,
+    y por producción su longitud y la columna de GOTO de su cabeza, asi cada paso es una indexación
+    de tuplas sin multiplicar ni buscar la cabeza. El ciclo de reducción se genera solo con los casos
+    que usa la gramática (cuerpos vacíos, de un símbolo y más largos): un reduce de un solo símbolo
+    reemplaza el tope de la pila en lugar de sacarlo y volver a apilar.
+
+    Un estado por función (código directo) resultó más lento en CPython que indexar tuplas, por el
+    costo de cada llamada, asi que el estado sigue siendo un índice.
+
+    Parametros:
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+    - nombre (str): El nombre del tipo de parser para la documentación del módulo ('SLR(1)' o 'LALR(1)').
+
+    Retorna:
+    - str: El código del módulo: solo importa functools, y expone TERMINALES, analizar(tokens) y analizar_ids(ids).
+    """
+    ancho = tabla.ancho
+    ancho_goto = tabla.ancho_goto
+    estados = tabla.num_estados
+    filas = tuple(tuple(tabla.acciones[s * ancho:(s + 1) * ancho]) for s in range(estados))
+    longitudes = tuple(tabla.longitudes)
+    gotos = tuple(() if p == 0 else tuple(tabla.goto[s * ancho_goto + tabla.cabezas[p]] for s in range(estados))
+                  for p in range(len(longitudes)))
+
+    lineas = _encabezado(nombre, tabla.producciones[1:], tabla.simbolos.terminales)
+    lineas += [
+        f"# Acción de cada estado por terminal: 0 error, j + 1 shift al estado j, {ACEPTAR} accept, -(p + 1) reduce por p",
+        f"_FILAS = {filas!r}",
+        f"_LONGITUDES = {longitudes!r}",
+        "# Por producción, el estado GOTO de su cabeza desde cada estado",
+        f"_GOTOS = {gotos!r}",
+        "",
+        "",
+        "def analizar_ids(ids):",
+        '    """',
+        "    Analiza una secuencia de ids de terminales (los índices de TERMINALES), sin el '$' final.",
+        "    Retorna True si la cadena es aceptada y False si hay error sintáctico.",
+        '    """',
+        "    filas = _FILAS",
+        "    gotos = _GOTOS",
+        "    longitudes = _LONGITUDES",
+        "    siguiente = partial(next, iter(ids), _FIN)",
+        "    t = siguiente()",
+        "    pila = [0]",
+        "    apilar = pila.append",
+        "    estado = 0",
+        "    while True:",
+        "        accion = filas[estado][t]",
+        "        if accion > 0:",
+        "            estado = accion - 1",
+        "            apilar(estado)",
+        "            t = siguiente()",
+        f"        elif accion < {ACEPTAR}:",
+        "            p = -accion - 1",
+    ]
+
+    casos = []
+    largos = set(longitudes[1:])
+    if 1 in largos:
+        casos.append(("largo == 1", ["estado = gotos[p][pila[-2]]", "pila[-1] = estado"]))
+    if 0 in largos:
+        casos.append(("largo == 0", ["estado = gotos[p][estado]", "apilar(estado)"]))
+    if any(largo > 1 for largo in largos):
+        casos.append(("largo > 1", ["del pila[-largo:]", "estado = gotos[p][pila[-1]]", "apilar(estado)"]))
+    if len(casos) == 1:
+        # Todos los reduce son del mismo tipo: no hace falta mirar la longitud salvo para sacar los estados
+        _, cuerpo = casos[0]
+        if cuerpo[0].startswith("del"):
+            lineas.append("            largo = longitudes[p]")
+        lineas += ["            " + linea for linea in cuerpo]
+    else:
+        lineas.append("            largo = longitudes[p]")
+        for k, (condicion, cuerpo) in enumerate(casos):
+            if k == 0:
+                lineas.append(f"            if {condicion}:")
+            elif k < len(casos) - 1:
+                lineas.append(f"            elif {condicion}:")
+            else:
+                lineas.append("            else:")
+            lineas += ["                " + linea for linea in cuerpo]
+    lineas += [
+        "        else:",
+        f"            return accion == {ACEPTAR}",
+    ]
+    lineas += _funcion_analizar()
+    return '\n'.join(lineas) + '\n'
+
+
+def escribir_modulo(codigo, ruta):
+    """
+    Escribe el código generado en un archivo .py.
+
+    Parametros:
+    - codigo (str): Lo que devuelve generar_modulo_ll1 o generar_modulo_slr1.
+    - ruta (str): El archivo de destino.
+    """
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write(codigo)
+
+
+def _encabezado(nombre, producciones, terminales):
+    """Líneas iniciales del módulo generado: documentación, import y los terminales."""
+    gramatica = [f"    {nt} -> {formatear_produccion(prod)}" for nt, prod in producciones]
+    return [
+        '"""',
+        f"Parser {nombre} generado con generador.py. No depende de ningún otro módulo del proyecto.",
+        "",
+        "Producciones de la tabla:",
+        *gramatica,
+        "",
+        "Uso:",
+        "    analizar(['i', '+', 'i'])  # nombres de los terminales → True/False",
+        "    analizar_ids(ids)          # ids de TERMINALES (los mismos de Lexer.tokens) → True/False",
+        '"""',
+        "from functools import partial",
+        "",
+        "# Terminales por id; el id len(TERMINALES) es el de cualquier símbolo desconocido",
+        f"TERMINALES = {tuple(terminales)!r}",
+        "_IDS = {nombre: i for i, nombre in enumerate(TERMINALES)}",
+        f"_FIN = {ID_FIN}",
+        "_DESCONOCIDO = len(TERMINALES)",
+    ]
+
+def _funcion_analizar():
+    """Líneas de analizar(tokens), igual para todos los módulos generados."""
+    return [
+        "",
+        "",
+        "def analizar(tokens):",
+        '    """',
+        "    Analiza una secuencia de nombres de terminales (sin el '$' final).",
+        "    Retorna True si la cadena es aceptada y False si no.",
+        '    """',
+        "    ids = _IDS",
+        "    return analizar_ids([ids.get(token, _DESCONOCIDO) for token in tokens])",
+    ]
+
+def _condicion(terminales, conjuntos):
+    """Condición sobre el token 't' para una lista de ids; las listas largas van a un frozenset constante."""
+    if len(terminales) <= MAX_COMPARACIONES:
+        return ' or '.join(f"t == {t}" for t in terminales)
+    clave = tuple(terminales)
+    for nombre, valores in conjuntos.items():
+        if valores == clave:
+            return f"t in {nombre}"
+    nombre = f"_T{len(conjuntos)}"
+    conjuntos[nombre] = clave
+    return f"t in {nombre}"
@@ -0,0 +1,92 @@
+def componentes_fuertemente_conexas(nodos, sucesores):
+    """
+    Calcula las componentes fuertemente conexas de un grafo dirigido (algoritmo de Tarjan, iterativo).
+
+    Las componentes se devuelven en orden topológico inverso: cada componente aparece despues
+    de todas las componentes alcanzables desde ella. Asi, al recorrerlas en ese orden, los
+    resultados de las componentes de las que depende una componente ya están calculados.
+    Al ser iterativo no depende del límite de recursión de Python.
+
+    Parametros:
+    - nodos (iterable): Los nodos del grafo.
+    - sucesores (dict): nodo → iterable con los nodos a los que apunta.
+
+    Retorna:
+    - list: Lista de componentes; cada componente es una lista de nodos.
+    """
+    indice = {} # Orden de descubrimiento de cada nodo
+    bajo = {} # Menor índice alcanzable desde el nodo sin salir de la pila
+    pila = []
+    en_pila = set()
+    componentes = []
+
+    for raiz in nodos:
+        if raiz in indice:
+            continue
+        indice[raiz] = bajo[raiz] = len(indice)
+        pila.append(raiz)
+        en_pila.add(raiz)
+        # Cada marco guarda el nodo y el iterador de los sucesores que faltan por visitar
+        trabajo = [(raiz, iter(sucesores[raiz]))]
+
+        while trabajo:
+            nodo, hijos = trabajo[-1]
+            for hijo in hijos:
+                if hijo not in indice:
+                    # Primer encuentro: bajamos a visitarlo y retomamos 'nodo' al volver
+                    indice[hijo] = bajo[hijo] = len(indice)
+                    pila.append(hijo)
+                    en_pila.add(hijo)
+                    trabajo.append((hijo, iter(sucesores[hijo])))
+                    break
+                elif hijo in en_pila:
+                    bajo[nodo] = min(bajo[nodo], indice[hijo])
+            else:
+                # Ya se visitaron todos los sucesores de 'nodo'
+                trabajo.pop()
+                if trabajo:
+                    padre = trabajo[-1][0]
+                    bajo[padre] = min(bajo[padre], bajo[nodo])
+                # Si 'nodo' es la raíz de su componente, la sacamos de la pila
+                if bajo[nodo] == indice[nodo]:
+                    componente = []
+                    while True:
+                        miembro = pila.pop()
+                        en_pila.discard(miembro)
+                        componente.append(miembro)
+                        if miembro == nodo:
+                            break
+                    componentes.append(componente)
+
+    return componentes
+
+
+def propagar_en_digrafo(nodos, sucesores, base):
+    """
+    Resuelve F(x) = base(x) ∪ ⋃ F(y) para cada arco x → y (el "digraph" de DeRemer y Pennello).
+
+    Los nodos de una misma componente fuertemente conexa terminan con el mismo conjunto, asi que
+    se calcula una vez por componente, en el orden de componentes_fuertemente_conexas (primero
+    aquellas de las que se depende). Los conjuntos son bitmasks, de modo que cada unión es una
+    sola operación entera.
+
+    Parametros:
+    - nodos (iterable): Los nodos del grafo (enteros desde 0).
+    - sucesores (list o dict): nodo → iterable con los nodos a los que apunta.
+    - base (list): nodo → bitmask inicial.
+
+    Retorna:
+    - list: nodo → bitmask resultante.
+    """
+    resultado = list(base)
+    for componente in componentes_fuertemente_conexas(nodos, sucesores):
+        miembros = set(componente)
+        conjunto = 0
+        for nodo in componente:
+            conjunto |= base[nodo]
+            for destino in sucesores[nodo]:
+                if destino not in miembros:
+                    conjunto |= resultado[destino]
+        for nodo in componente:
+            resultado[nodo] = conjunto
+    return resultado
@@ -0,0 +1,68 @@
+def analizar_gramatica_input(texto_entrada):
+    """
+    Analiza el texto de entrada de la gramática y lo convierte en una estructura de diccionario.
+
+    Parametros:
+    - texto_entrada (str): El contenido completo del archivo input.txt.
+
+    Retorna:
+    - dict: Un diccionario que representa la gramática, donde cada producción es una tupla de símbolos
+            y la producción vacía ('e') es la tupla vacía, ej: {'S': [('a', 'A'), ('b',)], 'A': [()]}.
+    """
+    lineas = texto_entrada.strip().splitlines()
+    num_no_terminales = int(lineas[0])
+    gramatica = {}
+    
+    # Itera sobre cada línea que define una producción de un no-terminal
+    for i in range(1, num_no_terminales + 1):
+        linea = lineas[i]
+        if '->' not in linea:
+            continue
+        
+        # Separa la cabeza (no-terminal) del cuerpo de la producción
+        no_terminal, producciones_str = linea.split('->', 1)
+        no_terminal = no_terminal.strip()
+        
+        # Separa las diferentes alternativas de producción
+        alternativas = producciones_str.split('|')
+        
+        producciones_finales = []
+        for alt in alternativas:
+            alt = alt.strip()
+            if alt == 'e':
+                producciones_finales.append(())
+            else:
+                # Los símbolos de la producción van separados por espacios (ej: 'if E then S' → ('if', 'E', 'then', 'S'))
+                producciones_finales.append(tuple(alt.split()))
+
+        gramatica[no_terminal] = producciones_finales
+            
+    return gramatica
+
+def analizar_lexico_input(texto_entrada):
+    """
+    Lee las declaraciones léxicas opcionales que siguen a las producciones en input.txt.
+
+    - '%token nombre expresion' declara el patrón (expresión regular) que reconoce al terminal 'nombre'.
+    - '%ignore expresion' cambia el texto que se descarta entre tokens (por defecto espacios en blanco).
+    Los terminales sin '%token' se reconocen literalmente por su nombre.
+
+    Parametros:
+    - texto_entrada (str): El contenido completo del archivo input.txt.
+
+    Retorna:
+    - (patrones, ignorar): El diccionario terminal → expresión regular y la expresión a ignorar.
+    """
+    lineas = texto_entrada.strip().splitlines()
+    num_no_terminales = int(lineas[0])
+    patrones = {}
+    ignorar = r'\s+'
+
+    for linea in lineas[num_no_terminales + 1:]:
+        partes = linea.strip().split(None, 2)
+        if len(partes) == 3 and partes[0] == '%token':
+            patrones[partes[1]] = partes[2]
+        elif len(partes) >= 2 and partes[0] == '%ignore':
+            ignorar = linea.strip().split(None, 1)[1]
+
+    return patrones, ignorar
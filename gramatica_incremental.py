@@ -0,0 +1,741 @@
+from collections import Counter
+
+from grafos import componentes_fuertemente_conexas
+from first import calcular_anulables, aportes_first
+from follow import aportes_follow
+from verificador_ll1 import no_terminal_es_ll1
+from verificador_slr1 import closure, llenar_fila_lr, llenar_tablas_lr
+from verificador_lalr1 import calcular_anticipaciones_lalr1
+from tabla_ll1 import construir_fila_ll1
+from tablas_compiladas import compilar_tabla_ll1, compilar_tabla_slr1
+from tablas_comprimidas import comprimir_tabla_slr1
+from cache import AnalisisGramatica, clave_gramatica
+from simbolos import TablaSimbolos, BIT_EPSILON, EPSILON, FIN, cuerpo, formatear_produccion
+
+
+class GramaticaIncremental:
+    """
+    Una gramática que se edita de a una producción y mantiene al día los conjuntos First y Follow,
+    la tabla LL(1) y el autómata LR(0) con sus tablas SLR(1), sin recalcularlos desde cero.
+
+    Un cambio en las producciones de A solo se propaga por lo que depende de A:
+    - Anulables: al agregar, se propaga hacia los no terminales que usan a A; al quitar, se descartan
+      los anulables que usan (transitivamente) a A y se vuelven a derivar solo esos.
+    - First: se rehacen los aportes (ver aportes_first) de A y de los que usan un no terminal que cambió
+      de anulable, y se resuelven, en orden topológico, solo las componentes del grafo de dependencias
+      que dependen de ellos. Una componente cuyas entradas no cambiaron se salta.
+    - Follow: igual, con los aportes (ver aportes_follow) de las cabezas cuyas producciones, o el First
+      de alguno de sus símbolos, cambiaron, y el grafo de inclusiones.
+    - LL(1): se rehacen las filas de los no terminales cuyo First de alguna producción o cuyo Follow cambió.
+    - LR(0): solo cambian los estados cuya cerradura tiene ítems de A. Se recalculan esos y los estados
+      nuevos a los que llevan, el resto se reutiliza y los que quedan inalcanzables se descartan. Las filas
+      SLR(1) se rehacen para esos estados y para los que reducen un no terminal cuyo Follow cambió.
+
+    Los estados se guardan en casilleros que se reutilizan; automata() y tablas_slr1() los numeran igual
+    que construir_automata_lr0, asi el resultado es el mismo que el de analizar la gramática desde cero.
+    Los estados que quedan inalcanzables se siguen manteniendo al día (otro cambio puede volver a llegar a
+    ellos) y se descartan recién cuando hace falta: al preguntar es_slr1 con conflictos, o cuando ya son
+    tantos como los estados que había tras el último descarte.
+
+    Un no terminal al que se le quitan todas sus producciones sigue en la gramática, sin producciones.
+    Si se agregan producciones a un símbolo que hasta ahora era terminal, se recalcula todo desde cero
+    (cambia el sentido de cada producción donde aparece).
+
+    Atributos:
+    - gramatica (dict): La gramática actual (se modifica solo con los métodos de la clase).
+    - simbolos (TablaSimbolos): Ids de terminales y no terminales; los ids nunca cambian, solo se agregan.
+    - anulables (set): Los no terminales anulables.
+    - first (list), follow (list): Los bitmasks First y Follow de cada no terminal, indexados por id.
+    - tabla_ll1 (dict): La tabla LL(1), como la de construir_tabla_ll1.
+    - recalculados (dict): Cuánto se recalculó en el último cambio: no terminales cuyo First o Follow se
+      resolvió de nuevo, filas LL(1), estados LR(0) (cerrados o creados) y filas SLR(1).
+    """
+
+    def __init__(self, gramatica):
+        self._reconstruir(gramatica)
+
+    @property
+    def es_ll1(self):
+        return not self._no_ll1
+
+    @property
+    def es_slr1(self):
+        # Un estado inalcanzable no cuenta: si hay conflictos, primero se descartan los que sobran
+        if self._con_conflictos and self._por_descartar:
+            self._descartar_inalcanzables()
+        return not self._con_conflictos
+
+    @property
+    def conjuntos_first(self):
+        return self.simbolos.vista(self.first)
+
+    @property
+    def conjuntos_follow(self):
+        return self.simbolos.vista(self.follow)
+
+    def agregar_produccion(self, no_terminal, produccion):
+        """
+        Agrega la producción no_terminal → produccion y actualiza lo que depende de ella.
+
+        Parametros:
+        - no_terminal (str): La cabeza (si es un no terminal nuevo, se agrega al final de la gramática).
+        - produccion (tuple): Los símbolos del cuerpo (la tupla vacía para 'e').
+
+        Retorna:
+        - bool: False si la producción ya estaba (y no cambia nada), True si no.
+        """
+        produccion = tuple(cuerpo(produccion))
+        if no_terminal not in self.gramatica:
+            if no_terminal in self.simbolos.id_terminal or no_terminal == self._inicial_aumentado:
+                gramatica = dict(self.gramatica)
+                gramatica[no_terminal] = [produccion]
+                self._reconstruir(gramatica)
+                return True
+            self._registrar_no_terminal(no_terminal)
+        elif produccion in self.gramatica[no_terminal]:
+            return False
+
+        self.gramatica[no_terminal].append(produccion)
+        for simbolo in set(produccion):
+            if simbolo in self.gramatica:
+                self._usos[simbolo][no_terminal] += 1
+        cambiados = set()
+        if no_terminal not in self.anulables and self._es_anulable(produccion):
+            cambiados = self._derivar_anulables([no_terminal])
+        self._propagar({no_terminal}, cambiados)
+        return True
+
+    def quitar_produccion(self, no_terminal, produccion):
+        """
+        Quita la producción no_terminal → produccion y actualiza lo que depende de ella.
+
+        Parametros:
+        - no_terminal (str): La cabeza.
+        - produccion (tuple): Los símbolos del cuerpo (la tupla vacía para 'e').
+
+        Lanza ValueError si la producción no está en la gramática.
+        """
+        produccion = tuple(cuerpo(produccion))
+        if produccion not in self.gramatica.get(no_terminal, ()):
+            raise ValueError(f"La produccion {no_terminal} -> {formatear_produccion(produccion)} no esta en la gramatica.")
+
+        self.gramatica[no_terminal].remove(produccion)
+        for simbolo in set(produccion):
+            if simbolo in self.gramatica:
+                usos = self._usos[simbolo]
+                usos[no_terminal] -= 1
+                if not usos[no_terminal]:
+                    del usos[no_terminal]
+        cambiados = set()
+        if no_terminal in self.anulables:
+            cambiados = self._rederivar_anulables(no_terminal)
+        self._propagar({no_terminal}, cambiados, quitada=(no_terminal, produccion))
+
+    def sincronizar(self, gramatica):
+        """
+        Lleva la gramática a 'gramatica' (por ejemplo, input.txt después de editarlo) con la menor cantidad
+        de producciones agregadas y quitadas. Si desaparece algún no terminal, o los no terminales cambian
+        de orden, se recalcula todo desde cero.
+
+        Parametros:
+        - gramatica (dict): La gramática nueva.
+        """
+        actuales = list(self.gramatica)
+        if list(gramatica)[:len(actuales)] != actuales:
+            self._reconstruir(gramatica)
+            return
+
+        for no_terminal, producciones in gramatica.items():
+            objetivo = list(dict.fromkeys(tuple(cuerpo(p)) for p in producciones))
+            actual = self.gramatica.get(no_terminal, [])
+            for produccion in [p for p in actual if p not in objetivo]:
+                self.quitar_produccion(no_terminal, produccion)
+            # El orden de las producciones decide las celdas con conflicto: se conserva el prefijo que ya
+            # está en orden y el resto se vuelve a agregar al final, en el orden nuevo
+            actual = self.gramatica.get(no_terminal, [])
+            k = 0
+            while k < min(len(actual), len(objetivo)) and actual[k] == objetivo[k]:
+                k += 1
+            for produccion in actual[k:]:
+                self.quitar_produccion(no_terminal, produccion)
+            for produccion in objetivo[k:]:
+                self.agregar_produccion(no_terminal, produccion)
+            if no_terminal not in self.gramatica:
+                # Un no terminal nuevo sin producciones
+                self._registrar_no_terminal(no_terminal)
+                self._propagar({no_terminal}, set())
+
+    def automata(self):
+        """
+        Retorna:
+        - (estados, transiciones, simbolo_inicial_aumentado): El autómata LR(0), numerado igual que
+          construir_automata_lr0(gramatica).
+        """
+        orden, numero = self._numerar()
+        transiciones = {}
+        for n, i in enumerate(orden):
+            for simbolo, j in self._sucesores[i].items():
+                transiciones[(n, simbolo)] = numero[j]
+        return [self._estados[i] for i in orden], transiciones, self._inicial_aumentado
+
+    def tablas_slr1(self):
+        """
+        Retorna:
+        - (tabla_acciones, tabla_goto, conflictos): Como analizar_slr1(gramatica, conjuntos_follow).
+        """
+        orden, numero = self._numerar()
+
+        def renumerar(accion):
+            return ('shift', numero[accion[1]]) if accion[0] == 'shift' else accion
+
+        tabla_acciones = {}
+        tabla_goto = {}
+        conflictos = []
+        for n, i in enumerate(orden):
+            tabla_acciones[n] = {terminal: renumerar(accion) for terminal, accion in self._acciones[i].items()}
+            tabla_goto[n] = {no_terminal: numero[j] for no_terminal, j in self._goto[i].items()}
+            conflictos.extend((n, simbolo, tuple(renumerar(a) for a in acciones)) for simbolo, acciones in self._candidatas[i].items())
+        return tabla_acciones, tabla_goto, conflictos
+
+    def analisis(self, patrones=None):
+        """
+        Arma un AnalisisGramatica (ver cache.py) con el estado actual, igual al de construir_analisis pero
+        sin volver a calcular First, Follow, la tabla LL(1) ni el autómata LR(0). Usa una tabla de símbolos
+        propia, con los mismos ids que tendría un análisis desde cero, y no cambia aunque la gramática siga
+        editándose.
+
+        Parametros:
+        - patrones (dict, opcional): Los patrones léxicos; sus terminales se registran en la tabla de símbolos.
+
+        Retorna:
+        - AnalisisGramatica: El análisis completo.
+        """
+        simbolos = TablaSimbolos(self.gramatica)
+        for terminal in patrones or {}:
+            simbolos.agregar_terminal(terminal)
+        first_bits = [simbolos.a_bits(self.simbolos.a_conjunto(bits)) for bits in self.first]
+        follow_bits = [simbolos.a_bits(self.simbolos.a_conjunto(bits)) for bits in self.follow]
+
+        tabla_ll1 = compilar_tabla_ll1(self.tabla_ll1, 'S', simbolos) if self.es_ll1 else None
+        tabla_acciones, tabla_goto, conflictos = self.tablas_slr1()
+        tabla_slr1 = compilar_tabla_slr1(tabla_acciones, tabla_goto, simbolos)
+        tabla_lalr1 = None
+        conflictos_lalr1 = []
+        if conflictos:
+            automata = self.automata()
+            anticipaciones = calcular_anticipaciones_lalr1(self.gramatica, automata, simbolos)
+            tabla_acciones, tabla_goto, conflictos_lalr1 = llenar_tablas_lr(
+                self.gramatica, automata, simbolos, lambda i, no_terminal, produccion: anticipaciones.get((i, no_terminal, produccion), 0))
+            tabla_lalr1 = compilar_tabla_slr1(tabla_acciones, tabla_goto, simbolos)
+        comprimida_slr1 = comprimir_tabla_slr1(tabla_slr1) if not conflictos else None
+        comprimida_lalr1 = comprimir_tabla_slr1(tabla_lalr1) if tabla_lalr1 is not None and not conflictos_lalr1 else None
+
+        return AnalisisGramatica(clave_gramatica(self.gramatica, patrones), simbolos, first_bits, follow_bits,
+                                 self.es_ll1, tabla_ll1, tabla_slr1, conflictos, tabla_lalr1, conflictos_lalr1,
+                                 comprimida_slr1, comprimida_lalr1)
+
+    def _reconstruir(self, gramatica):
+        """Calcula todo desde cero para 'gramatica'."""
+        if 'S' not in gramatica:
+            raise ValueError("La gramatica debe contener un simbolo inicial 'S'.")
+        self.gramatica = {nt: [tuple(cuerpo(p)) for p in producciones] for nt, producciones in gramatica.items()}
+        self.simbolos = TablaSimbolos(self.gramatica)
+        self.anulables = calcular_anulables(self.gramatica)
+        self.first = []
+        self.follow = []
+        self.tabla_ll1 = {}
+        self._no_ll1 = set()
+
+        # Grafos de dependencias, por no terminal
+        self._usos = {} # B → Counter {A: producciones de A donde aparece B}
+        self._directos_first = {}
+        self._dependencias = {} # A → {B : First(B) ⊆ First(A)}
+        self._dependientes = {} # B → {A : First(B) ⊆ First(A)}
+        self._aportes_follow = {} # A → lo que devuelve aportes_follow para sus producciones
+        self._directos_follow = []
+        self._incluye = {} # B → {A : Follow(A) ⊆ Follow(B)}
+        self._incluido_en = {} # A → {B : Follow(A) ⊆ Follow(B)}
+
+        # Autómata LR(0): la gramática aumentada comparte las listas de producciones con 'gramatica'
+        self._inicial_aumentado = "S''" if "S'" in self.gramatica else "S'"
+        self._aumentada = dict(self.gramatica)
+        self._aumentada[self._inicial_aumentado] = [('S',)]
+        self._iniciales = {} # A → no terminales con los que empieza alguna producción de A
+        self._iniciales_inv = {}
+        self._alcanzados = {} # A → no terminales cuyos ítems iniciales entran en la cerradura de [X → α.Aβ]
+        self._cierres = {} # A → esos ítems, como en calcular_cierres
+        self._items_iniciales = {} # A → ítems [A → .γ] de sus producciones
+        self._avanzados = {} # A → {X: ítems [A → X.γ]}, lo que aportan sus ítems iniciales a cada GOTO
+        self._con_vacia = set() # No terminales con una producción 'e'
+        self._con_no_terminal = {} # A → estados con ítems de A en su cerradura
+        self._reducen = {} # A → estados con un ítem completo de A
+        self._en_nucleo = {} # A → estados con ítems de A en el núcleo
+
+        # Por casillero de estado (None si está libre)
+        self._nucleos = []
+        self._estados = []
+        self._cerrados = []
+        self._completos = []
+        self._sucesores = []
+        self._acciones = []
+        self._goto = []
+        self._candidatas = []
+        self._ids = {} # núcleo → casillero
+        self._libres = []
+        self._con_conflictos = set()
+        self._por_descartar = False # Si puede haber estados inalcanzables
+        self._tras_descartar = 0 # Cuántos estados quedaron en el último descarte
+
+        for no_terminal in self._aumentada:
+            self._registrar_no_terminal(no_terminal)
+        for no_terminal, producciones in self.gramatica.items():
+            for produccion in producciones:
+                for simbolo in set(produccion):
+                    if simbolo in self.gramatica:
+                        self._usos[simbolo][no_terminal] += 1
+        self._propagar(set(self.gramatica), set(), todo=True)
+
+    def _registrar_no_terminal(self, no_terminal):
+        """Crea las estructuras vacías de un no terminal (y lo agrega a la gramática si es nuevo)."""
+        if no_terminal not in self._aumentada:
+            self.gramatica[no_terminal] = []
+            self._aumentada[no_terminal] = self.gramatica[no_terminal]
+        if no_terminal != self._inicial_aumentado and no_terminal not in self.simbolos.id_no_terminal:
+            self.simbolos.id_no_terminal[no_terminal] = len(self.simbolos.no_terminales)
+            self.simbolos.no_terminales.append(no_terminal)
+        if no_terminal in self.gramatica:
+            self.first.append(0)
+            self.follow.append(0)
+            self._directos_follow.append(0)
+            self._usos[no_terminal] = Counter()
+            self._directos_first[no_terminal] = 0
+            self._dependencias[no_terminal] = set()
+            self._dependientes[no_terminal] = set()
+            self._aportes_follow[no_terminal] = {}
+            self._incluye[no_terminal] = set()
+            self._incluido_en[no_terminal] = set()
+            self.tabla_ll1[no_terminal] = {}
+        self._iniciales[no_terminal] = set()
+        self._iniciales_inv[no_terminal] = set()
+        self._alcanzados[no_terminal] = {no_terminal}
+        self._cierres[no_terminal] = frozenset()
+        self._items_iniciales[no_terminal] = frozenset()
+        self._avanzados[no_terminal] = {}
+        self._con_no_terminal[no_terminal] = set()
+        self._reducen[no_terminal] = set()
+        self._en_nucleo[no_terminal] = set()
+
+    def _es_anulable(self, produccion):
+        return all(simbolo in self.anulables or simbolo == EPSILON for simbolo in produccion)
+
+    def _derivar_anulables(self, semillas):
+        """Marca como anulables las semillas y propaga hacia los no terminales que las usan; retorna los nuevos."""
+        nuevos = set(semillas) - self.anulables
+        self.anulables |= nuevos
+        pendientes = list(nuevos)
+        while pendientes:
+            for no_terminal in self._usos[pendientes.pop()]:
+                if no_terminal not in self.anulables and any(self._es_anulable(p) for p in self.gramatica[no_terminal]):
+                    self.anulables.add(no_terminal)
+                    nuevos.add(no_terminal)
+                    pendientes.append(no_terminal)
+        return nuevos
+
+    def _rederivar_anulables(self, no_terminal):
+        """
+        Tras quitar una producción de un anulable: descarta los anulables que lo usan (transitivamente),
+        vuelve a derivar solo esos, y retorna los que dejaron de ser anulables.
+        """
+        candidatos = {no_terminal}
+        pendientes = [no_terminal]
+        while pendientes:
+            for usuario in self._usos[pendientes.pop()]:
+                if usuario in self.anulables and usuario not in candidatos:
+                    candidatos.add(usuario)
+                    pendientes.append(usuario)
+        self.anulables -= candidatos
+        self._derivar_anulables([nt for nt in candidatos if any(self._es_anulable(p) for p in self.gramatica[nt])])
+        return candidatos - self.anulables
+
+    def _propagar(self, cambiados, cambiados_anulables, quitada=None, todo=False):
+        """
+        Actualiza First, Follow, la tabla LL(1) y el autómata LR(0) después de que cambiaron las producciones
+        de los no terminales 'cambiados' (y con ellas, los anulables 'cambiados_anulables'). 'quitada' es la
+        producción (no_terminal, produccion) que se quitó, si fue eso lo que pasó.
+        """
+        # First: aportes de los no terminales tocados, luego las componentes que dependen de ellos
+        tocados = set(cambiados)
+        for no_terminal in cambiados_anulables:
+            tocados.update(self._usos[no_terminal])
+        for no_terminal in tocados:
+            self._aportar_first(no_terminal)
+        cambiados_first = self._resolver_first(tocados)
+
+        # Follow: aportes de las cabezas cuyas producciones, o el First de alguno de sus símbolos, cambiaron
+        cabezas = set(cambiados)
+        for no_terminal in cambiados_first:
+            cabezas.update(self._usos[no_terminal])
+        cambiados_follow = self._resolver_follow(cabezas, set(self.gramatica) if todo else set())
+
+        # LL(1): solo las filas que dependen de un First o un Follow que cambió
+        filas = tocados | cambiados_follow
+        for no_terminal in cambiados_first:
+            filas.update(self._dependientes[no_terminal])
+        for no_terminal in filas:
+            self._llenar_fila_ll1(no_terminal)
+
+        estados, filas_slr1 = self._actualizar_lr(cambiados, cambiados_follow, quitada)
+        self.recalculados = {"first": len(self._ultimo_first), "follow": len(self._ultimo_follow),
+                             "filas_ll1": len(filas), "estados_lr0": estados, "filas_slr1": filas_slr1}
+
+    def _aportar_first(self, no_terminal):
+        for dependencia in self._dependencias[no_terminal]:
+            self._dependientes[dependencia].discard(no_terminal)
+        self._directos_first[no_terminal], self._dependencias[no_terminal] = aportes_first(
+            self.gramatica[no_terminal], self.gramatica, self.anulables, self.simbolos)
+        for dependencia in self._dependencias[no_terminal]:
+            self._dependientes[dependencia].add(no_terminal)
+
+    def _resolver_first(self, tocados):
+        """Resuelve las componentes que dependen de los no terminales tocados; retorna aquellos cuyo First cambió."""
+        afectados = _cerrar_por(tocados, self._dependientes)
+        sucesores = {nt: [d for d in self._dependencias[nt] if d in afectados] for nt in afectados}
+        id_no_terminal = self.simbolos.id_no_terminal
+        cambiados = set()
+        resueltos = []
+        for componente in componentes_fuertemente_conexas(afectados, sucesores):
+            if not any(nt in tocados or not cambiados.isdisjoint(self._dependencias[nt]) for nt in componente):
+                continue
+            resueltos.extend(componente)
+            terminales = _first_de_componente(componente, self._directos_first, self._dependencias, self.first, id_no_terminal)
+            for no_terminal in componente:
+                nuevo = terminales | BIT_EPSILON if no_terminal in self.anulables else terminales
+                k = id_no_terminal[no_terminal]
+                if self.first[k] != nuevo:
+                    self.first[k] = nuevo
+                    cambiados.add(no_terminal)
+        self._ultimo_first = resueltos
+        return cambiados
+
+    def _resolver_follow(self, cabezas, semillas):
+        """Rehace los aportes de las cabezas y resuelve las componentes afectadas; retorna los no terminales cuyo Follow cambió."""
+        for cabeza in cabezas:
+            anterior = self._aportes_follow[cabeza]
+            nuevo = self._aportes_follow[cabeza] = aportes_follow(cabeza, self.gramatica[cabeza], self.simbolos, self.first)
+            if nuevo != anterior:
+                semillas.update(anterior)
+                semillas.update(nuevo)
+
+        id_no_terminal = self.simbolos.id_no_terminal
+        for no_terminal in semillas:
+            directos = self.simbolos.bit(FIN) if no_terminal == 'S' else 0
+            incluye = set()
+            for usuario in self._usos[no_terminal]:
+                terminales, hereda = self._aportes_follow[usuario][no_terminal]
+                directos |= terminales
+                if hereda:
+                    incluye.add(usuario)
+            self._directos_follow[id_no_terminal[no_terminal]] = directos
+            for origen in self._incluye[no_terminal] - incluye:
+                self._incluido_en[origen].discard(no_terminal)
+            for origen in incluye:
+                self._incluido_en[origen].add(no_terminal)
+            self._incluye[no_terminal] = incluye
+
+        afectados = _cerrar_por(semillas, self._incluido_en)
+        sucesores = {nt: [o for o in self._incluye[nt] if o in afectados] for nt in afectados}
+        cambiados = set()
+        resueltos = []
+        for componente in componentes_fuertemente_conexas(afectados, sucesores):
+            if not any(nt in semillas or not cambiados.isdisjoint(self._incluye[nt]) for nt in componente):
+                continue
+            resueltos.extend(componente)
+            conjunto = _follow_de_componente(componente, self._directos_follow, self._incluye, self.follow, id_no_terminal)
+            for no_terminal in componente:
+                k = id_no_terminal[no_terminal]
+                if self.follow[k] != conjunto:
+                    self.follow[k] = conjunto
+                    cambiados.add(no_terminal)
+        self._ultimo_follow = resueltos
+        return cambiados
+
+    def _llenar_fila_ll1(self, no_terminal):
+        producciones = self.gramatica[no_terminal]
+        self.tabla_ll1[no_terminal] = construir_fila_ll1(producciones, self.simbolos, self.first,
+                                                         self.follow[self.simbolos.id_no_terminal[no_terminal]])
+        if no_terminal_es_ll1(no_terminal, producciones, self.simbolos, self.first, self.follow):
+            self._no_ll1.discard(no_terminal)
+        else:
+            self._no_ll1.add(no_terminal)
+
+    def _actualizar_lr(self, cambiados, cambiados_follow, quitada):
+        """
+        Rehace los aportes a la cerradura que alcanzan a los no terminales cambiados, los estados cuya cerradura
+        los contiene (y de ellos, solo las transiciones con los símbolos cuyos ítems cambiaron), los estados
+        nuevos que aparecen y las filas SLR(1) afectadas.
+
+        Retorna:
+        - (estados, filas): Cuántos estados LR(0) se cerraron y cuántas filas SLR(1) se llenaron.
+        """
+        aumentada = self._aumentada
+        if not self._ids:
+            cambiados = cambiados | {self._inicial_aumentado}
+        cambian_iniciales = False
+        for no_terminal in cambiados:
+            producciones = aumentada[no_terminal]
+            self._items_iniciales[no_terminal] = frozenset((no_terminal, p, 0) for p in producciones)
+            avanzados = {}
+            for produccion in producciones:
+                if produccion:
+                    avanzados.setdefault(produccion[0], []).append((no_terminal, produccion, 1))
+            self._avanzados[no_terminal] = avanzados
+            if () in producciones:
+                self._con_vacia.add(no_terminal)
+            else:
+                self._con_vacia.discard(no_terminal)
+
+            iniciales = avanzados.keys() & aumentada.keys()
+            if iniciales != self._iniciales[no_terminal]:
+                cambian_iniciales = True
+                for siguiente in self._iniciales[no_terminal] - iniciales:
+                    self._iniciales_inv[siguiente].discard(no_terminal)
+                for siguiente in iniciales:
+                    self._iniciales_inv[siguiente].add(no_terminal)
+                self._iniciales[no_terminal] = iniciales
+
+        # Solo cambia el aporte a la cerradura de los que llegan por la izquierda a un no terminal cambiado
+        for no_terminal in _cerrar_por(cambiados, self._iniciales_inv):
+            if cambian_iniciales:
+                self._alcanzados[no_terminal] = _cerrar_por((no_terminal,), self._iniciales)
+            self._cierres[no_terminal] = frozenset().union(*map(self._items_iniciales.__getitem__, self._alcanzados[no_terminal]))
+
+        # Estados cuya cerradura cambió: solo cambian sus transiciones con símbolos de los ítems que entraron o salieron
+        visitados = []
+        nuevos = []
+        quitados = False
+        pendientes = set()
+        for no_terminal in cambiados:
+            pendientes |= self._con_no_terminal[no_terminal]
+        for i in pendientes:
+            anterior = self._estados[i]
+            self._cerrar(i)
+            visitados.append(i)
+            sucesores = self._sucesores[i]
+            for simbolo in {p[punto] for (_, p, punto) in anterior ^ self._estados[i] if punto < len(p)}:
+                destino = sucesores.pop(simbolo, None)
+                items = self._avanzar(i, simbolo)
+                if items:
+                    sucesores[simbolo] = self._destino(items, nuevos)
+                quitados = quitados or (destino is not None and destino != sucesores.get(simbolo))
+
+        # Estados nuevos: todas sus transiciones
+        if not self._ids:
+            nuevos.append(self._crear_estado(frozenset({(self._inicial_aumentado, ('S',), 0)})))
+        while nuevos:
+            i = nuevos.pop()
+            visitados.append(i)
+            self._sucesores[i] = {simbolo: self._destino(items, nuevos) for simbolo, items in self._agrupar(i).items()}
+
+        # Los estados con ítems de la producción quitada en el núcleo ya no se pueden alcanzar ni volver a usar
+        if quitada is not None and quitada[1] not in self.gramatica[quitada[0]]:
+            no_terminal, produccion = quitada
+            for i in list(self._en_nucleo[no_terminal]):
+                if any(nt == no_terminal and p == produccion for (nt, p, _) in self._nucleos[i]):
+                    self._liberar(i)
+
+        self._por_descartar = self._por_descartar or quitados
+        if self._por_descartar and len(self._ids) > 2 * self._tras_descartar + 64:
+            self._descartar_inalcanzables()
+
+        filas = set(visitados)
+        for no_terminal in cambiados_follow:
+            filas |= self._reducen[no_terminal]
+        filas = [i for i in filas if self._nucleos[i] is not None]
+        for i in filas:
+            self._llenar_fila_slr1(i)
+        return len(visitados), len(filas)
+
+    def _avanzar(self, i, simbolo):
+        """El núcleo de GOTO(i, simbolo): los ítems del estado i con el punto antes de 'simbolo', con el punto movido."""
+        items = [(nt, p, punto + 1) for (nt, p, punto) in self._nucleos[i] if punto < len(p) and p[punto] == simbolo]
+        for no_terminal in self._cerrados[i]:
+            items.extend(self._avanzados[no_terminal].get(simbolo, ()))
+        return items
+
+    def _agrupar(self, i):
+        """Como agrupar_sucesores(estado i), armado con el núcleo y los ítems avanzados de cada no terminal cerrado."""
+        grupos = {}
+        for (nt, p, punto) in self._nucleos[i]:
+            if punto < len(p):
+                grupos.setdefault(p[punto], []).append((nt, p, punto + 1))
+        for no_terminal in self._cerrados[i]:
+            for simbolo, items in self._avanzados[no_terminal].items():
+                grupos.setdefault(simbolo, []).extend(items)
+        return grupos
+
+    def _destino(self, items, nuevos):
+        """El casillero del estado con núcleo 'items'; si no existe, lo crea y lo agrega a 'nuevos'."""
+        nucleo = frozenset(items)
+        j = self._ids.get(nucleo)
+        if j is None:
+            j = self._crear_estado(nucleo)
+            nuevos.append(j)
+        return j
+
+    def _crear_estado(self, nucleo):
+        """Ubica un estado nuevo en un casillero libre (o al final) y calcula su cerradura."""
+        if self._libres:
+            i = self._libres.pop()
+        else:
+            i = len(self._nucleos)
+            for lista in (self._nucleos, self._estados, self._cerrados, self._completos, self._sucesores,
+                          self._acciones, self._goto, self._candidatas):
+                lista.append(None)
+        self._nucleos[i] = nucleo
+        self._ids[nucleo] = i
+        for (no_terminal, _, _) in nucleo:
+            self._en_nucleo[no_terminal].add(i)
+        self._cerrados[i] = ()
+        self._completos[i] = ()
+        self._sucesores[i] = {}
+        self._cerrar(i)
+        return i
+
+    def _cerrar(self, i):
+        """Recalcula la cerradura del estado i y lo registra en los índices por no terminal."""
+        for no_terminal in self._cerrados[i]:
+            self._con_no_terminal[no_terminal].discard(i)
+        for no_terminal, _ in self._completos[i]:
+            self._reducen[no_terminal].discard(i)
+
+        nucleo = self._nucleos[i]
+        cerrados = set()
+        for (_, produccion, punto) in nucleo:
+            if punto < len(produccion) and produccion[punto] in self._aumentada:
+                cerrados |= self._alcanzados[produccion[punto]]
+        # Ítems completos: los del núcleo con el punto al final y los de producciones 'e' de la cerradura
+        completos = [(nt, produccion) for (nt, produccion, punto) in nucleo if punto == len(produccion)]
+        completos.extend((nt, ()) for nt in cerrados & self._con_vacia)
+
+        self._estados[i] = closure(nucleo, self._aumentada, self._cierres)
+        self._cerrados[i] = cerrados
+        self._completos[i] = completos
+        for no_terminal in cerrados:
+            self._con_no_terminal[no_terminal].add(i)
+        for no_terminal, _ in completos:
+            self._reducen[no_terminal].add(i)
+
+    def _descartar_inalcanzables(self):
+        """Libera los casilleros de los estados a los que ya no se llega desde el estado inicial."""
+        alcanzables = {0}
+        pendientes = [0]
+        while pendientes:
+            for j in self._sucesores[pendientes.pop()].values():
+                if j not in alcanzables:
+                    alcanzables.add(j)
+                    pendientes.append(j)
+        for i, nucleo in enumerate(self._nucleos):
+            if nucleo is not None and i not in alcanzables:
+                self._liberar(i)
+        self._por_descartar = False
+        self._tras_descartar = len(self._ids)
+
+    def _liberar(self, i):
+        """Saca al estado i de los índices y deja su casillero libre."""
+        nucleo = self._nucleos[i]
+        del self._ids[nucleo]
+        for (no_terminal, _, _) in nucleo:
+            self._en_nucleo[no_terminal].discard(i)
+        for no_terminal in self._cerrados[i]:
+            self._con_no_terminal[no_terminal].discard(i)
+        for no_terminal, _ in self._completos[i]:
+            self._reducen[no_terminal].discard(i)
+        for lista in (self._nucleos, self._estados, self._cerrados, self._completos, self._sucesores,
+                      self._acciones, self._goto, self._candidatas):
+            lista[i] = None
+        self._con_conflictos.discard(i)
+        self._libres.append(i)
+
+    def _llenar_fila_slr1(self, i):
+        follow = self.follow
+        id_no_terminal = self.simbolos.id_no_terminal
+        self._acciones[i], self._goto[i], self._candidatas[i] = llenar_fila_lr(
+            self._completos[i], self._sucesores[i], self.gramatica, self.simbolos, self._inicial_aumentado,
+            lambda no_terminal, produccion: follow[id_no_terminal[no_terminal]], self._orden_produccion)
+        if self._candidatas[i]:
+            self._con_conflictos.add(i)
+        else:
+            self._con_conflictos.discard(i)
+
+    def _orden_produccion(self, item):
+        """Posición de la producción en la gramática (no terminal, índice), la misma que usa llenar_tablas_lr."""
+        no_terminal, produccion = item
+        if no_terminal == self._inicial_aumentado:
+            return (-1, 0)
+        return (self.simbolos.id_no_terminal[no_terminal], self.gramatica[no_terminal].index(produccion))
+
+    def _numerar(self):
+        """
+        Numera los estados vivos en el orden en que los crea construir_automata_lr0: a lo ancho desde el
+        inicial, con los símbolos de cada estado en un orden fijo.
+
+        Retorna:
+        - (orden, numero): Los casilleros en orden de número, y casillero → número.
+        """
+        orden_simbolos = {no_terminal: k for k, no_terminal in enumerate(self.gramatica)}
+        orden_simbolos[self._inicial_aumentado] = len(orden_simbolos)
+        for producciones in self.gramatica.values():
+            for produccion in producciones:
+                for simbolo in produccion:
+                    orden_simbolos.setdefault(simbolo, len(orden_simbolos))
+
+        orden = [0]
+        numero = {0: 0}
+        for i in orden:
+            sucesores = self._sucesores[i]
+            for simbolo in sorted(sucesores, key=orden_simbolos.__getitem__):
+                j = sucesores[simbolo]
+                if j not in numero:
+                    numero[j] = len(orden)
+                    orden.append(j)
+        return orden, numero
+
+
+def _cerrar_por(inicio, vecinos):
+    """Los nodos alcanzables desde 'inicio' (incluidos) siguiendo vecinos[nodo]."""
+    alcanzados = set(inicio)
+    pendientes = list(alcanzados)
+    while pendientes:
+        for vecino in vecinos[pendientes.pop()]:
+            if vecino not in alcanzados:
+                alcanzados.add(vecino)
+                pendientes.append(vecino)
+    return alcanzados
+
+def _first_de_componente(componente, directos, dependencias, first, id_no_terminal):
+    """
+    Los terminales (sin 'e') del First que comparten los miembros de una componente del grafo de
+    dependencias (ver aportes_first), ya resueltas las componentes de las que depende.
+    """
+    miembros = set(componente)
+    terminales = 0
+    for no_terminal in componente:
+        terminales |= directos[no_terminal]
+        for dependencia in dependencias[no_terminal]:
+            if dependencia not in miembros:
+                terminales |= first[id_no_terminal[dependencia]]
+    return terminales & ~BIT_EPSILON
+
+def _follow_de_componente(componente, directos, incluye, follow, id_no_terminal):
+    """
+    El Follow que comparten los miembros de una componente del grafo de inclusiones (directos
+    indexados por id, incluye por nombre), ya resueltas las componentes de cuyo Follow depende.
+    """
+    miembros = set(componente)
+    conjunto = 0
+    for no_terminal in componente:
+        conjunto |= directos[id_no_terminal[no_terminal]]
+        for origen in incluye[no_terminal]:
+            if origen not in miembros:
+                conjunto |= follow[id_no_terminal[origen]]
+    return conjunto
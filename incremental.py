@@ -0,0 +1,191 @@
+from array import array
+from tablas_compiladas import ACEPTAR
+from simbolos import ID_FIN
+
+# Si los nodos acumulados superan este múltiplo de la cantidad de tokens, editar() vuelve a analizar
+# todo desde cero para descartar los nodos de las versiones anteriores
+FACTOR_COMPACTACION = 8
+
+
+class ParserIncremental:
+    """
+    Parser SLR(1) (o LALR(1)) que guarda un punto de control en cada frontera entre tokens, para
+    volver a analizar solo la parte afectada cuando la entrada cambia un poco.
+
+    La pila de estados es persistente: cada elemento es un nodo (estado, padre) en dos arreglos, un
+    shift agrega un nodo cuyo padre es el tope y un reduce sube por los padres y agrega el nodo del
+    GOTO. Los nodos nunca se modifican, asi que el tope después de cada shift identifica la pila
+    completa en ese momento: puntos[i] es el tope tras desplazar los primeros i tokens, que solo
+    depende de esos i tokens.
+
+    Al editar los tokens [inicio, fin) se retoma el análisis desde puntos[inicio]. Pasada la edición,
+    tras cada shift se compara la pila nueva con la que tenía un análisis anterior en la misma
+    posición (con los mismos tokens por delante); en cuanto coinciden, el resto de ese análisis
+    (puntos y resultado) sigue valiendo y se reutiliza sin recorrerlo. Asi una edición cuesta más o
+    menos lo que ocupa, y no lo que mide toda la entrada.
+
+    Los puntos posteriores a un error tampoco se pierden: quedan como 'segmentos' de análisis
+    anteriores, asi al corregir el error el análisis se vuelve a sincronizar con ellos.
+
+    Atributos:
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+    - tokens (list): Los ids de los terminales de la entrada actual, sin el '$' final.
+    - estado (array), padre (array): Los nodos de la pila persistente (padre -1 para la base).
+    - puntos (list): Por frontera i (0 .. len(tokens)), un nodo tope: el del análisis actual si i < hasta,
+      el de un análisis anterior si i está en un segmento, y si no -1.
+    - hasta (int): Hasta qué frontera (sin incluirla) llegó el análisis actual.
+    - segmentos (list): Tramos [desde, hasta) de puntos de análisis anteriores que siguen valiendo para
+      lo que resta de la entrada, cada uno con el resultado al que llegó: (desde, hasta, aceptada, error).
+    - aceptada (bool): Si la entrada actual es aceptada.
+    - error (int o None): Si no es aceptada, la posición del token con el que falló (len(tokens) si es el '$').
+    - reanalizados (int): Cuántos tokens se desplazaron en la última llamada a analizar() o editar().
+    """
+
+    def __init__(self, tabla):
+        self.tabla = tabla
+        self.tokens = []
+        self.estado = array('i')
+        self.padre = array('i')
+        self.puntos = []
+        self.hasta = 0
+        self.segmentos = []
+        self.aceptada = False
+        self.error = None
+        self.reanalizados = 0
+
+    def analizar(self, tokens):
+        """
+        Analiza toda la entrada desde cero y guarda sus puntos de control.
+
+        Parametros:
+        - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+
+        Retorna:
+        - bool: True si la cadena es aceptada, False si hay error sintáctico.
+        """
+        self.tokens = list(tokens)
+        self.estado = array('i', [0])
+        self.padre = array('i', [-1])
+        self.puntos = [-1] * (len(self.tokens) + 1)
+        self.puntos[0] = 0
+        self.segmentos = []
+        self._reanudar(0)
+        return self.aceptada
+
+    def editar(self, inicio, fin, nuevos):
+        """
+        Reemplaza los tokens [inicio, fin) por 'nuevos' y vuelve a analizar solo lo necesario.
+
+        Parametros:
+        - inicio (int), fin (int): El rango de tokens reemplazado (inicio == fin para insertar).
+        - nuevos (iterable): Los ids de los tokens que quedan en su lugar (vacío para borrar).
+
+        Retorna:
+        - bool: True si la nueva entrada es aceptada, False si hay error sintáctico.
+        """
+        nuevos = list(nuevos)
+        if not 0 <= inicio <= fin <= len(self.tokens):
+            raise ValueError(f"Rango de edicion invalido: [{inicio}, {fin}) con {len(self.tokens)} tokens")
+        desplazamiento = len(nuevos) - (fin - inicio)
+        self.tokens[inicio:fin] = nuevos
+        if len(self.estado) > FACTOR_COMPACTACION * (len(self.tokens) + 1) + 1024:
+            return self.analizar(self.tokens)
+
+        # Los puntos hasta 'inicio' no cambian. Los de las fronteras viejas desde 'desde' tienen por
+        # delante los mismos tokens que antes, asi que sirven para sincronizar: se corren a su nueva
+        # posición y el resto del tramo editado queda sin punto (-1)
+        if nuevos:
+            desde = fin
+            self.puntos[inicio + 1:fin + 1] = [-1] * (len(nuevos) - 1) + [self.puntos[fin]]
+        else:
+            desde = fin + 1
+            self.puntos[inicio + 1:fin + 1] = []
+        segmentos = []
+        for a, h, aceptada, error in [(0, self.hasta, self.aceptada, self.error)] + self.segmentos:
+            a = max(a, desde)
+            if a < h:
+                segmentos.append((a + desplazamiento, h + desplazamiento, aceptada,
+                                  None if error is None else error + desplazamiento))
+        self.segmentos = segmentos
+
+        if self.hasta <= inicio:
+            # El análisis actual falló antes de la edición, con tokens que no cambiaron
+            self.reanalizados = 0
+            return self.aceptada
+        self.hasta = inicio + 1
+        self._reanudar(inicio)
+        return self.aceptada
+
+    def _iguales(self, a, b):
+        """Si las pilas con tope en los nodos a y b tienen los mismos estados."""
+        estado = self.estado
+        padre = self.padre
+        while a != b:
+            if a < 0 or b < 0 or estado[a] != estado[b]:
+                return False
+            a = padre[a]
+            b = padre[b]
+        return True
+
+    def _reanudar(self, posicion):
+        """
+        Sigue el análisis desde puntos[posicion] hasta terminar o hasta sincronizarse con un segmento.
+
+        Parametros:
+        - posicion (int): La frontera desde la que se retoma.
+        """
+        tabla = self.tabla
+        ancho = tabla.ancho
+        acciones = tabla.acciones
+        ancho_goto = tabla.ancho_goto
+        goto = tabla.goto
+        cabezas = tabla.cabezas
+        longitudes = tabla.longitudes
+        estado = self.estado
+        padre = self.padre
+        puntos = self.puntos
+        tokens = self.tokens
+        total = len(tokens)
+        segmentos = self.segmentos
+        k = 0 # El primer segmento que todavía puede contener la frontera actual
+
+        i = posicion
+        tope = puntos[i]
+        actual = tokens[i] if i < total else ID_FIN
+        reanalizados = 0
+        while True:
+            accion = acciones[estado[tope] * ancho + actual]
+            if accion > 0:
+                estado.append(accion - 1)
+                padre.append(tope)
+                tope = len(estado) - 1
+                i += 1
+                reanalizados += 1
+                while k < len(segmentos) and segmentos[k][1] <= i:
+                    k += 1
+                if k < len(segmentos) and segmentos[k][0] <= i:
+                    anterior = puntos[i]
+                    if estado[anterior] == accion - 1 and self._iguales(tope, anterior):
+                        # La pila volvió a ser la de ese análisis: el resto de sus puntos y su resultado valen
+                        _, self.hasta, self.aceptada, self.error = segmentos[k]
+                        self.segmentos = segmentos[k + 1:]
+                        self.reanalizados = reanalizados
+                        return
+                puntos[i] = tope
+                actual = tokens[i] if i < total else ID_FIN
+            elif accion < ACEPTAR:
+                p = -accion - 1
+                for _ in range(longitudes[p]):
+                    tope = padre[tope]
+                estado.append(goto[estado[tope] * ancho_goto + cabezas[p]])
+                padre.append(tope)
+                tope = len(estado) - 1
+            else:
+                self.aceptada = accion == ACEPTAR
+                self.error = None if self.aceptada else i
+                self.hasta = i + 1
+                # Los puntos de los segmentos que recorrió el análisis nuevo quedaron reemplazados
+                self.segmentos = [(max(a, self.hasta), h, aceptada, error)
+                                  for a, h, aceptada, error in segmentos[k:] if h > self.hasta]
+                self.reanalizados = reanalizados
+                return
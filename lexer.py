@@ -0,0 +1,184 @@
+import re
+from simbolos import EPSILON, FIN
+
+class ErrorLexico(ValueError):
+    """Se lanza cuando ningún terminal reconoce el texto en una posición de la entrada."""
+
+    def __init__(self, posicion, fragmento):
+        self.posicion = posicion
+        super().__init__(f"Simbolo no reconocido en la posicion {posicion}: {fragmento!r}")
+
+
+class Lexer:
+    """
+    Analizador léxico: convierte texto en la secuencia de ids de terminales de una gramática.
+
+    Cada terminal se reconoce por el patrón (expresión regular) declarado para él o, si no tiene
+    patrón, literalmente por su nombre; por ejemplo los terminales 'if', '(' o '+'. En cada posición
+    gana el reconocimiento más largo; ante un empate gana el literal (asi las palabras clave se
+    distinguen de los identificadores) y luego el patrón declarado primero. El texto que reconoce
+    el patrón 'ignorar' (por defecto espacios en blanco) se descarta entre tokens.
+    """
+
+    def __init__(self, simbolos, patrones=None, ignorar=r'\s+'):
+        """
+        Parametros:
+        - simbolos (TablaSimbolos): La tabla de símbolos de la gramática. Los terminales con patrón
+          que no estén en ella se registran, por eso conviene crear el Lexer antes de compilar las tablas.
+        - patrones (dict o list, opcional): terminal → expresión regular, en orden de prioridad.
+        - ignorar (str, opcional): Expresión regular del texto a descartar entre tokens (None para no descartar nada).
+        """
+        self.simbolos = simbolos
+        patrones = dict(patrones or {})
+
+        # Literales: los terminales sin patrón, del más largo al más corto para que la alternativa
+        # de la expresión regular siempre reconozca el literal más largo posible
+        literales = [t for t in simbolos.terminales if t not in (EPSILON, FIN) and t not in patrones]
+        literales.sort(key=len, reverse=True)
+        self._literales = re.compile('|'.join(map(re.escape, literales))) if literales else None
+        self._patrones = [(re.compile(patron), simbolos.agregar_terminal(terminal)) for terminal, patron in patrones.items()]
+        self._ignorar = re.compile(ignorar) if ignorar else None
+
+    def tokens_con_posicion(self, texto):
+        """
+        Recorre el texto y genera los tokens reconocidos.
+
+        Parametros:
+        - texto (str): El texto de entrada.
+
+        Retorna:
+        - generador de (id_terminal, inicio, fin): El id de cada token y su posición en el texto.
+          Lanza ErrorLexico si un fragmento no corresponde a ningún terminal.
+        """
+        return self._escanear(texto, 0, True)
+
+    def _escanear(self, texto, desplazamiento, final, max_token=0):
+        """
+        Genera los tokens de 'texto' (con posiciones sumadas a 'desplazamiento').
+
+        Si no es el 'final' de la entrada, lo que empieza a menos de 'max_token' caracteres del final
+        del texto no se analiza: el próximo bloque podría extender un token (incluso uno que aquí
+        termina antes del final, como '12.' que sigue en '12.5'), asi que ese pedazo se vuelve a
+        analizar junto con el siguiente bloque. Tampoco se emite un token (o texto ignorado) que llega
+        hasta el final del texto. El generador devuelve (como valor de retorno) la posición desde
+        donde hay que retomar con el siguiente bloque.
+        """
+        id_terminal = self.simbolos.id_terminal
+        literales = self._literales
+        patrones = self._patrones
+        ignorar = self._ignorar
+        posicion = 0
+        longitud = len(texto)
+
+        while posicion < longitud:
+            if not final and longitud - posicion <= max_token:
+                return posicion
+            if ignorar is not None:
+                coincidencia = ignorar.match(texto, posicion)
+                if coincidencia and coincidencia.end() > posicion:
+                    if not final and coincidencia.end() == longitud:
+                        return posicion
+                    posicion = coincidencia.end()
+                    continue
+
+            mejor_fin = posicion
+            mejor_id = None
+            if literales is not None:
+                coincidencia = literales.match(texto, posicion)
+                if coincidencia:
+                    mejor_fin = coincidencia.end()
+                    mejor_id = id_terminal[coincidencia.group()]
+            for patron, id_patron in patrones:
+                coincidencia = patron.match(texto, posicion)
+                if coincidencia and coincidencia.end() > mejor_fin:
+                    mejor_fin = coincidencia.end()
+                    mejor_id = id_patron
+
+            if mejor_id is None or mejor_fin == posicion:
+                raise ErrorLexico(desplazamiento + posicion, texto[posicion:posicion + 10])
+            if not final and mejor_fin == longitud:
+                return posicion
+            yield mejor_id, desplazamiento + posicion, desplazamiento + mejor_fin
+            posicion = mejor_fin
+        return posicion
+
+    def tokens_de_bloques(self, bloques, con_posicion=False, max_token=4096):
+        """
+        Genera los tokens de una entrada que llega por bloques de texto (por ejemplo un archivo leído
+        por partes), sin juntar nunca la entrada completa: solo se guarda el pedazo del final de cada
+        bloque que podría continuar en el siguiente.
+
+        Parametros:
+        - bloques (iterable): Los bloques de texto, en orden.
+        - con_posicion (bool): Si es True genera (id, inicio, fin) en vez de solo el id.
+        - max_token (int): Largo máximo que puede tener un token partido entre dos bloques.
+
+        Retorna:
+        - generador de ids (o de (id, inicio, fin)). Lanza ErrorLexico como tokens_con_posicion.
+        """
+        resto = ''
+        desplazamiento = 0
+        for bloque in bloques:
+            texto = resto + bloque
+            escaner = self._escanear(texto, desplazamiento, False, max_token)
+            if con_posicion:
+                posicion = yield from escaner
+            else:
+                while True:
+                    try:
+                        yield next(escaner)[0]
+                    except StopIteration as fin:
+                        posicion = fin.value
+                        break
+            resto = texto[posicion:]
+            desplazamiento += posicion
+        for token in self._escanear(resto, desplazamiento, True):
+            yield token if con_posicion else token[0]
+
+    async def tokens_de_bloques_async(self, bloques, con_posicion=False, max_token=4096):
+        """
+        Igual que tokens_de_bloques, pero para un iterable asíncrono de bloques de texto.
+
+        Retorna:
+        - generador asíncrono de ids (o de (id, inicio, fin)).
+        """
+        resto = ''
+        desplazamiento = 0
+        async for bloque in bloques:
+            texto = resto + bloque
+            escaner = self._escanear(texto, desplazamiento, False, max_token)
+            while True:
+                try:
+                    token = next(escaner)
+                except StopIteration as fin:
+                    posicion = fin.value
+                    break
+                yield token if con_posicion else token[0]
+            resto = texto[posicion:]
+            desplazamiento += posicion
+        for token in self._escanear(resto, desplazamiento, True):
+            yield token if con_posicion else token[0]
+
+    def tokens_de_archivo(self, archivo, tam_bloque=1 << 16, con_posicion=False):
+        """
+        Genera los tokens de un archivo de texto abierto, leyéndolo por bloques de 'tam_bloque' caracteres.
+
+        Parametros:
+        - archivo (file): Archivo abierto en modo texto.
+        - tam_bloque (int): Cantidad de caracteres por lectura.
+        - con_posicion (bool): Si es True genera (id, inicio, fin) en vez de solo el id.
+
+        Retorna:
+        - generador de ids (o de (id, inicio, fin)).
+        """
+        return self.tokens_de_bloques(iter(lambda: archivo.read(tam_bloque), ''), con_posicion)
+
+    def tokens(self, texto):
+        """Genera solo los ids de los terminales del texto (ver tokens_con_posicion)."""
+        for id_token, _, _ in self.tokens_con_posicion(texto):
+            yield id_token
+
+    def nombres(self, texto):
+        """Devuelve la lista de nombres de los terminales del texto, para los parsers sobre diccionarios."""
+        terminales = self.simbolos.terminales
+        return [terminales[id_token] for id_token, _, _ in self.tokens_con_posicion(texto)]
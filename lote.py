@@ -0,0 +1,267 @@
+import json
+import mmap
+import multiprocessing
+import os
+import time
+from functools import partial
+
+from cache import obtener_analisis
+from gramatica import analizar_gramatica_input, analizar_lexico_input
+from tablas_compiladas import parse_ll1_compilado
+from lote_vectorizado import analizar_lote_slr1
+from tablas_comprimidas import parse_slr1_comprimido
+from recuperacion import recuperar_ll1, recuperar_slr1
+from parser_earley import construir_tabla_earley, parse_earley, errores_earley
+from lexer import Lexer, ErrorLexico
+
+# Tamaño aproximado (en bytes) de cada bloque de líneas que se reparte a los procesos
+TAM_BLOQUE = 1 << 20
+
+
+def construir_analizador(texto_gramatica, parser='auto', directorio_cache=None, vectorizado=False):
+    """
+    Construye, a partir del texto de input.txt, todo lo necesario para analizar cadenas sin interacción.
+
+    Parametros:
+    - texto_gramatica (str): El contenido del archivo de la gramática (mismo formato que input.txt).
+    - parser (str): 'll1', 'slr1', 'lalr1', 'earley' o 'auto' (LL(1) si la gramática lo es, si no SLR(1), si no
+      LALR(1) y si no Earley, que sirve para cualquier gramática).
+    - directorio_cache (str, opcional): Directorio del cache de análisis (ver cache.py); con None no se usa.
+    - vectorizado (bool): Analizar las cadenas de a grupos con analizar_lote_slr1 (ver lote_vectorizado.py).
+      Solo sirve con SLR(1) o LALR(1): con 'auto' no se elige LL(1).
+
+    Retorna:
+    - (nombre_parser, lexer, tabla, funcion_parse, recuperar): El parser elegido, el Lexer, la tabla y el
+      driver que la usa: la tabla LL(1) compilada con parse_ll1_compilado, o las tablas SLR(1)/LALR(1)
+      comprimidas (que ocupan mucha menos memoria en cada proceso) con parse_slr1_comprimido. 'recuperar'
+      recibe los tokens de una cadena rechazada y devuelve todos sus errores (ver recuperacion.py); con
+      SLR(1)/LALR(1) obtiene las tablas sin comprimir recién al primer rechazo (ver recuperacion_diferida),
+      asi en cada proceso solo quedan residentes las comprimidas.
+      Si es 'vectorizado', la tabla es la SLR(1)/LALR(1) compilada sin comprimir y funcion_parse es
+      analizar_lote_slr1, que recibe todas las cadenas a la vez. Con Earley, la tabla es la TablaEarley y
+      funcion_parse es parse_earley (ver parser_earley.py). Lanza ValueError si la gramática no sirve para el parser pedido.
+    """
+    gramatica = analizar_gramatica_input(texto_gramatica)
+    if 'S' not in gramatica:
+        raise ValueError("La gramatica debe contener un simbolo inicial 'S'.")
+
+    patrones, ignorar = analizar_lexico_input(texto_gramatica)
+    analisis = obtener_analisis(gramatica, patrones, directorio_cache)
+    lexer = Lexer(analisis.simbolos, patrones, ignorar)
+
+    if vectorizado:
+        if parser in ('auto', 'slr1') and analisis.es_slr1:
+            return ('slr1', lexer, analisis.tabla_slr1, analizar_lote_slr1,
+                    partial(recuperar_slr1, tabla=analisis.tabla_slr1, conjuntos_follow=analisis.conjuntos_follow))
+        if parser in ('auto', 'lalr1') and analisis.es_lalr1:
+            return ('lalr1', lexer, analisis.tabla_lalr1, analizar_lote_slr1,
+                    partial(recuperar_slr1, tabla=analisis.tabla_lalr1, conjuntos_follow=analisis.conjuntos_follow))
+        if parser in ('ll1', 'earley'):
+            raise ValueError("Vectorized mode requires an SLR(1) or LALR(1) parser.")
+        if parser == 'auto':
+            raise ValueError("Grammar is neither SLR(1) nor LALR(1).")
+        raise ValueError(f"Grammar is not {parser.upper()}.")
+
+    if parser in ('auto', 'll1') and analisis.es_ll1:
+        return ('ll1', lexer, analisis.tabla_ll1, parse_ll1_compilado,
+                partial(recuperar_ll1, tabla=analisis.tabla_ll1, conjuntos_follow=analisis.conjuntos_follow))
+    if parser in ('auto', 'slr1') and analisis.es_slr1:
+        return ('slr1', lexer, analisis.comprimida_slr1, parse_slr1_comprimido,
+                recuperacion_diferida(gramatica, patrones, directorio_cache, 'slr1'))
+    if parser in ('auto', 'lalr1') and analisis.es_lalr1:
+        return ('lalr1', lexer, analisis.comprimida_lalr1, parse_slr1_comprimido,
+                recuperacion_diferida(gramatica, patrones, directorio_cache, 'lalr1'))
+    if parser in ('auto', 'earley'):
+        tabla_earley = construir_tabla_earley(gramatica, simbolos=analisis.simbolos)
+        return ('earley', lexer, tabla_earley, parse_earley, partial(errores_earley, tabla=tabla_earley))
+    raise ValueError(f"Grammar is not {parser.upper()}.")
+
+
+def recuperacion_diferida(gramatica, patrones, directorio_cache, parser):
+    """
+    Devuelve una función como recuperar_slr1 que obtiene las tablas sin comprimir la primera vez que se usa.
+
+    La recuperación necesita las tablas densas (las comprimidas reducen por defecto en vez de detectar
+    el error), pero solo para las cadenas rechazadas en formato 'jsonl'. Asi un proceso que no las usa
+    no las tiene en memoria: con cache solo se mapean (sin leerlas) hasta que hacen falta, y sin cache
+    se recalculan recién al primer rechazo.
+
+    Parametros:
+    - gramatica (dict), patrones (dict): La gramática y sus patrones léxicos.
+    - directorio_cache (str o None): El directorio del cache (ver obtener_analisis).
+    - parser (str): 'slr1' o 'lalr1'.
+
+    Retorna:
+    - function: recuperar(tokens) → lista de ErrorSintactico.
+    """
+    tablas = []
+    def recuperar(tokens):
+        if not tablas:
+            analisis = obtener_analisis(gramatica, patrones, directorio_cache)
+            tablas.append(analisis.tabla_slr1 if parser == 'slr1' else analisis.tabla_lalr1)
+            tablas.append(analisis.conjuntos_follow)
+        return recuperar_slr1(tokens, *tablas)
+    return recuperar
+
+
+def dividir_en_bloques(datos, tam_bloque=TAM_BLOQUE):
+    """
+    Divide un buffer (por ejemplo un mmap) en rangos de bytes que terminan en un fin de línea.
+
+    Parametros:
+    - datos (mmap o bytes): El contenido del archivo de entrada.
+    - tam_bloque (int): Tamaño aproximado de cada rango.
+
+    Retorna:
+    - generador de (inicio, fin): Rangos consecutivos que cubren todo el buffer.
+    """
+    inicio = 0
+    total = len(datos)
+    while inicio < total:
+        corte = datos.find(b'\n', min(inicio + tam_bloque, total) - 1)
+        fin = total if corte == -1 else corte + 1
+        yield inicio, fin
+        inicio = fin
+
+
+def analizar_lineas(texto, lexer, tabla, funcion_parse, formato, recuperar=None, vectorizado=False):
+    """
+    Analiza cada línea de 'texto' y devuelve los resultados ya formateados, uno por línea.
+
+    Parametros:
+    - texto (str): Líneas de entrada separadas por '\\n'.
+    - lexer (Lexer), tabla, funcion_parse, recuperar: Lo que devuelve construir_analizador.
+    - formato (str): 'veredicto' (una línea 'yes'/'no' por cadena) o 'jsonl' (un objeto JSON por cadena).
+      En 'jsonl', las cadenas rechazadas se vuelven a analizar con 'recuperar' (si se da) para listar
+      todos sus errores sintácticos; las aceptadas se analizan una sola vez, como siempre.
+    - vectorizado (bool): Si funcion_parse es analizar_lote_slr1: primero se obtienen los tokens de
+      todas las líneas y luego se analizan juntas.
+
+    Retorna:
+    - (cantidad, salida): La cantidad de líneas analizadas y el texto de salida.
+    """
+    lineas = texto.split('\n')
+    if texto.endswith('\n'):
+        lineas.pop()
+
+    lineas = [linea.rstrip('\r') for linea in lineas]
+    if vectorizado:
+        secuencias = []
+        errores_lexicos = {}
+        for i, linea in enumerate(lineas):
+            try:
+                secuencias.append(list(lexer.tokens(linea)))
+            except ErrorLexico as e:
+                secuencias.append([])
+                errores_lexicos[i] = str(e)
+        aceptadas, _ = funcion_parse(secuencias, tabla)
+
+    salida = []
+    for i, linea in enumerate(lineas):
+        error = None
+        if vectorizado:
+            error = errores_lexicos.get(i)
+            acepta = error is None and bool(aceptadas[i])
+        else:
+            try:
+                acepta = funcion_parse(lexer.tokens(linea), tabla)
+            except ErrorLexico as e:
+                acepta = False
+                error = str(e)
+        if formato == 'jsonl':
+            registro = {"entrada": linea, "acepta": acepta}
+            if error is not None:
+                registro["error"] = error
+            elif not acepta and recuperar is not None:
+                # Cada error lleva además la columna (en caracteres) del token donde se detectó
+                tokens = list(lexer.tokens_con_posicion(linea))
+                registro["errores"] = [dict(e.a_dict(), columna=tokens[e.posicion][1] if e.posicion < len(tokens) else len(linea))
+                                       for e in recuperar(t[0] for t in tokens)]
+            salida.append(json.dumps(registro, ensure_ascii=False))
+        else:
+            salida.append("yes" if acepta else "no")
+    if not salida:
+        return 0, ''
+    return len(lineas), '\n'.join(salida) + '\n'
+
+
+# Estado de cada proceso trabajador (se llena una sola vez en _iniciar_trabajador)
+_trabajador = {}
+
+def _iniciar_trabajador(texto_gramatica, parser, ruta_entrada, formato, directorio_cache, vectorizado):
+    """Obtiene las tablas propias del proceso (del cache, si hay) y mapea el archivo de entrada en memoria."""
+    _, lexer, tabla, funcion_parse, recuperar = construir_analizador(texto_gramatica, parser, directorio_cache, vectorizado)
+    archivo = open(ruta_entrada, 'rb')
+    _trabajador.update(lexer=lexer, tabla=tabla, funcion_parse=funcion_parse, recuperar=recuperar, formato=formato,
+                       vectorizado=vectorizado, archivo=archivo,
+                       datos=mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _procesar_bloque(rango):
+    """Analiza las líneas del rango de bytes (inicio, fin) del archivo mapeado."""
+    inicio, fin = rango
+    texto = _trabajador['datos'][inicio:fin].decode('utf-8')
+    return analizar_lineas(texto, _trabajador['lexer'], _trabajador['tabla'], _trabajador['funcion_parse'], _trabajador['formato'],
+                           _trabajador['recuperar'], _trabajador['vectorizado'])
+
+
+def procesar_lote(texto_gramatica, ruta_entrada, ruta_salida, parser='auto', formato='veredicto', procesos=None, tam_bloque=TAM_BLOQUE,
+                  directorio_cache=None, vectorizado=False):
+    """
+    Analiza un archivo con una cadena por línea y escribe un resultado por línea, en el mismo orden.
+
+    El archivo se mapea en memoria y se divide en bloques de líneas que se reparten entre un grupo
+    de procesos; cada proceso obtiene sus propias tablas al iniciar y mapea el archivo por su cuenta,
+    asi que solo viajan entre procesos los rangos de bytes y los resultados. Con un directorio de cache,
+    el proceso principal deja el análisis guardado y cada trabajador solo tiene que mapearlo.
+
+    Parametros:
+    - texto_gramatica (str): El contenido del archivo de la gramática.
+    - ruta_entrada (str): Archivo con una cadena por línea.
+    - ruta_salida (str): Archivo donde se escriben los resultados.
+    - parser (str): 'll1', 'slr1', 'lalr1', 'earley' o 'auto'.
+    - formato (str): 'veredicto' o 'jsonl'.
+    - procesos (int, opcional): Cantidad de procesos (por defecto, uno por CPU). Con 1 no se crean procesos.
+    - tam_bloque (int): Tamaño aproximado en bytes de cada bloque de trabajo.
+    - directorio_cache (str, opcional): Directorio del cache de análisis; con None no se usa.
+    - vectorizado (bool): Analizar las cadenas de cada bloque todas juntas (ver lote_vectorizado.py).
+
+    Retorna:
+    - dict: Estadísticas: parser usado, líneas, bytes, segundos, líneas por segundo y MB por segundo.
+    """
+    # Construir el analizador en el proceso principal valida la gramática antes de lanzar procesos
+    nombre_parser, lexer, tabla, funcion_parse, recuperar = construir_analizador(texto_gramatica, parser, directorio_cache, vectorizado)
+    procesos = procesos or os.cpu_count() or 1
+
+    inicio_reloj = time.perf_counter()
+    total_lineas = 0
+    total_bytes = os.path.getsize(ruta_entrada)
+
+    with open(ruta_salida, 'w', encoding='utf-8') as salida:
+        if total_bytes:
+            with open(ruta_entrada, 'rb') as archivo, mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+                rangos = list(dividir_en_bloques(datos, tam_bloque))
+                if procesos == 1 or len(rangos) == 1:
+                    resultados = (analizar_lineas(datos[i:f].decode('utf-8'), lexer, tabla, funcion_parse, formato, recuperar,
+                                                  vectorizado)
+                                  for i, f in rangos)
+                    for cantidad, texto in resultados:
+                        total_lineas += cantidad
+                        salida.write(texto)
+                else:
+                    with multiprocessing.Pool(procesos, _iniciar_trabajador, (texto_gramatica, parser, ruta_entrada, formato, directorio_cache,
+                                                                            vectorizado)) as grupo:
+                        # imap conserva el orden de los bloques
+                        for cantidad, texto in grupo.imap(_procesar_bloque, rangos):
+                            total_lineas += cantidad
+                            salida.write(texto)
+
+    segundos = time.perf_counter() - inicio_reloj
+    return {
+        "parser": nombre_parser,
+        "lineas": total_lineas,
+        "bytes": total_bytes,
+        "segundos": segundos,
+        "lineas_por_segundo": total_lineas / segundos if segundos else 0.0,
+        "mb_por_segundo": total_bytes / (1 << 20) / segundos if segundos else 0.0,
+    }
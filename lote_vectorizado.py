@@ -0,0 +1,118 @@
+from itertools import chain
+from tablas_compiladas import ACEPTAR, CAPACIDAD_PILA, parse_slr1_posicion
+from simbolos import ID_FIN
+
+# NumPy es opcional: sin él, analizar_lote_slr1 analiza cadena por cadena con parse_slr1_posicion
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Cantidad de cadenas que avanzan juntas (cada grupo reserva una pila de estados por cadena)
+TAM_GRUPO = 4096
+
+
+def matriz_tokens(secuencias):
+    """
+    Junta varias cadenas de ids de terminales en una matriz rectangular.
+
+    Parametros:
+    - secuencias (list): Las cadenas, cada una una secuencia (con len) de ids de terminales, sin el '$' final.
+
+    Retorna:
+    - (matriz, largos): La matriz de NumPy (una fila por cadena) con cada cadena rellenada con '$'
+      hasta el largo de la más larga más uno (asi toda fila termina en '$'), y el largo de cada cadena.
+    """
+    largos = np.fromiter(map(len, secuencias), dtype=np.int64, count=len(secuencias))
+    columnas = int(largos.max(initial=0)) + 1
+    matriz = np.full((len(secuencias), columnas), ID_FIN, dtype=np.int32)
+    # Las celdas de los tokens, en orden de filas, son justo las de la concatenación de las cadenas
+    matriz[np.arange(columnas) < largos[:, None]] = np.fromiter(chain.from_iterable(secuencias), dtype=np.int32,
+                                                                 count=int(largos.sum()))
+    return matriz, largos
+
+
+def analizar_lote_slr1(secuencias, tabla, tam_grupo=TAM_GRUPO):
+    """
+    Analiza muchas cadenas con las mismas tablas SLR(1) (o LALR(1)), avanzando todos los parsers a la vez.
+
+    Pensado para muchas cadenas cortas, donde analizar de a una queda dominado por el costo del
+    intérprete: las cadenas se ordenan por largo y se analizan por grupos de 'tam_grupo'. En cada
+    grupo, todos los parsers hacen su siguiente paso juntos: la acción de cada uno se busca en la
+    tabla ACTION densa con un solo indexado de NumPy, y los shifts y reduces se aplican con máscaras
+    sobre los estados, topes y posiciones de todos. Las pilas de estados son las filas de una matriz
+    y las cadenas que terminan salen del conjunto de las activas, asi cada paso cuesta lo que las
+    cadenas que siguen en curso. Sin NumPy, las cadenas se analizan de a una con parse_slr1_posicion.
+
+    Parametros:
+    - secuencias (iterable): Las cadenas, cada una un iterable de ids de terminales sin el '$' final
+      (ver TablaSLR1Compilada.codificar o Lexer.tokens).
+    - tabla (TablaSLR1Compilada): Las tablas compiladas (sin comprimir: la búsqueda es en la tabla densa).
+    - tam_grupo (int): Cantidad de cadenas que avanzan juntas.
+
+    Retorna:
+    - (aceptadas, posiciones): Por cadena, si es aceptada y la posición del token donde se detectó el
+      error (-1 si es aceptada), igual que parse_slr1_posicion. Con NumPy son arreglos de NumPy y sin él, listas.
+    """
+    secuencias = [s if isinstance(s, (list, tuple)) else list(s) for s in secuencias]
+    if np is None:
+        resultados = [parse_slr1_posicion(s, tabla) for s in secuencias]
+        return [r[0] for r in resultados], [r[1] for r in resultados]
+
+    tablas = (np.asarray(tabla.acciones, dtype=np.int32), tabla.ancho, np.asarray(tabla.goto, dtype=np.int32),
+              tabla.ancho_goto, np.asarray(tabla.cabezas, dtype=np.int32), np.asarray(tabla.longitudes, dtype=np.int32))
+    aceptadas = np.zeros(len(secuencias), dtype=bool)
+    posiciones = np.full(len(secuencias), -1, dtype=np.int64)
+    # Ordenar por largo hace que las cadenas de cada grupo terminen casi al mismo tiempo
+    orden = sorted(range(len(secuencias)), key=lambda i: len(secuencias[i]))
+    for inicio in range(0, len(orden), tam_grupo):
+        indices = orden[inicio:inicio + tam_grupo]
+        matriz, _ = matriz_tokens([secuencias[i] for i in indices])
+        aceptadas[indices], posiciones[indices] = _analizar_grupo(matriz, tablas)
+    return aceptadas, posiciones
+
+
+def _analizar_grupo(matriz, tablas):
+    """Analiza las filas de la matriz (ver matriz_tokens) en paralelo; retorna (aceptadas, posiciones) como arreglos."""
+    acciones, ancho, goto, ancho_goto, cabezas, longitudes = tablas
+    cantidad = len(matriz)
+    aceptadas = np.zeros(cantidad, dtype=bool)
+    posiciones = np.full(cantidad, -1, dtype=np.int64)
+
+    profundidad = CAPACIDAD_PILA
+    pilas = np.zeros((cantidad, profundidad), dtype=np.int32)
+    # Estado de los parsers activos: fila de la matriz, estado actual, posición del estado en su pila y del token actual
+    filas = np.arange(cantidad)
+    estado = np.zeros(cantidad, dtype=np.int32)
+    tope = np.zeros(cantidad, dtype=np.int64)
+    posicion = np.zeros(cantidad, dtype=np.int64)
+    while len(filas):
+        accion = acciones[estado * ancho + matriz[filas, posicion]]
+        desplazar = accion > 0
+        reducir = accion < ACEPTAR
+        termina = ~(desplazar | reducir)
+        if termina.any():
+            # Accept o error: la cadena sale de las activas
+            fin = filas[termina]
+            aceptadas[fin] = accion[termina] == ACEPTAR
+            posiciones[fin] = np.where(aceptadas[fin], -1, posicion[termina])
+            sigue = ~termina
+            filas, accion, desplazar, reducir = filas[sigue], accion[sigue], desplazar[sigue], reducir[sigue]
+            estado, tope, posicion = estado[sigue], tope[sigue], posicion[sigue]
+            if not len(filas):
+                break
+
+        # Reduce por la producción p: se retira su lado derecho y se sigue con GOTO desde el estado que queda
+        # en el tope (en las filas que hacen shift, p = 0 y la máscara descarta el resultado)
+        p = np.where(reducir, -accion - 1, 0)
+        tope -= np.where(reducir, longitudes[p], 0)
+        destino = goto[pilas[filas, tope] * ancho_goto + np.where(reducir, cabezas[p], 0)]
+        # Shift: el estado destino viene en la acción y se consume el token
+        estado = np.where(desplazar, accion - 1, destino)
+        posicion += desplazar
+        tope += 1
+        if tope.max() == profundidad:
+            pilas = np.concatenate((pilas, np.zeros_like(pilas)), axis=1)
+            profundidad += profundidad
+        pilas[filas, tope] = estado
+    return aceptadas, posiciones
@@ -1,70 +1,147 @@
-from first import calcular_conjuntos_first
-from follow import calcular_conjuntos_follow
-from verificador_ll1 import es_gramatica_ll1, calcular_first_de_produccion
-from verificador_slr1 import es_gramatica_slr1
-from tabla_ll1 import construir_tabla_ll1
 from parser_ll1 import parse_ll1
-from parser_slr1 import construir_tabla_slr1, parse_slr1
-import copy
+from parser_slr1 import parse_slr1
+from tablas_compiladas import descompilar_tabla_ll1, descompilar_tabla_slr1, parse_ll1_compilado, parse_slr1_compilado, contar_pasos_ll1, contar_pasos_slr1
+from cache import obtener_analisis, DIRECTORIO_CACHE
+from gramatica import analizar_gramatica_input, analizar_lexico_input
+from lexer import Lexer, ErrorLexico
+from tablas_comprimidas import informe_compresion
+from recuperacion import errores_ll1, errores_slr1
+from parser_earley import construir_tabla_earley, parse_earley, errores_earley
+from arbol import ArbolSintactico, construir_arbol_ll1, construir_arbol_slr1
+from lote import procesar_lote
+from estadisticas import Estadisticas, activar, fase
+from traza import crear_traza_ll1, crear_traza_slr1, parse_ll1_trazado, parse_slr1_trazado
+from generador import generar_modulo_ll1, generar_modulo_slr1, escribir_modulo
+import argparse
 
-def analizar_gramatica_input(texto_entrada):
+# Nombres con los que --estadisticas muestra los pasos de cada cadena analizada
+NOMBRES_PASOS = {'coincidencias': 'matches', 'expansiones': 'expansions', 'desplazamientos': 'shifts', 'reducciones': 'reduces'}
+
+def leer_argumentos(argumentos=None):
     """
-    Analiza el texto de entrada de la gramática y lo convierte en una estructura de diccionario.
+    Lee las opciones de la línea de comandos.
+
+    Sin opciones el programa funciona como siempre (interactivo, con input.txt). Con --batch analiza
+    sin interacción un archivo con una cadena por línea.
 
     Parametros:
-    - texto_entrada (str): El contenido completo del archivo input.txt.
+    - argumentos (list, opcional): Los argumentos a leer; por defecto, los de sys.argv.
 
     Retorna:
-    - dict: Un diccionario que representa la gramática, ej: {'S': ['aA', 'b']}.
+    - argparse.Namespace: Las opciones leídas.
     """
-    lineas = texto_entrada.strip().splitlines()
-    num_no_terminales = int(lineas[0])
-    gramatica = {}
-    
-    # Itera sobre cada línea que define una producción de un no-terminal
-    for i in range(1, num_no_terminales + 1):
-        linea = lineas[i]
-        if '->' not in linea:
-            continue
-        
-        # Separa la cabeza (no-terminal) del cuerpo de la producción
-        no_terminal, producciones_str = linea.split('->', 1)
-        no_terminal = no_terminal.strip()
-        
-        # Separa las diferentes alternativas de producción
-        alternativas = producciones_str.split('|')
-        
-        producciones_finales = []
-        for alt in alternativas:
-            alt = alt.strip()
-            if alt == 'e':
-                producciones_finales.append('e')
-            else:
-                # Une los símbolos de la producción (ej: 'a A' se convierte en 'aA')
-                producciones_finales.append("".join(alt.split()))
+    lector = argparse.ArgumentParser(description="Analizador sintáctico LL(1), SLR(1) y LALR(1).")
+    lector.add_argument('--gramatica', default='input.txt', help="archivo con la gramática (por defecto input.txt)")
+    lector.add_argument('--batch', metavar='ENTRADA', help="archivo con una cadena por línea para analizar sin interacción")
+    lector.add_argument('--salida', help="archivo de resultados del modo --batch (por defecto ENTRADA.out)")
+    lector.add_argument('--parser', choices=['auto', 'll1', 'slr1', 'lalr1', 'earley'], default='auto',
+                        help="parser a usar en modo --batch y con --generar ('earley' solo en modo --batch)")
+    lector.add_argument('--formato', choices=['veredicto', 'jsonl'], default='veredicto',
+                        help="'veredicto': una línea yes/no por cadena; 'jsonl': un objeto JSON por cadena")
+    lector.add_argument('--vectorizado', action='store_true',
+                        help="en modo --batch, analizar las cadenas de cada bloque todas juntas con NumPy (solo SLR(1)/LALR(1))")
+    lector.add_argument('--procesos', type=int, default=None, help="procesos del modo --batch (por defecto, uno por CPU)")
+    lector.add_argument('--arbol', action='store_true', help="mostrar el árbol sintáctico de cada cadena aceptada")
+    lector.add_argument('--errores', action='store_true', help="mostrar todos los errores sintácticos de cada cadena rechazada")
+    lector.add_argument('--informe-tablas', action='store_true',
+                        help="mostrar el tamaño de las tablas SLR(1)/LALR(1) con y sin comprimir")
+    lector.add_argument('--cache', default=DIRECTORIO_CACHE, help=f"directorio del cache de tablas (por defecto {DIRECTORIO_CACHE})")
+    lector.add_argument('--sin-cache', action='store_true', help="calcular todo sin leer ni escribir el cache")
+    lector.add_argument('--estadisticas', action='store_true',
+                        help="mostrar el tiempo de cada fase, los contadores y los pasos de cada cadena (con --sin-cache se miden todas las fases)")
+    lector.add_argument('--perfil', metavar='FASE', action='append',
+                        help="ejecutar la fase (ej: first, follow, slr1, automata_lr0) bajo cProfile y mostrar su perfil; se puede repetir")
+    lector.add_argument('--memoria', metavar='FASE', action='append', help="medir con tracemalloc la memoria de la fase; se puede repetir")
+    lector.add_argument('--generar', metavar='MODULO.py',
+                        help="escribir un módulo de Python independiente con el parser de la gramática (ver --parser) y terminar")
+    lector.add_argument('--traza', metavar='N', type=int, default=0,
+                        help="guardar los últimos N pasos de cada análisis y mostrarlos cuando una cadena es rechazada")
+    return lector.parse_args(argumentos)
 
-        gramatica[no_terminal] = producciones_finales
-            
-    return gramatica
+def main_lote(opciones, texto_entrada, medidas=None):
+    """
+    Modo por lotes: analiza el archivo de opciones.batch y escribe los resultados en orden.
+
+    Parametros:
+    - opciones (argparse.Namespace): Las opciones de la línea de comandos.
+    - texto_entrada (str): El contenido del archivo de la gramática.
+    - medidas (Estadisticas, opcional): Si se dan, se muestran al final (solo las del proceso principal).
+    """
+    salida = opciones.salida or opciones.batch + '.out'
+    try:
+        estadisticas = procesar_lote(texto_entrada, opciones.batch, salida, opciones.parser, opciones.formato, opciones.procesos,
+                                     directorio_cache=None if opciones.sin_cache else opciones.cache, vectorizado=opciones.vectorizado)
+    except FileNotFoundError:
+        print(f"Error: No se encontro el archivo '{opciones.batch}'.")
+        return
+    except ValueError as error:
+        print(error)
+        return
+
+    print(f"Parsed {estadisticas['lineas']} strings with {estadisticas['parser'].upper()} in {estadisticas['segundos']:.3f} s "
+          f"({estadisticas['lineas_por_segundo']:.0f} strings/s, {estadisticas['mb_por_segundo']:.2f} MB/s). Results in '{salida}'.")
+    if medidas is not None:
+        print(medidas.informe())
+
+def main_generar(opciones, analisis):
+    """
+    Escribe en opciones.generar un módulo de Python independiente con el parser elegido con opciones.parser.
+
+    Parametros:
+    - opciones (argparse.Namespace): Las opciones de la línea de comandos.
+    - analisis (AnalisisGramatica): El análisis de la gramática.
+    """
+    parser = opciones.parser
+    if parser == 'earley':
+        print("Parser modules can only be generated for LL(1), SLR(1) or LALR(1) grammars.")
+        return
+    if parser in ('auto', 'll1') and analisis.es_ll1:
+        nombre, codigo = 'LL(1)', generar_modulo_ll1(analisis.tabla_ll1)
+    elif parser in ('auto', 'slr1') and analisis.es_slr1:
+        nombre, codigo = 'SLR(1)', generar_modulo_slr1(analisis.tabla_slr1)
+    elif parser in ('auto', 'lalr1') and analisis.es_lalr1:
+        nombre, codigo = 'LALR(1)', generar_modulo_slr1(analisis.tabla_lalr1, 'LALR(1)')
+    elif parser == 'auto':
+        print("Grammar is neither LL(1), SLR(1) nor LALR(1).")
+        return
+    else:
+        print(f"Grammar is not {parser.upper()}.")
+        return
+    escribir_modulo(codigo, opciones.generar)
+    print(f"{nombre} parser written to '{opciones.generar}'.")
 
-def main():
+def main(argumentos=None):
     """
     Función principal que orquesta todo el proceso del analizador sintáctico.
 
     - Lee la gramática de entrada.
     - Calcula los conjuntos First y Follow.
-    - Verifica si la gramática es LL(1) y/o SLR(1).
-    - Maneja la interacción con el usuario para el análisis de cadenas.
+    - Verifica si la gramática es LL(1) y/o SLR(1) (o, si no es SLR(1), LALR(1)).
+    - Maneja la interacción con el usuario para el análisis de cadenas,
+      o el análisis por lotes si se usa --batch.
     """
+    opciones = leer_argumentos(argumentos)
+
+    # Con --estadisticas (o --perfil/--memoria) cada fase se mide desde aquí; si no, la instrumentación queda apagada
+    estadisticas = None
+    if opciones.estadisticas or opciones.perfil or opciones.memoria:
+        estadisticas = Estadisticas(opciones.perfil, opciones.memoria)
+        activar(estadisticas)
+
     # --- 1. Lectura y Preparación de la Gramática ---
     try:
-        with open('input.txt', 'r') as archivo:
+        with open(opciones.gramatica, 'r') as archivo:
             texto_entrada = archivo.read()
     except FileNotFoundError:
-        print("Error: No se encontro el archivo 'input.txt'.")
+        print(f"Error: No se encontro el archivo '{opciones.gramatica}'.")
         return
 
-    gramatica = analizar_gramatica_input(texto_entrada)
+    if opciones.batch:
+        main_lote(opciones, texto_entrada, estadisticas)
+        return
+
+    with fase('lectura'):
+        gramatica = analizar_gramatica_input(texto_entrada)
     
     # El símbolo inicial 'S' es un requisito del programa
     if 'S' not in gramatica:
@@ -72,8 +149,17 @@ def main():
         return
 
     # --- 2. Cálculos y Verificaciones ---
-    conjuntos_first = calcular_conjuntos_first(gramatica)
-    conjuntos_follow = calcular_conjuntos_follow(gramatica, conjuntos_first)
+    # First, Follow, las verificaciones y las tablas compiladas salen del cache si la gramática no cambió
+    patrones, ignorar = analizar_lexico_input(texto_entrada)
+    analisis = obtener_analisis(gramatica, patrones, None if opciones.sin_cache else opciones.cache)
+    if opciones.generar:
+        main_generar(opciones, analisis)
+        return
+    conjuntos_first = analisis.conjuntos_first
+    conjuntos_follow = analisis.conjuntos_follow
+
+    # El lexer comparte la tabla de símbolos del análisis (que ya incluye los terminales de %token)
+    lexer = Lexer(analisis.simbolos, patrones, ignorar)
 
     # Imprimir conjuntos First y Follow para el usuario
     import json
@@ -86,40 +172,152 @@ def main():
         print(f'"{key}": {json.dumps(sorted(list(value)))}')
     print("--------------------\n")
 
+    if estadisticas is not None:
+        print("--- Stats ---")
+        print(estadisticas.informe())
+        print("--------------------\n")
+
     # Determinar el tipo de gramática
-    es_ll1 = es_gramatica_ll1(gramatica, conjuntos_first, conjuntos_follow)
-    es_slr1 = es_gramatica_slr1(gramatica, conjuntos_follow)
+    es_ll1 = analisis.es_ll1
+    es_slr1 = analisis.es_slr1
+    # Si la gramática no es SLR(1) pero sí LALR(1), el parser ascendente usa las tablas LALR(1)
+    es_lalr1 = analisis.es_lalr1
+    parser_lr = 'slr1' if es_slr1 else 'lalr1'
+    nombre_lr = 'SLR(1)' if es_slr1 else 'LALR(1)'
 
-    # --- 3. Construcción de Tablas y Menú Interactivo ---
-    tabla_ll1 = None
-    tabla_slr1_acciones = None
-    tabla_slr1_goto = None
+    # --- 3. Tablas y Menú Interactivo ---
+    # Versiones compiladas (arreglos planos) de las tablas, para analizar sin el modo detallado
+    compilada_ll1 = analisis.tabla_ll1 if es_ll1 else None
+    compilada_slr1 = analisis.tabla_slr1 if es_slr1 else analisis.tabla_lalr1 if es_lalr1 else None
+    # Si no hay parser determinista, se usa Earley, que sirve para cualquier gramática
+    tabla_earley = construir_tabla_earley(gramatica, simbolos=analisis.simbolos) if not es_ll1 and not es_lalr1 else None
 
-    if es_ll1:
-        tabla_ll1 = construir_tabla_ll1(gramatica, conjuntos_first, conjuntos_follow)
-    if es_slr1:
-        tabla_slr1_acciones, tabla_slr1_goto = construir_tabla_slr1(gramatica, conjuntos_follow)
+    if opciones.informe_tablas and es_lalr1:
+        informe = informe_compresion(compilada_slr1, analisis.comprimida_slr1 if es_slr1 else analisis.comprimida_lalr1)
+        print(f"{nombre_lr} tables: {informe['estados']} states, {informe['celdas']} cells in {informe['bytes_sin_comprimir']} bytes; "
+              f"compressed to {informe['entradas']} entries in {informe['bytes_comprimidos']} bytes ({informe['proporcion']:.1%}).")
 
     # Función auxiliar para llamar al parser correspondiente
+    # El modo detallado usa los parsers sobre diccionarios; si no, se usan las tablas compiladas
+    # La cadena pasa primero por el lexer; un símbolo no reconocido hace que no sea aceptada
+    # Con --arbol se construye además el árbol sintáctico y, si la cadena es aceptada, se muestra
+    # Con --errores se analiza con recuperación y se muestran todos los errores de una cadena rechazada
+    # Con --estadisticas se usan los drivers que cuentan los pasos, y se muestran los de cada cadena;
+    # si además se pide --traza, una cadena rechazada se vuelve a analizar con la traza para mostrarla
+    def parse_contando(cadena, tabla, contar_pasos):
+        with fase('lexico'):
+            tokens = list(lexer.tokens(cadena))
+        with fase('parse'):
+            acepta, pasos = contar_pasos(tokens, tabla)
+        estadisticas.contar('parse.cadenas')
+        estadisticas.contar('parse.tokens', len(tokens))
+        for nombre, cantidad in pasos.items():
+            estadisticas.contar('parse.' + nombre, cantidad)
+        detalle = ', '.join(f"{cantidad} {NOMBRES_PASOS[nombre]}" for nombre, cantidad in pasos.items())
+        print(f"Steps: {sum(pasos.values())} ({detalle}) for {len(tokens)} tokens")
+        return acepta
+
+    # El modo detallado usa las tablas en forma de diccionario, que se reconstruyen de las compiladas
+    # la primera vez que se elige (asi el arranque y el modo normal no pagan por ellas)
+    detalladas = {}
+    def tablas_detalladas(parser_type):
+        clave = 'll1' if parser_type == 'll1' else 'lr'
+        if clave not in detalladas:
+            if clave == 'll1':
+                detalladas[clave] = (descompilar_tabla_ll1(compilada_ll1),)
+            else:
+                detalladas[clave] = descompilar_tabla_slr1(compilada_slr1)
+        return detalladas[clave]
+
+    # Con --traza cada análisis guarda sus últimos pasos (sin formatearlos) y solo se muestran si la cadena es rechazada
+    trazas = {}
+    def parse_trazando(cadena, tabla, crear_traza, parse_trazado):
+        traza = trazas.get(crear_traza)
+        if traza is None:
+            traza = trazas[crear_traza] = crear_traza(tabla, opciones.traza)
+        acepta = parse_trazado(lexer.tokens(cadena), tabla, traza)
+        if not acepta:
+            print(f"Last {len(traza)} of {traza.total} steps:")
+            traza.volcar()
+        return acepta
+
     def parse_cadena(cadena, parser_type, verbose=False):
-        if parser_type == 'll1':
-            return parse_ll1(cadena, tabla_ll1, 'S', verbose)
-        elif parser_type == 'slr1':
-            return parse_slr1(cadena, tabla_slr1_acciones, tabla_slr1_goto, 'S', verbose)
+        try:
+            if parser_type == 'earley':
+                tokens = list(lexer.tokens(cadena))
+                if estadisticas is not None:
+                    estadisticas.contar('parse.cadenas')
+                    estadisticas.contar('parse.tokens', len(tokens))
+                if opciones.errores:
+                    errores = errores_earley(tokens, tabla_earley)
+                    for error in errores:
+                        print(f"Error: {error}")
+                    return not errores
+                return parse_earley(tokens, tabla_earley)
+            if opciones.errores and not verbose:
+                if parser_type == 'll1':
+                    errores = errores_ll1(lexer.tokens(cadena), compilada_ll1, conjuntos_follow)
+                else:
+                    errores = errores_slr1(lexer.tokens(cadena), compilada_slr1, conjuntos_follow)
+                for error in errores:
+                    print(f"Error: {error}")
+                if errores or not opciones.arbol:
+                    return not errores
+            if opciones.arbol:
+                if verbose:
+                    arbol = ArbolSintactico(analisis.simbolos)
+                    if parser_type == 'll1':
+                        parse_ll1(lexer.nombres(cadena), *tablas_detalladas('ll1'), 'S', verbose, arbol)
+                    else:
+                        parse_slr1(lexer.nombres(cadena), *tablas_detalladas(parser_type), 'S', verbose, arbol)
+                elif parser_type == 'll1':
+                    arbol = construir_arbol_ll1(lexer.tokens(cadena), compilada_ll1)
+                else:
+                    arbol = construir_arbol_slr1(lexer.tokens(cadena), compilada_slr1)
+                if arbol is None or arbol.raiz < 0:
+                    return False
+                print(arbol.a_tuplas())
+                return True
+            if parser_type == 'll1':
+                if verbose:
+                    return parse_ll1(lexer.nombres(cadena), *tablas_detalladas('ll1'), 'S', verbose)
+                if estadisticas is not None:
+                    acepta = parse_contando(cadena, compilada_ll1, contar_pasos_ll1)
+                    if not acepta and opciones.traza > 0:
+                        parse_trazando(cadena, compilada_ll1, crear_traza_ll1, parse_ll1_trazado)
+                    return acepta
+                if opciones.traza > 0:
+                    return parse_trazando(cadena, compilada_ll1, crear_traza_ll1, parse_ll1_trazado)
+                return parse_ll1_compilado(lexer.tokens(cadena), compilada_ll1)
+            elif parser_type in ('slr1', 'lalr1'):
+                if verbose:
+                    return parse_slr1(lexer.nombres(cadena), *tablas_detalladas(parser_type), 'S', verbose)
+                if estadisticas is not None:
+                    acepta = parse_contando(cadena, compilada_slr1, contar_pasos_slr1)
+                    if not acepta and opciones.traza > 0:
+                        parse_trazando(cadena, compilada_slr1, crear_traza_slr1, parse_slr1_trazado)
+                    return acepta
+                if opciones.traza > 0:
+                    return parse_trazando(cadena, compilada_slr1, crear_traza_slr1, parse_slr1_trazado)
+                return parse_slr1_compilado(lexer.tokens(cadena), compilada_slr1)
+        except ErrorLexico as error:
+            if verbose:
+                print(f"Error: {error}")
+            return False
         return False
 
-    # Caso 1: La gramática es tanto LL(1) como SLR(1)
-    if es_ll1 and es_slr1:
-        print("Grammar is both LL(1) and SLR(1).")
+    # Caso 1: La gramática es tanto LL(1) como SLR(1) (o LALR(1))
+    if es_ll1 and es_lalr1:
+        print(f"Grammar is both LL(1) and {nombre_lr}.")
         verbose_mode = input("Enable step-by-step view? (y/n): ").lower() == 'y'
         while True:
-            seleccion = input("Select a parser (T: for LL(1), B: for SLR(1), Q: quit): ").upper()
+            seleccion = input(f"Select a parser (T: for LL(1), B: for {nombre_lr}, Q: quit): ").upper()
             if seleccion == 'Q':
                 break
             elif seleccion == 'T':
                 parser_seleccionado = 'll1'
             elif seleccion == 'B':
-                parser_seleccionado = 'slr1'
+                parser_seleccionado = parser_lr
             else:
                 print("Invalid selection.")
                 continue
@@ -147,22 +345,37 @@ def main():
             else:
                 print("no")
 
-    # Caso 3: La gramática es solo SLR(1)
-    elif es_slr1:
-        print("Grammar is SLR(1).")
+    # Caso 3: La gramática es solo SLR(1) (o solo LALR(1))
+    elif es_lalr1:
+        print(f"Grammar is {nombre_lr}.")
         verbose_mode = input("Enable step-by-step view? (y/n): ").lower() == 'y'
         while True:
             cadena = input("Input string to parse (or press Enter to quit): ")
             if not cadena:
                 break
-            if parse_cadena(cadena, 'slr1', verbose_mode):
+            if parse_cadena(cadena, parser_lr, verbose_mode):
                 print("yes")
             else:
                 print("no")
 
-    # Caso 4: La gramática no es ni LL(1) ni SLR(1)
+    # Caso 4: La gramática no es ni LL(1) ni SLR(1) ni LALR(1): se analiza con Earley
     else:
-        print("Grammar is neither LL(1) nor SLR(1).")
+        print("Grammar is neither LL(1), SLR(1) nor LALR(1); using the Earley parser.")
+        if opciones.arbol:
+            print("Syntax trees are not available with the Earley parser.")
+        while True:
+            cadena = input("Input string to parse (or press Enter to quit): ")
+            if not cadena:
+                break
+            if parse_cadena(cadena, 'earley'):
+                print("yes")
+            else:
+                print("no")
+
+    # Al salir se muestran de nuevo, ya con el tiempo y los pasos de todas las cadenas analizadas
+    if estadisticas is not None and estadisticas.contadores['parse.cadenas']:
+        print("\n--- Stats ---")
+        print(estadisticas.informe())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,253 @@
+from simbolos import TablaSimbolos, cuerpo, EPSILON, ID_FIN
+from first import calcular_anulables
+from tablas_compiladas import codificar
+from recuperacion import ErrorSintactico
+from estadisticas import activas, medido
+
+# Marca de los puntos que están al final de su producción (ítems completos)
+COMPLETO = -1
+
+
+class TablaEarley:
+    """
+    Gramática compilada para el parser de Earley, que acepta cualquier gramática libre de contexto.
+
+    Cada producción ocupa largo + 1 posiciones consecutivas ("puntos"), una por cada lugar donde
+    puede estar el punto de un ítem: antes de cada símbolo del lado derecho y al final. Asi un ítem
+    de Earley es solo la pareja (punto, origen), y avanzar el punto es sumarle 1.
+
+    Atributos:
+    - simbolos (TablaSimbolos): Ids de terminales y no terminales.
+    - ancho (int): Cantidad de ids de terminales más una columna para símbolos desconocidos. Los no
+      terminales se codifican con ancho + su id (como en TablaLL1Compilada) y el símbolo inicial
+      aumentado S' con ancho + la cantidad de no terminales.
+    - siguientes (list): Por punto, el código del símbolo que sigue al punto, o COMPLETO.
+    - cabezas (list): Por punto, el código del no terminal de la izquierda de su producción.
+    - inicios (list): Por no terminal (código - ancho), la tupla de los primeros puntos de sus producciones.
+    - anulables (frozenset): Los códigos de los no terminales que derivan 'e' (ver calcular_anulables).
+    - inicial (int): El punto de S' → • S.
+    - final (int): El punto de S' → S •.
+    """
+
+    def __init__(self, simbolos, ancho, siguientes, cabezas, inicios, anulables, inicial, final):
+        self.simbolos = simbolos
+        self.ancho = ancho
+        self.siguientes = siguientes
+        self.cabezas = cabezas
+        self.inicios = inicios
+        self.anulables = anulables
+        self.inicial = inicial
+        self.final = final
+
+    def codificar(self, cadena):
+        """Convierte una secuencia de terminales en sus ids (los desconocidos van a la última columna)."""
+        return codificar(cadena, self.simbolos, self.ancho - 1)
+
+
+@medido('tabla_earley')
+def construir_tabla_earley(gramatica, simbolo_inicial='S', simbolos=None):
+    """
+    Compila la gramática para parse_earley.
+
+    Parametros:
+    - gramatica (dict): El diccionario que representa la gramatica (el de analizar_gramatica_input).
+    - simbolo_inicial (str): El simbolo inicial de la gramatica.
+    - simbolos (TablaSimbolos, opcional): La tabla de símbolos a usar (por ejemplo la del Lexer); por defecto se crea una.
+
+    Retorna:
+    - TablaEarley: La gramática compilada.
+    """
+    if simbolos is None:
+        simbolos = TablaSimbolos(gramatica)
+    ancho = len(simbolos.terminales) + 1
+    id_no_terminal = simbolos.id_no_terminal
+    id_terminal = simbolos.id_terminal
+
+    def codigo(simbolo):
+        if simbolo in id_no_terminal:
+            return ancho + id_no_terminal[simbolo]
+        return id_terminal.get(simbolo, ancho - 1)
+
+    siguientes = []
+    cabezas = []
+    inicios = [[] for _ in range(len(simbolos.no_terminales) + 1)]
+
+    def agregar_produccion(cabeza, codigos):
+        inicios[cabeza - ancho].append(len(siguientes))
+        for simbolo in codigos:
+            siguientes.append(simbolo)
+            cabezas.append(cabeza)
+        siguientes.append(COMPLETO)
+        cabezas.append(cabeza)
+
+    inicial = len(siguientes)
+    agregar_produccion(ancho + len(simbolos.no_terminales), [codigo(simbolo_inicial)])
+    for no_terminal, producciones in gramatica.items():
+        for produccion in producciones:
+            agregar_produccion(codigo(no_terminal), [codigo(s) for s in cuerpo(produccion) if s != EPSILON])
+
+    anulables = frozenset(codigo(no_terminal) for no_terminal in calcular_anulables(gramatica))
+    return TablaEarley(simbolos, ancho, siguientes, cabezas, [tuple(puntos) for puntos in inicios], anulables,
+                       inicial, inicial + 1)
+
+
+def reconocer_earley(tokens, tabla):
+    """
+    Reconoce una secuencia de ids de terminales con el algoritmo de Earley.
+
+    El chart solo guarda, por conjunto, los ítems que esperan un no terminal, indexados por ese no
+    terminal: completar un ítem (A → γ •, j) es recorrer directamente los que esperan A en el conjunto j.
+    Los ítems que esperan un terminal se indexan igual pero solo hasta leer el siguiente token, y los
+    completos no se guardan. Además:
+    - Anulables (Aycock y Horspool): al predecir un no terminal anulable también se avanza el punto
+      sobre él, asi no hace falta completar ítems vacíos en el mismo conjunto donde empiezan.
+    - Recursión a derecha (Leo): cuando en el conjunto j hay un solo ítem que espera A y A es su último
+      símbolo, completar A lleva siempre al mismo ítem completo más alto de esa cadena, que se calcula
+      una vez y se agrega directamente. Con esto el costo es lineal en las gramáticas LR-regulares
+      (en particular LL(k) y LR(k)), y a lo sumo cúbico en cualquier gramática.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada (ver TablaEarley.codificar o Lexer.tokens), sin el '$' final.
+    - tabla (TablaEarley): La gramática compilada.
+
+    Retorna:
+    - (acepta, posicion, esperados): Si la cadena es aceptada; la posición del token donde se detectó
+      el error (la cantidad de tokens si fue al final, -1 si es aceptada); y los ids de los terminales
+      que se esperaban en esa posición (vacía si es aceptada).
+    """
+    siguientes = tabla.siguientes
+    cabezas = tabla.cabezas
+    inicios = tabla.inicios
+    anulables = tabla.anulables
+    ancho = tabla.ancho
+    final = tabla.final
+    num_puntos = len(siguientes)
+
+    esperan = [] # Por conjunto: código de no terminal → ítems (punto, origen) que lo esperan
+    leo = []     # Por conjunto: no terminal → ítem completo más alto de su cadena determinista, o None
+    total_items = 0
+
+    entrada = iter(tokens)
+    posicion = 0
+    nuevos = [(tabla.inicial, 0)]
+    while True:
+        terminales = {}
+        no_terminales = {}
+        esperan.append(no_terminales)
+        leo.append({})
+        aceptada = False
+        vistos = {origen * num_puntos + punto for punto, origen in nuevos}
+        agenda = nuevos
+        while agenda:
+            punto, origen = agenda.pop()
+            simbolo = siguientes[punto]
+            if simbolo == COMPLETO:
+                # Los ítems que empiezan en este conjunto se completan solos al predecir (anulables)
+                if punto == final:
+                    aceptada = True
+                    continue
+                if origen == posicion:
+                    continue
+                superior = _item_leo(esperan, leo, origen, cabezas[punto], siguientes, cabezas)
+                avanzados = [superior] if superior is not None else [(p + 1, o) for p, o in esperan[origen].get(cabezas[punto], ())]
+            elif simbolo < ancho:
+                lista = terminales.get(simbolo)
+                if lista is None:
+                    terminales[simbolo] = [(punto, origen)]
+                else:
+                    lista.append((punto, origen))
+                continue
+            else:
+                lista = no_terminales.get(simbolo)
+                if lista is None:
+                    no_terminales[simbolo] = [(punto, origen)]
+                    avanzados = [(inicio, posicion) for inicio in inicios[simbolo - ancho]]
+                else:
+                    lista.append((punto, origen))
+                    avanzados = []
+                if simbolo in anulables:
+                    avanzados.append((punto + 1, origen))
+            for item in avanzados:
+                clave = item[1] * num_puntos + item[0]
+                if clave not in vistos:
+                    vistos.add(clave)
+                    agenda.append(item)
+        total_items += len(vistos)
+
+        actual = next(entrada, ID_FIN)
+        nuevos = [(punto + 1, origen) for punto, origen in terminales.get(actual, ())] if actual != ID_FIN else []
+        if not nuevos:
+            break
+        posicion += 1
+
+    registro = activas()
+    if registro is not None:
+        registro.contar('earley.conjuntos', len(esperan))
+        registro.contar('earley.items', total_items)
+    if actual == ID_FIN and aceptada:
+        return True, -1, []
+    esperados = sorted(terminales) + ([ID_FIN] if aceptada else [])
+    return False, posicion, esperados
+
+def _item_leo(esperan, leo, origen, no_terminal, siguientes, cabezas):
+    """
+    Devuelve el ítem completo más alto al que lleva completar 'no_terminal' desde el conjunto 'origen'
+    (ver reconocer_earley), o None si el conjunto no tiene un único ítem que espera 'no_terminal' como último símbolo.
+    """
+    cadena = []
+    resultado = None
+    while True:
+        memo = leo[origen]
+        if no_terminal in memo:
+            resultado = memo[no_terminal]
+            break
+        # Marca provisoria, por si hay un ciclo de producciones unitarias
+        memo[no_terminal] = None
+        esperando = esperan[origen].get(no_terminal, ())
+        if len(esperando) != 1 or siguientes[esperando[0][0] + 1] != COMPLETO:
+            break
+        punto, origen_anterior = esperando[0]
+        cadena.append((memo, no_terminal, (punto + 1, origen_anterior)))
+        origen, no_terminal = origen_anterior, cabezas[punto]
+    for memo, no_terminal, item in reversed(cadena):
+        if resultado is None:
+            resultado = item
+        memo[no_terminal] = resultado
+    return resultado
+
+
+def parse_earley(tokens, tabla):
+    """
+    Analiza una secuencia de ids de terminales con el parser de Earley (ver reconocer_earley).
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaEarley): La gramática compilada.
+
+    Retorna:
+    - bool: True si la cadena es aceptada, False si no lo es.
+    """
+    return reconocer_earley(tokens, tabla)[0]
+
+def errores_earley(tokens, tabla):
+    """
+    Devuelve el error sintáctico de la cadena con el parser de Earley.
+
+    Earley detecta el error en el primer token que ninguna derivación admite, pero no se recupera:
+    la lista tiene a lo sumo un error, con todos los terminales que se esperaban en esa posición.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaEarley): La gramática compilada.
+
+    Retorna:
+    - list: El ErrorSintactico encontrado; vacía si la cadena es aceptada.
+    """
+    tokens = list(tokens)
+    acepta, posicion, esperados = reconocer_earley(tokens, tabla)
+    if acepta:
+        return []
+    terminales = tabla.simbolos.terminales
+    token = tokens[posicion] if posicion < len(tokens) else ID_FIN
+    return [ErrorSintactico(posicion, terminales[token] if token < len(terminales) else None,
+                            sorted(terminales[t] for t in esperados))]
@@ -1,72 +1,100 @@
-def parse_ll1(cadena, tabla_ll1, simbolo_inicial, verbose=False):
+import sys
+from simbolos import cuerpo, FIN
+from traza import Traza, COINCIDIR, EXPANDIR, ACEPTADA, ERROR
+
+def parse_ll1(cadena, tabla_ll1, simbolo_inicial, verbose=False, arbol=None, traza=None):
     """
     Analiza la cadena de entrada usando el parser LL(1) y la tabla de analisis predictivo.
     Determina qué producción aplicar en cada paso, intentando derivar la cadena de entrada desde el simbolo_inicial de la gramática
 
     Parametros:
-    - cadena (str): La cadena de entrada a analizar.
+    - cadena (iterable): La entrada a analizar: cualquier secuencia o iterador de terminales (los caracteres
+                         de un str, la lista de tokens que da el Lexer, un generador, ...). Se lee de a un
+                         token, asi que la memoria usada depende de la pila y no del tamaño de la entrada.
     - tabla_ll1 (dict): La tabla de analisis predictivo LL(1).
     - simbolo_inicial (str): El simbolo inicial de la gramatica.
-    - verbose (bool): Si es True, imprime el proceso paso a paso.
+    - verbose (bool): Si es True, imprime el proceso paso a paso (una línea por paso, ver traza.py).
+    - arbol (ArbolSintactico, opcional): Si se da (vacío), se llena con el árbol sintáctico de la cadena;
+      su raíz queda en -1 si la cadena no es aceptada.
+    - traza (Traza, opcional): Si se da, se reinicia y se registra en ella cada paso, sin formatearlo.
 
     Retorna:
     - bool: True si la cadena es aceptada, False si no lo es.
     """
     # La pila representa las "expectativas" del parser: lo que espera encontrar o expandir
     pila = ['$', simbolo_inicial] # Inicializamos la pila con el símbolo inicial y el marcador de fin de cadena '$'
-    cadena += '$' # Tambien se añade el marcador de fin de cadena '$' al final de la entrada
+    entrada = iter(cadena)
     posicion = 0 # índice del símbolo actual que estamos leyendo de la cadena
+    # Un solo token de anticipación; al agotarse la entrada se lee el marcador de fin de cadena '$'
+    simbolo_actual = next(entrada, FIN)
+    # En modo árbol, 'nodos' lleva el nodo de cada elemento de la pila ('$' no tiene nodo)
+    if arbol is not None:
+        raiz = arbol.agregar(arbol.codigo(simbolo_inicial), 0)
+        nodos = [-1, raiz]
 
-    # Impresión del encabezado del proceso (solo si verbose=True)
-    if verbose:
-        print("\n--- LL(1) Parsing Process ---")
-        print(f"{'STACK':<30} {'INPUT':<20} {'ACTION'}")
-        print("-" * 70)
+    # En modo verbose cada paso se muestra apenas se registra en una traza (solo si verbose=True).
+    # Cada paso es una línea de largo fijo: mostrar toda la pila y la entrada restante costaría O(n) por paso
+    if verbose and traza is None:
+        traza = Traza(1, eco=sys.stdout)
+    if traza is not None:
+        traza.reiniciar()
+        if verbose:
+            print("\n--- LL(1) Parsing Process ---")
+            print(traza.encabezado())
+            print("-" * 70)
 
     # El ciclo principal, se ejecuta hasta que la pila esté vacía
     while len(pila) > 0:
         tope = pila[-1] # Obtenemos el símbolo en la cima de la pila (tope)
-        simbolo_actual = cadena[posicion] # Obtenemos el símbolo actual de la cadena de entrada
-        
-        # Si verbose=True, mostramos el estado actual de la pila, la entrada y la acción
-        if verbose:
-            pila_str = " ".join(reversed(pila)) # Mostramos la pila de arriba hacia abajo (por eso se usa reversed)
-            input_str = cadena[posicion:] # Mostramos la parte de la cadena que falta por leer
-            print(f"{pila_str:<30} {input_str:<20}", end="")
 
         # --- Logica de analisis
         # Caso 1: el tope de la pila coincide con el símbolo actual de entrada
         if tope == simbolo_actual:
              # Si ambos son '$', significa que llegamos al final de la pila y la entrada → Aceptado
             if tope == '$':
-                if verbose:
-                    print("Accept")
+                if traza is not None:
+                    traza.registrar(ACEPTADA, posicion, traza.codigo(FIN), traza.codigo(tope), -1, len(pila))
+                if arbol is not None:
+                    arbol.raiz = raiz
+                    arbol.completar_intervalos()
                 return True # La cadena pertenece al lenguaje
             
             # Si no es '$', simplemente consumimos ese símbolo (lo sacamos de la pila y avanzamos en la cadena)
+            if traza is not None:
+                traza.registrar(COINCIDIR, posicion, traza.codigo(simbolo_actual), traza.codigo(tope), -1, len(pila))
             pila.pop()
+            if arbol is not None:
+                nodo = nodos.pop()
+                arbol.inicio[nodo] = posicion
+                arbol.fin[nodo] = posicion + 1
             posicion += 1
-            if verbose:
-                print(f"Match '{simbolo_actual}'") # Imprime la acción de coincidencia
+            simbolo_actual = next(entrada, FIN)
 
         # Caso 2: el tope de la pila es un no terminal y hay una producción en la tabla LL(1)
         elif tope in tabla_ll1 and simbolo_actual in tabla_ll1[tope]:
-            # Sacamos el no terminal de la pila
-            pila.pop()
             # Obtenemos la producción correspondiente de la tabla LL(1)
             produccion = tabla_ll1[tope][simbolo_actual]
+            if traza is not None:
+                traza.registrar(EXPANDIR, posicion, traza.codigo(simbolo_actual), traza.codigo(tope),
+                                traza.codigo_produccion(tope, produccion), len(pila))
+            # Sacamos el no terminal de la pila
+            pila.pop()
 
             # Si la producción no es 'e', añadimos sus símbolos a la pila en orden inverso
             # (porque el análisis LL(1) expande el no terminal reemplazándolo por su producción)
-            if produccion != 'e':
-                pila.extend(reversed(list(produccion))) # para que el primer símbolo de la producción quede en el tope de la pila
-            if verbose:
-                print(f"Produce with {tope} -> {produccion}")
+            pila.extend(reversed(cuerpo(produccion))) # para que el primer símbolo de la producción quede en el tope de la pila
+            if arbol is not None:
+                # Un nodo hijo por símbolo del cuerpo; su intervalo se completa al consumir los tokens
+                nodo = nodos.pop()
+                arbol.inicio[nodo] = posicion
+                hijos = [arbol.agregar(arbol.codigo(s), posicion) for s in cuerpo(produccion)]
+                arbol.enlazar(nodo, hijos)
+                nodos.extend(reversed(hijos))
         
         # Caso 3: no hay coincidencia ni regla en la tabla LL(1) → Error
         else:
-            if verbose:
-                print("Error")
+            if traza is not None:
+                traza.registrar(ERROR, posicion, traza.codigo(simbolo_actual), traza.codigo(tope), -1, len(pila))
             return False
     
     return False
\ No newline at end of file
@@ -0,0 +1,236 @@
+from tablas_compiladas import ERROR, ACEPTAR, parse_ll1_compilado, parse_slr1_compilado
+from simbolos import ID_FIN
+
+
+class ErrorSintactico:
+    """
+    Un error sintáctico encontrado por los parsers con recuperación.
+
+    Atributos:
+    - posicion (int): El índice del token donde se detectó el error (la cantidad de tokens de la entrada si es al final).
+    - token (str): El token encontrado ('$' al final de la entrada, None si no es un terminal de la gramática).
+    - esperados (list): Los terminales que se esperaban en ese punto, ordenados.
+    """
+
+    def __init__(self, posicion, token, esperados):
+        self.posicion = posicion
+        self.token = token
+        self.esperados = esperados
+
+    def a_dict(self):
+        return {"posicion": self.posicion, "token": self.token, "esperados": self.esperados}
+
+    def __repr__(self):
+        return f"ErrorSintactico({self.posicion}, {self.token!r}, {self.esperados!r})"
+
+    def __str__(self):
+        return f"Error sintactico en el token {self.posicion} ({self.token!r}): se esperaba uno de {', '.join(self.esperados)}"
+
+
+def _nombre_token(simbolos, id_token):
+    return simbolos.terminales[id_token] if id_token < len(simbolos.terminales) else None
+
+
+def recuperar_ll1(tokens, tabla, conjuntos_follow):
+    """
+    Analiza con una tabla LL(1) compilada sin detenerse en los errores, en modo pánico.
+
+    - Si el tope es un terminal que no coincide, se reporta y se saca de la pila (como si faltara).
+    - Si el tope es un no terminal A sin entrada para el token actual, se reporta y se descartan
+      tokens hasta uno con entrada en la fila de A (y se sigue expandiendo A) o que esté en
+      Follow(A) (y se saca A de la pila, como si ya se hubiera reconocido).
+    - Si sobra entrada cuando solo queda '$' en la pila, se descartan tokens hasta uno con el que pueda
+      empezar el símbolo inicial y se sigue analizando desde ahí.
+    Para no reportar errores en cascada, después de un error no se reporta otro hasta que se
+    consuma algún token.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaLL1Compilada): La tabla compilada.
+    - conjuntos_follow (VistaConjuntos): Los conjuntos Follow, con la misma tabla de símbolos que la tabla.
+
+    Retorna:
+    - list: Los ErrorSintactico encontrados, en orden; vacía si la cadena es aceptada.
+    """
+    ancho = tabla.ancho
+    celdas = tabla.celdas
+    cuerpos = tabla.cuerpos
+    follow = conjuntos_follow.bits
+    simbolos = tabla.simbolos
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    posicion = 0
+    pila = [ID_FIN, tabla.inicial]
+    errores = []
+    reportar = True
+    while True:
+        tope = pila[-1]
+        if tope < ancho:
+            if tope == actual:
+                if tope == ID_FIN:
+                    return errores
+                pila.pop()
+                posicion += 1
+                actual = next(entrada, ID_FIN)
+                reportar = True
+                continue
+            if reportar:
+                errores.append(ErrorSintactico(posicion, _nombre_token(simbolos, actual), [simbolos.terminales[tope]]))
+                reportar = False
+            if tope == ID_FIN:
+                # Sobra entrada: se descarta hasta un token que pueda empezar otra vez el símbolo inicial.
+                # Los que están en Follow del símbolo inicial no sirven: lo expandirían a 'e' sin consumirlos
+                fila = (tabla.inicial - ancho) * ancho
+                sincronizacion = follow[tabla.inicial - ancho]
+                while actual != ID_FIN and (celdas[fila + actual] < 0 or (sincronizacion >> actual) & 1):
+                    posicion += 1
+                    actual = next(entrada, ID_FIN)
+                if actual != ID_FIN:
+                    pila.append(tabla.inicial)
+                continue
+            pila.pop()
+            continue
+
+        fila = (tope - ancho) * ancho
+        p = celdas[fila + actual]
+        if p >= 0:
+            pila.pop()
+            pila.extend(cuerpos[p])
+            continue
+
+        if reportar:
+            esperados = sorted(simbolos.terminales[t] for t in range(ancho - 1) if celdas[fila + t] >= 0)
+            errores.append(ErrorSintactico(posicion, _nombre_token(simbolos, actual), esperados))
+            reportar = False
+        sincronizacion = follow[tope - ancho]
+        while actual != ID_FIN and celdas[fila + actual] < 0 and not (sincronizacion >> actual) & 1:
+            posicion += 1
+            actual = next(entrada, ID_FIN)
+        if celdas[fila + actual] < 0:
+            pila.pop()
+
+
+def recuperar_slr1(tokens, tabla, conjuntos_follow):
+    """
+    Analiza con tablas SLR(1) (o LALR(1)) compiladas sin detenerse en los errores, en modo pánico.
+
+    Ante un error se busca, desde el tope de la pila hacia abajo, un estado s con GOTO[s][A] definido
+    tal que el token actual esté en Follow(A) y tenga acción en GOTO[s][A]; se recorta la pila hasta s
+    y se apila GOTO[s][A], como si se hubiera reducido un A. Si ningún estado sirve, se descarta el
+    token y se vuelve a buscar. Después de un error no se reporta otro hasta el siguiente shift, y si
+    se vuelve a fallar sin haber hecho shift se descarta el token, asi el análisis siempre avanza.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+    - conjuntos_follow (VistaConjuntos): Los conjuntos Follow, con la misma tabla de símbolos que la tabla.
+
+    Retorna:
+    - list: Los ErrorSintactico encontrados, en orden; vacía si la cadena es aceptada.
+    """
+    ancho = tabla.ancho
+    acciones = tabla.acciones
+    ancho_goto = tabla.ancho_goto
+    goto = tabla.goto
+    cabezas = tabla.cabezas
+    longitudes = tabla.longitudes
+    follow = conjuntos_follow.bits
+    simbolos = tabla.simbolos
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    posicion = 0
+    pila = [0]
+    errores = []
+    reportar = True
+    while True:
+        accion = acciones[pila[-1] * ancho + actual]
+        if accion > 0:
+            pila.append(accion - 1)
+            posicion += 1
+            actual = next(entrada, ID_FIN)
+            reportar = True
+            continue
+        if accion < ACEPTAR:
+            p = -accion - 1
+            n = longitudes[p]
+            if n:
+                del pila[-n:]
+            pila.append(goto[pila[-1] * ancho_goto + cabezas[p]])
+            continue
+        if accion == ACEPTAR:
+            return errores
+
+        if reportar:
+            base = pila[-1] * ancho
+            esperados = sorted(simbolos.terminales[t] for t in range(ancho - 1) if acciones[base + t] != ERROR)
+            errores.append(ErrorSintactico(posicion, _nombre_token(simbolos, actual), esperados))
+            reportar = False
+        elif actual == ID_FIN:
+            return errores
+        else:
+            posicion += 1
+            actual = next(entrada, ID_FIN)
+
+        # Modo pánico: sincronizar con un no terminal de la pila cuyo Follow contenga el token actual
+        while True:
+            destino = -1
+            for k in range(len(pila) - 1, -1, -1):
+                base_goto = pila[k] * ancho_goto
+                for no_terminal in range(ancho_goto):
+                    destino = goto[base_goto + no_terminal]
+                    if destino >= 0 and (follow[no_terminal] >> actual) & 1 and acciones[destino * ancho + actual] != ERROR:
+                        break
+                    destino = -1
+                if destino >= 0:
+                    del pila[k + 1:]
+                    pila.append(destino)
+                    break
+            if destino >= 0:
+                break
+            if actual == ID_FIN:
+                return errores
+            posicion += 1
+            actual = next(entrada, ID_FIN)
+
+
+def errores_ll1(tokens, tabla, conjuntos_follow):
+    """
+    Devuelve todos los errores sintácticos de la cadena con la tabla LL(1).
+
+    Primero se analiza con parse_ll1_compilado, asi una cadena correcta cuesta lo mismo que sin
+    recuperación; solo si es rechazada se vuelve a analizar con recuperar_ll1.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaLL1Compilada): La tabla compilada.
+    - conjuntos_follow (VistaConjuntos): Los conjuntos Follow.
+
+    Retorna:
+    - list: Los ErrorSintactico encontrados; vacía si la cadena es aceptada.
+    """
+    tokens = list(tokens)
+    if parse_ll1_compilado(tokens, tabla):
+        return []
+    return recuperar_ll1(tokens, tabla, conjuntos_follow)
+
+
+def errores_slr1(tokens, tabla, conjuntos_follow):
+    """
+    Devuelve todos los errores sintácticos de la cadena con las tablas SLR(1) (o LALR(1)).
+
+    Igual que errores_ll1: primero parse_slr1_compilado y, solo si la cadena es rechazada, recuperar_slr1.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+    - conjuntos_follow (VistaConjuntos): Los conjuntos Follow.
+
+    Retorna:
+    - list: Los ErrorSintactico encontrados; vacía si la cadena es aceptada.
+    """
+    tokens = list(tokens)
+    if parse_slr1_compilado(tokens, tabla):
+        return []
+    return recuperar_slr1(tokens, tabla, conjuntos_follow)
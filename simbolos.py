@@ -0,0 +1,143 @@
+from collections.abc import Mapping
+
+EPSILON = 'e' # Cadena vacía
+FIN = '$' # Marcador de fin de cadena
+ID_FIN = 1 # Id de '$' en toda tabla de símbolos
+BIT_EPSILON = 1 # El terminal con id 0 es siempre 'e'
+
+class TablaSimbolos:
+    """
+    Tabla de símbolos de una gramática: asigna ids enteros densos a los terminales y no terminales.
+
+    Los terminales se numeran desde 0, reservando el 0 para 'e' y el 1 para '$'. Un conjunto de
+    terminales se representa como un entero (bitmask) donde el bit i indica si está el terminal i;
+    asi la unión, la diferencia y la intersección de conjuntos son una sola operación entera.
+
+    Atributos:
+    - no_terminales (list): id → nombre de cada no terminal, en el orden de la gramática.
+    - id_no_terminal (dict): nombre → id de cada no terminal.
+    - terminales (list): id → nombre de cada terminal.
+    - id_terminal (dict): nombre → id de cada terminal.
+    """
+
+    def __init__(self, gramatica):
+        self.no_terminales = list(gramatica)
+        self.id_no_terminal = {nt: i for i, nt in enumerate(self.no_terminales)}
+        self.terminales = []
+        self.id_terminal = {}
+        self.agregar_terminal(EPSILON)
+        self.agregar_terminal(FIN)
+        for producciones in gramatica.values():
+            for produccion in producciones:
+                for simbolo in produccion:
+                    if simbolo not in self.id_no_terminal:
+                        self.agregar_terminal(simbolo)
+
+    def agregar_terminal(self, terminal):
+        """Registra un terminal (si no existía) y devuelve su id."""
+        id_terminal = self.id_terminal.get(terminal)
+        if id_terminal is None:
+            id_terminal = len(self.terminales)
+            self.id_terminal[terminal] = id_terminal
+            self.terminales.append(terminal)
+        return id_terminal
+
+    def bit(self, terminal):
+        """Devuelve el bitmask del conjunto {terminal}."""
+        id_terminal = self.id_terminal.get(terminal)
+        if id_terminal is None:
+            id_terminal = self.agregar_terminal(terminal)
+        return 1 << id_terminal
+
+    def a_bits(self, conjunto):
+        """Convierte un conjunto de nombres de terminales en bitmask."""
+        bits = 0
+        for terminal in conjunto:
+            bits |= self.bit(terminal)
+        return bits
+
+    def ids(self, bits):
+        """Itera los ids de los terminales presentes en un bitmask, de menor a mayor."""
+        while bits:
+            menor = bits & -bits
+            yield menor.bit_length() - 1
+            bits ^= menor
+
+    def a_conjunto(self, bits):
+        """Convierte un bitmask en el conjunto de nombres de terminales."""
+        terminales = self.terminales
+        return {terminales[i] for i in self.ids(bits)}
+
+    def vista(self, bits_por_no_terminal):
+        """Devuelve una vista dict-de-conjuntos (no terminal → set) sobre una lista de bitmasks."""
+        return VistaConjuntos(self, bits_por_no_terminal)
+
+    def es_compatible(self, gramatica):
+        """Indica si la tabla numera los no terminales de 'gramatica' (mismos nombres y orden)."""
+        return self.no_terminales == list(gramatica)
+
+
+class VistaConjuntos(Mapping):
+    """
+    Vista de solo lectura no terminal → conjunto de terminales sobre conjuntos guardados como bitmask.
+
+    Se comporta como el diccionario de conjuntos de siempre (para imprimir, comparar o consultar),
+    pero conserva los bitmasks en 'bits' (indexados por id de no terminal) para que el resto del
+    análisis trabaje sobre ellos sin conversiones. Cada conjunto se decodifica la primera vez que se pide.
+    """
+
+    def __init__(self, simbolos, bits):
+        self.simbolos = simbolos
+        self.bits = bits
+        self._decodificados = {}
+
+    def __getitem__(self, no_terminal):
+        conjunto = self._decodificados.get(no_terminal)
+        if conjunto is None:
+            conjunto = self.simbolos.a_conjunto(self.bits[self.simbolos.id_no_terminal[no_terminal]])
+            self._decodificados[no_terminal] = conjunto
+        return conjunto
+
+    def __iter__(self):
+        return iter(self.simbolos.no_terminales)
+
+    def __len__(self):
+        return len(self.simbolos.no_terminales)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+def como_bits(conjuntos, gramatica, simbolos=None):
+    """
+    Obtiene los bitmasks de un diccionario de conjuntos First o Follow.
+
+    Si 'conjuntos' ya es una VistaConjuntos de la misma tabla de símbolos (o de una compatible,
+    cuando no se indica tabla), se reutilizan sus bitmasks sin copiar nada; si es un diccionario
+    común, se convierte.
+
+    Parametros:
+    - conjuntos (dict o VistaConjuntos): no terminal → conjunto de terminales.
+    - gramatica (dict): La gramática a la que pertenecen los conjuntos.
+    - simbolos (TablaSimbolos, opcional): Tabla a usar. Si no se da, se reutiliza la de la vista o se crea una.
+
+    Retorna:
+    - (simbolos, bits): La tabla de símbolos y la lista de bitmasks indexada por id de no terminal.
+    """
+    if isinstance(conjuntos, VistaConjuntos):
+        if conjuntos.simbolos is simbolos or (simbolos is None and conjuntos.simbolos.es_compatible(gramatica)):
+            return conjuntos.simbolos, conjuntos.bits
+    if simbolos is None:
+        simbolos = TablaSimbolos(gramatica)
+    return simbolos, [simbolos.a_bits(conjuntos.get(nt, ())) for nt in simbolos.no_terminales]
+
+
+def cuerpo(produccion):
+    """Símbolos del lado derecho de una producción: la producción 'e' (o vacía) no tiene ninguno."""
+    return () if produccion == EPSILON else produccion
+
+
+def formatear_produccion(produccion):
+    """Texto de una producción para mostrar: sus símbolos separados por espacios, o 'e' si es vacía."""
+    simbolos = cuerpo(produccion)
+    return ' '.join(simbolos) if simbolos else EPSILON
@@ -1,5 +1,8 @@
-from verificador_ll1 import calcular_first_de_produccion
+from verificador_ll1 import calcular_first_de_produccion, first_de_produccion_bits
+from simbolos import BIT_EPSILON
+from estadisticas import activas, medido
 
+@medido('tabla_ll1')
 def construir_tabla_ll1(gramatica, conjuntos_first, conjuntos_follow):
     """
     Construye la tabla de análisis predictivo LL(1) para la gramática dada.
@@ -37,4 +40,35 @@ def construir_tabla_ll1(gramatica, conjuntos_first, conjuntos_follow):
                 for simbolo in conjuntos_follow[no_terminal]:
                     tabla[no_terminal][simbolo] = produccion # debe aplicar esta 'produccion' (que es la producción a épsilon)
 
-    return tabla
\ No newline at end of file
+    registro = activas()
+    if registro is not None:
+        registro.contar('tabla_ll1.entradas', sum(len(fila) for fila in tabla.values()))
+    return tabla
+
+def construir_fila_ll1(producciones, simbolos, first_bits, follow):
+    """
+    Construye la fila de la tabla LL(1) de un solo no terminal, con los conjuntos en forma de bitmask.
+
+    Da la misma fila que construir_tabla_ll1 (con las mismas reglas y en el mismo orden), pero sin
+    recorrer el resto de la gramática.
+
+    Parametros:
+    - producciones (list): Las producciones del no terminal.
+    - simbolos (TablaSimbolos): La tabla de símbolos de la gramática.
+    - first_bits (list): El bitmask First de cada no terminal, indexado por id.
+    - follow (int): El bitmask Follow del no terminal.
+
+    Retorna:
+    - dict: terminal → producción a aplicar.
+    """
+    terminales = simbolos.terminales
+    fila = {}
+    for produccion in producciones:
+        first_de_produccion = first_de_produccion_bits(produccion, simbolos, first_bits)
+        # Regla 1: los terminales de First(producción); Regla 2: si deriva 'e', también los de Follow
+        bits = first_de_produccion & ~BIT_EPSILON
+        if first_de_produccion & BIT_EPSILON:
+            bits |= follow
+        for t in simbolos.ids(bits):
+            fila[terminales[t]] = produccion
+    return fila
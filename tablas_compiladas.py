@@ -0,0 +1,578 @@
+from array import array
+from simbolos import TablaSimbolos, cuerpo, ID_FIN
+from estadisticas import medido
+
+# Codificación de las acciones de la tabla SLR(1) compilada (un entero con signo por celda):
+#   0        → error
+#   j + 1    → shift al estado j            (positivo)
+#   -(p + 1) → reduce por la producción p   (negativo; la producción 0 es S' → S, asi que -1 es accept)
+ERROR = 0
+ACEPTAR = -1
+
+# Capacidad inicial de la pila de estados de parse_slr1_compilado (se duplica cuando se llena)
+CAPACIDAD_PILA = 64
+
+
+class TablaLL1Compilada:
+    """
+    Tabla LL(1) compilada a arreglos planos.
+
+    Atributos:
+    - simbolos (TablaSimbolos): Ids de terminales y no terminales.
+    - ancho (int): Columnas por fila: un terminal por id más una columna final para símbolos desconocidos.
+    - celdas (array): Fila por no terminal, columna por terminal; guarda el número de producción o -1.
+    - cuerpos (list): Por producción, la tupla de códigos a apilar, ya invertida. Los terminales se
+      codifican con su id y los no terminales con ancho + su id.
+    - producciones (list): Por producción, la pareja (no_terminal, produccion) original.
+    - inicial (int): Código del símbolo inicial en la pila.
+    - predicciones (array): Igual que celdas, pero guarda el número de la cadena de expansiones
+      que corresponde a la celda, o -1 (ver encadenar_predicciones).
+    - cadenas (list): Por cadena, la tupla de códigos a apilar (ya invertida) que deja en la pila todas
+      las expansiones que se hacen con el mismo símbolo de anticipación.
+    """
+
+    def __init__(self, simbolos, ancho, celdas, cuerpos, producciones, inicial, predicciones=None, cadenas=None):
+        self.simbolos = simbolos
+        self.ancho = ancho
+        self.celdas = celdas
+        self.cuerpos = cuerpos
+        self.producciones = producciones
+        self.inicial = inicial
+        if predicciones is None:
+            predicciones, cadenas = encadenar_predicciones(ancho, celdas, cuerpos)
+        self.predicciones = predicciones
+        self.cadenas = cadenas
+
+    def codificar(self, cadena):
+        """Convierte una secuencia de terminales en sus ids (los desconocidos van a la última columna)."""
+        return codificar(cadena, self.simbolos, self.ancho - 1)
+
+
+class TablaSLR1Compilada:
+    """
+    Tablas ACTION y GOTO de un SLR(1) compiladas a arreglos planos.
+
+    Atributos:
+    - simbolos (TablaSimbolos): Ids de terminales y no terminales.
+    - ancho (int): Columnas por fila de ACTION: un terminal por id más una columna final para símbolos desconocidos.
+    - acciones (array): Fila por estado, columna por terminal; acciones codificadas como enteros (ver ERROR/ACEPTAR).
+    - ancho_goto (int): Columnas por fila de GOTO (cantidad de no terminales).
+    - goto (array): Fila por estado, columna por no terminal; estado destino o -1.
+    - cabezas (array): Por producción, el id del no terminal de la izquierda (-1 para S' → S).
+    - longitudes (array): Por producción, la cantidad de símbolos del lado derecho.
+    - producciones (list): Por producción, la pareja (no_terminal, produccion) original.
+    """
+
+    def __init__(self, simbolos, ancho, acciones, ancho_goto, goto, cabezas, longitudes, producciones):
+        self.simbolos = simbolos
+        self.ancho = ancho
+        self.acciones = acciones
+        self.ancho_goto = ancho_goto
+        self.goto = goto
+        self.cabezas = cabezas
+        self.longitudes = longitudes
+        self.producciones = producciones
+
+    @property
+    def num_estados(self):
+        return len(self.acciones) // self.ancho
+
+    def codificar(self, cadena):
+        """Convierte una secuencia de terminales en sus ids (los desconocidos van a la última columna)."""
+        return codificar(cadena, self.simbolos, self.ancho - 1)
+
+
+def codificar(cadena, simbolos, desconocido):
+    """
+    Convierte una secuencia de terminales (por ejemplo una cadena de caracteres) en sus ids.
+
+    Parametros:
+    - cadena (iterable): Los terminales de entrada.
+    - simbolos (TablaSimbolos): La tabla de símbolos de la gramática.
+    - desconocido (int): Id que se usa para los símbolos que no son terminales de la gramática.
+
+    Retorna:
+    - list: Los ids de los terminales.
+    """
+    ids = simbolos.id_terminal
+    return [ids.get(simbolo, desconocido) for simbolo in cadena]
+
+
+@medido('compilar_ll1')
+def compilar_tabla_ll1(tabla_ll1, simbolo_inicial='S', simbolos=None):
+    """
+    Compila la tabla de construir_tabla_ll1 a una TablaLL1Compilada.
+
+    Parametros:
+    - tabla_ll1 (dict): La tabla LL(1) (no_terminal → {terminal: produccion}).
+    - simbolo_inicial (str): El simbolo inicial de la gramatica.
+    - simbolos (TablaSimbolos, opcional): Tabla de símbolos a usar (por ejemplo la de los conjuntos First),
+      para compartir los ids con el resto del análisis. Si no se da, se arma a partir de la tabla.
+
+    Retorna:
+    - TablaLL1Compilada: La tabla compilada.
+    """
+    if simbolos is None:
+        simbolos = TablaSimbolos({nt: list(dict.fromkeys(fila.values())) for nt, fila in tabla_ll1.items()})
+    for fila in tabla_ll1.values():
+        for terminal in fila:
+            simbolos.agregar_terminal(terminal)
+
+    ancho = len(simbolos.terminales) + 1
+    id_no_terminal = simbolos.id_no_terminal
+    celdas = array('i', [-1]) * (len(simbolos.no_terminales) * ancho)
+
+    def codigo(simbolo):
+        if simbolo in id_no_terminal:
+            return ancho + id_no_terminal[simbolo]
+        return simbolos.id_terminal[simbolo]
+
+    numeros = {} # (no_terminal, produccion) → número de producción
+    cuerpos = []
+    producciones = []
+    for no_terminal, fila in tabla_ll1.items():
+        base = id_no_terminal[no_terminal] * ancho
+        for terminal, produccion in fila.items():
+            p = numeros.get((no_terminal, produccion))
+            if p is None:
+                p = numeros[(no_terminal, produccion)] = len(producciones)
+                producciones.append((no_terminal, produccion))
+                cuerpos.append(tuple(codigo(s) for s in reversed(cuerpo(produccion))))
+            celdas[base + simbolos.id_terminal[terminal]] = p
+
+    return TablaLL1Compilada(simbolos, ancho, celdas, cuerpos, producciones, codigo(simbolo_inicial))
+
+
+def encadenar_predicciones(ancho, celdas, cuerpos):
+    """
+    Precalcula, para cada celda (no terminal, anticipación), todas las expansiones seguidas que hace
+    el parser antes de que quede un terminal en el tope de la pila.
+
+    Al expandir A con la anticipación 'a', si el cuerpo empieza con un no terminal B, el paso siguiente
+    es expandir B con la misma 'a' (no se consumió nada), y asi hasta llegar a un terminal. Por ejemplo
+    con S → A B y A → a A, la celda (S, a) apila de una vez 'B A a'. La cadena se corta si el cuerpo
+    apilado se vacía (producciones 'e': lo que sigue depende de lo que ya estaba en la pila), si la celda
+    del no terminal está vacía (el error se detecta en el paso siguiente, como antes) o si un no terminal
+    se repite (solo en tablas de gramáticas que no son LL(1), para no expandir sin fin).
+
+    Parametros:
+    - ancho (int): Columnas por fila de la tabla.
+    - celdas (array): La tabla: número de producción por celda, o -1.
+    - cuerpos (list): Por producción, la tupla de códigos a apilar, ya invertida.
+
+    Retorna:
+    - (predicciones, cadenas): El número de cadena de cada celda (o -1) y la tupla de códigos de cada cadena.
+    """
+    predicciones = array('i', [-1]) * len(celdas)
+    cadenas = []
+    numeros = {} # tupla de códigos → número de cadena
+
+    for celda, p in enumerate(celdas):
+        if p < 0:
+            continue
+        anticipacion = celda % ancho
+        pila = list(cuerpos[p])
+        expandidos = {celda // ancho}
+        while pila and pila[-1] >= ancho:
+            id_nt = pila[-1] - ancho
+            q = celdas[id_nt * ancho + anticipacion]
+            if q < 0 or id_nt in expandidos:
+                break
+            expandidos.add(id_nt)
+            pila.pop()
+            pila.extend(cuerpos[q])
+
+        cadena = tuple(pila)
+        numero = numeros.get(cadena)
+        if numero is None:
+            numero = numeros[cadena] = len(cadenas)
+            cadenas.append(cadena)
+        predicciones[celda] = numero
+
+    return predicciones, cadenas
+
+
+@medido('compilar_lr')
+def compilar_tabla_slr1(tabla_acciones, tabla_goto, simbolos=None):
+    """
+    Compila las tablas de construir_tabla_slr1 (o analizar_slr1) a una TablaSLR1Compilada.
+
+    Parametros:
+    - tabla_acciones (dict): Tabla ACTION (estado → {terminal: acción}).
+    - tabla_goto (dict): Tabla GOTO (estado → {no_terminal: estado}).
+    - simbolos (TablaSimbolos, opcional): Tabla de símbolos a usar (por ejemplo la de los conjuntos Follow),
+      para compartir los ids con el resto del análisis. Si no se da, se arma a partir de las tablas.
+
+    Retorna:
+    - TablaSLR1Compilada: Las tablas compiladas.
+    """
+    if simbolos is None:
+        pseudo_gramatica = {}
+        for fila in tabla_goto.values():
+            for no_terminal in fila:
+                pseudo_gramatica.setdefault(no_terminal, [])
+        for fila in tabla_acciones.values():
+            for accion, valor in fila.values():
+                if accion == 'reduce':
+                    pseudo_gramatica.setdefault(valor[0], []).append(valor[1])
+        simbolos = TablaSimbolos(pseudo_gramatica)
+    for fila in tabla_acciones.values():
+        for terminal in fila:
+            simbolos.agregar_terminal(terminal)
+
+    num_estados = len(tabla_acciones)
+    ancho = len(simbolos.terminales) + 1
+    ancho_goto = len(simbolos.no_terminales)
+    acciones = array('i', [ERROR]) * (num_estados * ancho)
+    goto = array('i', [-1]) * (num_estados * ancho_goto)
+
+    # La producción 0 es la aumentada S' → S; el resto se numera a medida que aparece
+    numeros = {}
+    producciones = [(None, ('S',))]
+    cabezas = array('i', [-1])
+    longitudes = array('i', [1])
+
+    for estado, fila in tabla_acciones.items():
+        base = estado * ancho
+        for terminal, (accion, valor) in fila.items():
+            if accion == 'shift':
+                codigo = valor + 1
+            elif accion == 'accept':
+                codigo = ACEPTAR
+            else:
+                p = numeros.get(valor)
+                if p is None:
+                    p = numeros[valor] = len(producciones)
+                    producciones.append(valor)
+                    cabezas.append(simbolos.id_no_terminal[valor[0]])
+                    longitudes.append(len(cuerpo(valor[1])))
+                codigo = -(p + 1)
+            acciones[base + simbolos.id_terminal[terminal]] = codigo
+
+    for estado, fila in tabla_goto.items():
+        base = estado * ancho_goto
+        for no_terminal, destino in fila.items():
+            goto[base + simbolos.id_no_terminal[no_terminal]] = destino
+
+    return TablaSLR1Compilada(simbolos, ancho, acciones, ancho_goto, goto, cabezas, longitudes, producciones)
+
+
+def descompilar_tabla_ll1(tabla):
+    """
+    Reconstruye la tabla LL(1) en forma de diccionario a partir de una TablaLL1Compilada
+    (por ejemplo una cargada del cache), para los parsers del modo detallado.
+
+    Parametros:
+    - tabla (TablaLL1Compilada): La tabla compilada.
+
+    Retorna:
+    - dict: no_terminal → {terminal: produccion}, como la de construir_tabla_ll1.
+    """
+    ancho = tabla.ancho
+    terminales = tabla.simbolos.terminales
+    tabla_ll1 = {}
+    for id_nt, no_terminal in enumerate(tabla.simbolos.no_terminales):
+        fila = {}
+        base = id_nt * ancho
+        for t in range(ancho - 1):
+            p = tabla.celdas[base + t]
+            if p >= 0:
+                fila[terminales[t]] = tabla.producciones[p][1]
+        tabla_ll1[no_terminal] = fila
+    return tabla_ll1
+
+
+def descompilar_tabla_slr1(tabla):
+    """
+    Reconstruye las tablas ACTION y GOTO en forma de diccionario a partir de una TablaSLR1Compilada
+    (por ejemplo una cargada del cache), para los parsers del modo detallado.
+
+    Parametros:
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+
+    Retorna:
+    - (tabla_acciones, tabla_goto): Los diccionarios, como los de construir_tabla_slr1.
+    """
+    ancho = tabla.ancho
+    ancho_goto = tabla.ancho_goto
+    terminales = tabla.simbolos.terminales
+    no_terminales = tabla.simbolos.no_terminales
+    tabla_acciones = {}
+    tabla_goto = {}
+    for estado in range(tabla.num_estados):
+        fila = {}
+        base = estado * ancho
+        for t in range(ancho - 1):
+            codigo = tabla.acciones[base + t]
+            if codigo > 0:
+                fila[terminales[t]] = ('shift', codigo - 1)
+            elif codigo == ACEPTAR:
+                fila[terminales[t]] = ('accept', None)
+            elif codigo < ACEPTAR:
+                fila[terminales[t]] = ('reduce', tabla.producciones[-codigo - 1])
+        tabla_acciones[estado] = fila
+
+        base = estado * ancho_goto
+        tabla_goto[estado] = {no_terminales[n]: tabla.goto[base + n] for n in range(ancho_goto) if tabla.goto[base + n] >= 0}
+    return tabla_acciones, tabla_goto
+
+
+def parse_ll1_compilado(tokens, tabla):
+    """
+    Analiza una secuencia de ids de terminales con una tabla LL(1) compilada.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada (ver TablaLL1Compilada.codificar o Lexer.tokens),
+      sin el '$' final. Puede ser cualquier iterador: se consume de a un token, sin copiar la entrada.
+    - tabla (TablaLL1Compilada): La tabla compilada.
+
+    Retorna:
+    - bool: True si la cadena es aceptada, False si no lo es.
+    """
+    ancho = tabla.ancho
+    predicciones = tabla.predicciones
+    cadenas = tabla.cadenas
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    pila = [ID_FIN, tabla.inicial]
+    while True:
+        tope = pila.pop()
+        if tope < ancho:
+            # Terminal en el tope: debe coincidir con la entrada
+            if tope != actual:
+                return False
+            if tope == ID_FIN:
+                return True
+            actual = next(entrada, ID_FIN)
+        else:
+            # No terminal: una consulta a la tabla y se apila, ya invertida, toda la cadena de
+            # expansiones hasta el próximo terminal
+            c = predicciones[(tope - ancho) * ancho + actual]
+            if c < 0:
+                return False
+            pila.extend(cadenas[c])
+
+
+def parse_slr1_compilado(tokens, tabla):
+    """
+    Analiza una secuencia de ids de terminales con tablas SLR(1) compiladas.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada (ver TablaSLR1Compilada.codificar o Lexer.tokens),
+      sin el '$' final. Puede ser cualquier iterador: se consume de a un token, sin copiar la entrada.
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+
+    Retorna:
+    - bool: True si la cadena es aceptada, False si hay error sintáctico.
+    """
+    return parse_slr1_posicion(tokens, tabla)[0]
+
+def parse_slr1_posicion(tokens, tabla):
+    """
+    Analiza como parse_slr1_compilado, pero además devuelve dónde se detectó el error.
+
+    Es el driver de parse_slr1_compilado y el de referencia de analizar_lote_slr1 (lote_vectorizado.py).
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+
+    Retorna:
+    - (bool, int): Si la cadena es aceptada, y la posición del token donde se detectó el error
+      (la cantidad de tokens si fue al llegar a '$'), o -1 si es aceptada.
+    """
+    ancho = tabla.ancho
+    acciones = tabla.acciones
+    ancho_goto = tabla.ancho_goto
+    goto = tabla.goto
+    cabezas = tabla.cabezas
+    longitudes = tabla.longitudes
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    posicion = 0
+    # Solo estados (los símbolos no hacen falta para decidir), en una lista reservada de antemano:
+    # 'tope' es la posición del estado actual, un reduce solo retrocede 'tope' la longitud del lado
+    # derecho y la lista se duplica cuando se llena, asi nunca se copia ni se recorta la pila
+    pila = [0] * CAPACIDAD_PILA
+    capacidad = CAPACIDAD_PILA
+    tope = 0
+    estado = 0
+    while True:
+        accion = acciones[estado * ancho + actual]
+        if accion > 0:
+            # Shift
+            estado = accion - 1
+            actual = next(entrada, ID_FIN)
+            posicion += 1
+        elif accion < ACEPTAR:
+            # Reduce por la producción p
+            p = -accion - 1
+            tope -= longitudes[p]
+            estado = goto[pila[tope] * ancho_goto + cabezas[p]]
+        elif accion == ACEPTAR:
+            return True, -1
+        else:
+            return False, posicion
+        tope += 1
+        if tope == capacidad:
+            pila.extend(pila)
+            capacidad += capacidad
+        pila[tope] = estado
+
+
+async def parse_ll1_compilado_async(tokens, tabla):
+    """
+    Igual que parse_ll1_compilado, pero consume un iterable asíncrono de ids de terminales
+    (por ejemplo Lexer.tokens_de_bloques_async sobre un archivo que todavía se está recibiendo).
+
+    Parametros:
+    - tokens (async iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaLL1Compilada): La tabla compilada.
+
+    Retorna:
+    - bool: True si la cadena es aceptada, False si no lo es.
+    """
+    ancho = tabla.ancho
+    predicciones = tabla.predicciones
+    cadenas = tabla.cadenas
+
+    entrada = aiter(tokens)
+    actual = await anext(entrada, ID_FIN)
+    pila = [ID_FIN, tabla.inicial]
+    while True:
+        tope = pila.pop()
+        if tope < ancho:
+            if tope != actual:
+                return False
+            if tope == ID_FIN:
+                return True
+            actual = await anext(entrada, ID_FIN)
+        else:
+            c = predicciones[(tope - ancho) * ancho + actual]
+            if c < 0:
+                return False
+            pila.extend(cadenas[c])
+
+
+async def parse_slr1_compilado_async(tokens, tabla):
+    """
+    Igual que parse_slr1_compilado, pero consume un iterable asíncrono de ids de terminales
+    (por ejemplo Lexer.tokens_de_bloques_async sobre un archivo que todavía se está recibiendo).
+
+    Parametros:
+    - tokens (async iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+
+    Retorna:
+    - bool: True si la cadena es aceptada, False si hay error sintáctico.
+    """
+    ancho = tabla.ancho
+    acciones = tabla.acciones
+    ancho_goto = tabla.ancho_goto
+    goto = tabla.goto
+    cabezas = tabla.cabezas
+    longitudes = tabla.longitudes
+
+    entrada = aiter(tokens)
+    actual = await anext(entrada, ID_FIN)
+    pila = [0] * CAPACIDAD_PILA
+    capacidad = CAPACIDAD_PILA
+    tope = 0
+    estado = 0
+    while True:
+        accion = acciones[estado * ancho + actual]
+        if accion > 0:
+            estado = accion - 1
+            actual = await anext(entrada, ID_FIN)
+        elif accion < ACEPTAR:
+            p = -accion - 1
+            tope -= longitudes[p]
+            estado = goto[pila[tope] * ancho_goto + cabezas[p]]
+        else:
+            return accion == ACEPTAR
+        tope += 1
+        if tope == capacidad:
+            pila.extend(pila)
+            capacidad += capacidad
+        pila[tope] = estado
+
+
+def contar_pasos_ll1(tokens, tabla):
+    """
+    Analiza como parse_ll1_compilado, pero contando los pasos (para las estadísticas, ver estadisticas.py).
+
+    Usa la tabla sin encadenar (celdas y cuerpos), asi cada expansión es un paso. Es aparte del
+    driver normal para que este no pague el conteo.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaLL1Compilada): La tabla compilada.
+
+    Retorna:
+    - (acepta, pasos): Si la cadena es aceptada, y un dict con los pasos hechos hasta aceptar o fallar:
+      'coincidencias' (tokens consumidos) y 'expansiones' (producciones aplicadas).
+    """
+    ancho = tabla.ancho
+    celdas = tabla.celdas
+    cuerpos = tabla.cuerpos
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    pila = [ID_FIN, tabla.inicial]
+    coincidencias = 0
+    expansiones = 0
+    while True:
+        tope = pila.pop()
+        if tope < ancho:
+            if tope != actual or tope == ID_FIN:
+                return tope == actual, {"coincidencias": coincidencias, "expansiones": expansiones}
+            coincidencias += 1
+            actual = next(entrada, ID_FIN)
+        else:
+            p = celdas[(tope - ancho) * ancho + actual]
+            if p < 0:
+                return False, {"coincidencias": coincidencias, "expansiones": expansiones}
+            expansiones += 1
+            pila.extend(cuerpos[p])
+
+
+def contar_pasos_slr1(tokens, tabla):
+    """
+    Analiza como parse_slr1_compilado, pero contando los pasos (para las estadísticas, ver estadisticas.py).
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+
+    Retorna:
+    - (acepta, pasos): Si la cadena es aceptada, y un dict con los pasos hechos hasta aceptar o fallar:
+      'desplazamientos' (shift) y 'reducciones' (reduce).
+    """
+    ancho = tabla.ancho
+    acciones = tabla.acciones
+    ancho_goto = tabla.ancho_goto
+    goto = tabla.goto
+    cabezas = tabla.cabezas
+    longitudes = tabla.longitudes
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    pila = [0]
+    desplazamientos = 0
+    reducciones = 0
+    while True:
+        accion = acciones[pila[-1] * ancho + actual]
+        if accion > 0:
+            pila.append(accion - 1)
+            desplazamientos += 1
+            actual = next(entrada, ID_FIN)
+        elif accion < ACEPTAR:
+            p = -accion - 1
+            if longitudes[p]:
+                del pila[-longitudes[p]:]
+            pila.append(goto[pila[-1] * ancho_goto + cabezas[p]])
+            reducciones += 1
+        else:
+            return accion == ACEPTAR, {"desplazamientos": desplazamientos, "reducciones": reducciones}
@@ -0,0 +1,260 @@
+from array import array
+from collections import Counter
+from tablas_compiladas import ERROR, ACEPTAR, CAPACIDAD_PILA, codificar
+from simbolos import ID_FIN
+from estadisticas import activas, medido
+
+
+class TablaSLR1Comprimida:
+    """
+    Tablas ACTION y GOTO de un SLR(1) (o LALR(1)) comprimidas con reducciones por defecto y
+    desplazamiento de filas (comb-vector).
+
+    ACTION: cada estado tiene una acción por defecto (el reduce más frecuente de su fila, o error)
+    y solo se guardan las entradas que difieren de ella. Las entradas de todas las filas se
+    intercalan en un único arreglo 'valores': la fila del estado s empieza en base[s] y la entrada
+    de la columna t está en base[s] + t si verificacion[base[s] + t] == s. Si no, vale el defecto.
+
+    GOTO: igual, pero por columna (no terminal), porque el GOTO de un no terminal casi siempre lleva
+    al mismo estado. El defecto de cada no terminal es su destino más frecuente.
+
+    Las dos consultas son O(1): un índice, una comparación y, a lo sumo, otro índice.
+
+    Atributos:
+    - simbolos (TablaSimbolos): Ids de terminales y no terminales.
+    - ancho (int): Columnas de ACTION (como en TablaSLR1Compilada).
+    - defectos (array): Por estado, la acción por defecto.
+    - base (array): Por estado, dónde empieza su fila en 'valores'.
+    - valores (array): Las acciones que no son el defecto de su fila.
+    - verificacion (array): Por posición de 'valores', el estado dueño o -1.
+    - goto_defectos (array): Por no terminal, el estado destino por defecto (-1 si no tiene GOTO).
+    - goto_base (array): Por no terminal, dónde empieza su columna en 'goto_valores'.
+    - goto_valores (array): Los destinos que no son el defecto de su no terminal.
+    - goto_verificacion (array): Por posición de 'goto_valores', el no terminal dueño o -1.
+    - cabezas, longitudes, producciones: Como en TablaSLR1Compilada.
+    """
+
+    def __init__(self, simbolos, ancho, defectos, base, valores, verificacion,
+                 goto_defectos, goto_base, goto_valores, goto_verificacion, cabezas, longitudes, producciones):
+        self.simbolos = simbolos
+        self.ancho = ancho
+        self.defectos = defectos
+        self.base = base
+        self.valores = valores
+        self.verificacion = verificacion
+        self.goto_defectos = goto_defectos
+        self.goto_base = goto_base
+        self.goto_valores = goto_valores
+        self.goto_verificacion = goto_verificacion
+        self.cabezas = cabezas
+        self.longitudes = longitudes
+        self.producciones = producciones
+
+    @property
+    def num_estados(self):
+        return len(self.defectos)
+
+    def accion(self, estado, terminal):
+        """La acción codificada de ACTION[estado][terminal] (ver tablas_compiladas)."""
+        i = self.base[estado] + terminal
+        if self.verificacion[i] == estado:
+            return self.valores[i]
+        return self.defectos[estado]
+
+    def ir_a(self, estado, no_terminal):
+        """El estado de GOTO[estado][no_terminal] (ids de no terminal)."""
+        i = self.goto_base[no_terminal] + estado
+        if self.goto_verificacion[i] == no_terminal:
+            return self.goto_valores[i]
+        return self.goto_defectos[no_terminal]
+
+    def codificar(self, cadena):
+        """Convierte una secuencia de terminales en sus ids (los desconocidos van a la última columna)."""
+        return codificar(cadena, self.simbolos, self.ancho - 1)
+
+
+def empaquetar_filas(filas, largo):
+    """
+    Intercala filas dispersas en un solo arreglo (comb-vector), buscando para cada fila el primer
+    desplazamiento en el que sus entradas caen en posiciones libres.
+
+    Las filas se ubican de la más llena a la más vacía, que es cuando la búsqueda deja menos huecos.
+    Las posiciones ocupadas se llevan en un bitmask, asi probar un desplazamiento es una sola operación
+    entera sobre toda la fila, y solo se prueban los desplazamientos que dejan la primera columna de la
+    fila en una posición libre (se salta directamente a la siguiente).
+    Al final el arreglo se alarga para que base + cualquier columna (hasta 'largo') sea un índice válido.
+
+    Parametros:
+    - filas (list): Por fila, un dict columna → valor con sus entradas.
+    - largo (int): Cantidad de columnas de cada fila.
+
+    Retorna:
+    - (base, valores, verificacion): Los arreglos, como en TablaSLR1Comprimida.
+    """
+    base = array('i', [0]) * len(filas)
+    valores = array('i')
+    verificacion = array('i')
+    ocupadas = 0 # Bit i: la posición i de 'valores' está ocupada
+
+    for k in sorted(range(len(filas)), key=lambda k: -len(filas[k])):
+        fila = filas[k]
+        if not fila:
+            continue
+        columnas = sorted(fila)
+        primera = columnas[0]
+        mascara = 0 # Las columnas de la fila, relativas a la primera
+        for c in columnas:
+            mascara |= 1 << (c - primera)
+        # 'inicio' es la posición de la primera columna (desplazamiento + primera), siempre libre
+        inicio = _siguiente_libre(ocupadas, primera)
+        while (ocupadas >> inicio) & mascara:
+            inicio = _siguiente_libre(ocupadas, inicio + 1)
+        ocupadas |= mascara << inicio
+        desplazamiento = inicio - primera
+
+        faltan = desplazamiento + columnas[-1] + 1 - len(verificacion)
+        if faltan > 0:
+            valores.extend(array('i', [ERROR]) * faltan)
+            verificacion.extend(array('i', [-1]) * faltan)
+        for c in columnas:
+            valores[desplazamiento + c] = fila[c]
+            verificacion[desplazamiento + c] = k
+        base[k] = desplazamiento
+
+    faltan = max(base, default=0) + largo - len(verificacion)
+    if faltan > 0:
+        valores.extend(array('i', [ERROR]) * faltan)
+        verificacion.extend(array('i', [-1]) * faltan)
+    return base, valores, verificacion
+
+def _siguiente_libre(ocupadas, posicion):
+    """La primera posición libre (bit en 0 de 'ocupadas') desde 'posicion'."""
+    libres = ~ocupadas >> posicion
+    return posicion + (libres & -libres).bit_length() - 1
+
+
+@medido('comprimir')
+def comprimir_tabla_slr1(tabla):
+    """
+    Comprime una TablaSLR1Compilada.
+
+    Con la reducción por defecto, un estado que tiene reduces reduce también con los terminales que
+    eran error en su fila. Eso no cambia el lenguaje aceptado (en tablas sin conflictos): el error se
+    detecta igual, antes de hacer shift del token erróneo, solo que después de algunos reduces.
+
+    Parametros:
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+
+    Retorna:
+    - TablaSLR1Comprimida: Las tablas comprimidas.
+    """
+    ancho = tabla.ancho
+    ancho_goto = tabla.ancho_goto
+    num_estados = tabla.num_estados
+    acciones = tabla.acciones
+    goto = tabla.goto
+
+    defectos = array('i', [ERROR]) * num_estados
+    filas = []
+    for estado in range(num_estados):
+        fila = acciones[estado * ancho:(estado + 1) * ancho]
+        reduces = Counter(codigo for codigo in fila if codigo < ACEPTAR)
+        defecto = reduces.most_common(1)[0][0] if reduces else ERROR
+        defectos[estado] = defecto
+        # Los errores tampoco se guardan: en una fila con reducción por defecto pasan a ser ese reduce
+        filas.append({t: codigo for t, codigo in enumerate(fila) if codigo != defecto and codigo != ERROR})
+    base, valores, verificacion = empaquetar_filas(filas, ancho)
+
+    goto_defectos = array('i', [-1]) * ancho_goto
+    columnas = []
+    for n in range(ancho_goto):
+        columna = goto[n::ancho_goto]
+        destinos = Counter(destino for destino in columna if destino >= 0)
+        defecto = destinos.most_common(1)[0][0] if destinos else -1
+        goto_defectos[n] = defecto
+        columnas.append({estado: destino for estado, destino in enumerate(columna) if destino >= 0 and destino != defecto})
+    goto_base, goto_valores, goto_verificacion = empaquetar_filas(columnas, num_estados)
+
+    registro = activas()
+    if registro is not None:
+        registro.contar('comprimir.entradas', sum(len(fila) for fila in filas) + sum(len(columna) for columna in columnas))
+
+    return TablaSLR1Comprimida(tabla.simbolos, ancho, defectos, base, valores, verificacion,
+                               goto_defectos, goto_base, goto_valores, goto_verificacion,
+                               tabla.cabezas, tabla.longitudes, tabla.producciones)
+
+
+def informe_compresion(tabla, comprimida):
+    """
+    Compara el tamaño de las tablas compiladas con el de las comprimidas.
+
+    Parametros:
+    - tabla (TablaSLR1Compilada): Las tablas sin comprimir.
+    - comprimida (TablaSLR1Comprimida): Las mismas tablas comprimidas.
+
+    Retorna:
+    - dict: Estados, celdas y bytes de ACTION/GOTO sin comprimir, entradas guardadas y bytes
+      comprimidos, y la proporción comprimido / sin comprimir.
+    """
+    tam = array('i').itemsize
+    bytes_sin_comprimir = (len(tabla.acciones) + len(tabla.goto)) * tam
+    bytes_comprimidos = sum(len(a) for a in (comprimida.defectos, comprimida.base, comprimida.valores, comprimida.verificacion,
+                                             comprimida.goto_defectos, comprimida.goto_base, comprimida.goto_valores,
+                                             comprimida.goto_verificacion)) * tam
+    return {
+        "estados": tabla.num_estados,
+        "celdas": len(tabla.acciones) + len(tabla.goto),
+        "entradas": sum(1 for v in comprimida.verificacion if v >= 0) + sum(1 for v in comprimida.goto_verificacion if v >= 0),
+        "bytes_sin_comprimir": bytes_sin_comprimir,
+        "bytes_comprimidos": bytes_comprimidos,
+        "proporcion": bytes_comprimidos / bytes_sin_comprimir if bytes_sin_comprimir else 1.0,
+    }
+
+
+def parse_slr1_comprimido(tokens, tabla):
+    """
+    Igual que parse_slr1_compilado, pero con tablas comprimidas.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaSLR1Comprimida): Las tablas comprimidas.
+
+    Retorna:
+    - bool: True si la cadena es aceptada, False si hay error sintáctico.
+    """
+    defectos = tabla.defectos
+    base = tabla.base
+    valores = tabla.valores
+    verificacion = tabla.verificacion
+    goto_defectos = tabla.goto_defectos
+    goto_base = tabla.goto_base
+    goto_valores = tabla.goto_valores
+    goto_verificacion = tabla.goto_verificacion
+    cabezas = tabla.cabezas
+    longitudes = tabla.longitudes
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    pila = [0] * CAPACIDAD_PILA
+    capacidad = CAPACIDAD_PILA
+    tope = 0
+    estado = 0
+    while True:
+        i = base[estado] + actual
+        accion = valores[i] if verificacion[i] == estado else defectos[estado]
+        if accion > 0:
+            estado = accion - 1
+            actual = next(entrada, ID_FIN)
+        elif accion < ACEPTAR:
+            p = -accion - 1
+            tope -= longitudes[p]
+            cabeza = cabezas[p]
+            i = goto_base[cabeza] + pila[tope]
+            estado = goto_valores[i] if goto_verificacion[i] == cabeza else goto_defectos[cabeza]
+        else:
+            return accion == ACEPTAR
+        tope += 1
+        if tope == capacidad:
+            pila.extend(pila)
+            capacidad += capacidad
+        pila[tope] = estado
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+import benchmark
+from first import calcular_conjuntos_first
+from follow import calcular_conjuntos_follow
+
+
+def first_follow_ingenuo(gramatica):
+    """First y Follow de libro: se recorren todas las producciones hasta que ningún conjunto cambie."""
+    first = {no_terminal: set() for no_terminal in gramatica}
+
+    def first_de(simbolos):
+        resultado = set()
+        for simbolo in simbolos:
+            if simbolo not in gramatica:
+                return resultado | {simbolo}
+            resultado |= first[simbolo] - {'e'}
+            if 'e' not in first[simbolo]:
+                return resultado
+        return resultado | {'e'}
+
+    cambio = True
+    while cambio:
+        cambio = False
+        for no_terminal, producciones in gramatica.items():
+            for produccion in producciones:
+                nuevo = first_de(produccion)
+                if not nuevo <= first[no_terminal]:
+                    first[no_terminal] |= nuevo
+                    cambio = True
+
+    follow = {no_terminal: set() for no_terminal in gramatica}
+    follow['S'].add('$')
+    cambio = True
+    while cambio:
+        cambio = False
+        for no_terminal, producciones in gramatica.items():
+            for produccion in producciones:
+                for i, simbolo in enumerate(produccion):
+                    if simbolo not in gramatica:
+                        continue
+                    cola = first_de(produccion[i + 1:])
+                    nuevo = cola - {'e'}
+                    if 'e' in cola:
+                        nuevo |= follow[no_terminal]
+                    if not nuevo <= follow[simbolo]:
+                        follow[simbolo] |= nuevo
+                        cambio = True
+    return first, follow
+
+
+def calcular(gramatica):
+    first = calcular_conjuntos_first(gramatica)
+    follow = calcular_conjuntos_follow(gramatica, first)
+    return {nt: set(first[nt]) for nt in gramatica}, {nt: set(follow[nt]) for nt in gramatica}
+
+
+def test_recursion_izquierda_mutua():
+    # S y A se llaman mutuamente por la izquierda, y S y B son anulables
+    gramatica = {'S': [('A', 'a'), ()], 'A': [('S', 'b'), ('B', 'c')], 'B': [('S', 'B', 'd'), ()]}
+    first, follow = calcular(gramatica)
+    assert first == {'S': {'b', 'c', 'd', 'e'}, 'A': {'b', 'c', 'd'}, 'B': {'b', 'c', 'd', 'e'}}
+    assert follow == {'S': {'$', 'b', 'c', 'd'}, 'A': {'a'}, 'B': {'c', 'd'}}
+    assert (first, follow) == first_follow_ingenuo(gramatica)
+
+
+def gramatica_al_azar(azar):
+    """
+    Gramática chica al azar en la que siempre hay recursión a izquierda mutua entre dos no terminales
+    (a veces a través de un anulable) y algún no terminal anulable.
+    """
+    no_terminales = ['S'] + list('ABCDE'[:azar.randint(1, 5)])
+    terminales = ['a', 'b', 'c', 'd'][:azar.randint(1, 4)]
+    gramatica = {no_terminal: list({tuple(azar.choice(no_terminales + terminales) for _ in range(azar.randint(0, 3)))
+                                    for _ in range(azar.randint(1, 3))})
+                 for no_terminal in no_terminales}
+    x, y, anulable = (azar.choice(no_terminales) for _ in range(3))
+    if () not in gramatica[anulable]:
+        gramatica[anulable].append(())
+    gramatica[x].append((anulable, y, azar.choice(terminales)) if azar.random() < 0.5 else (y, azar.choice(terminales)))
+    gramatica[y].append((x,) + tuple(azar.choice(no_terminales + terminales) for _ in range(azar.randint(0, 2))))
+    return gramatica
+
+
+@pytest.mark.parametrize('semilla', range(10))
+def test_igual_al_punto_fijo(semilla):
+    azar = random.Random(semilla)
+    for _ in range(100):
+        gramatica = gramatica_al_azar(azar)
+        assert calcular(gramatica) == first_follow_ingenuo(gramatica), gramatica
+
+
+@pytest.mark.parametrize('familia', list(benchmark.FAMILIAS))
+def test_familias_del_benchmark(familia):
+    generar_gramatica, _ = benchmark.FAMILIAS[familia]
+    for escala in (1, 4, 12):
+        gramatica = generar_gramatica(escala)
+        assert calcular(gramatica) == first_follow_ingenuo(gramatica)
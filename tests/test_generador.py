@@ -0,0 +1,102 @@
+import random
+import sys
+
+import pytest
+
+import benchmark
+from cache import construir_analisis
+from generador import generar_modulo_ll1, generar_modulo_slr1
+from tablas_compiladas import parse_ll1_compilado, parse_slr1_compilado
+
+
+def cargar(codigo, nombre):
+    """Ejecuta el código de un módulo generado y devuelve su espacio de nombres."""
+    espacio = {'__name__': nombre}
+    exec(compile(codigo, f'<{nombre}>', 'exec'), espacio)
+    return espacio
+
+
+def parsers():
+    """Por familia del benchmark y parser, el módulo generado, su tabla, el driver compilado y el generador de entradas."""
+    for familia, (generar_gramatica, generar_entrada) in benchmark.FAMILIAS.items():
+        for escala in (1, 4):
+            analisis = construir_analisis(generar_gramatica(escala))
+            casos = []
+            if analisis.es_ll1:
+                casos.append(('ll1', generar_modulo_ll1(analisis.tabla_ll1), analisis.tabla_ll1, parse_ll1_compilado))
+            if analisis.es_slr1:
+                casos.append(('slr1', generar_modulo_slr1(analisis.tabla_slr1), analisis.tabla_slr1, parse_slr1_compilado))
+            if analisis.es_lalr1:
+                casos.append(('lalr1', generar_modulo_slr1(analisis.tabla_lalr1, 'LALR(1)'), analisis.tabla_lalr1,
+                              parse_slr1_compilado))
+            for parser, codigo, tabla, funcion_parse in casos:
+                yield pytest.param(codigo, tabla, funcion_parse, generar_entrada, escala, id=f'{familia}-{escala}-{parser}')
+
+PARSERS = list(parsers())
+
+
+def mutar(cadena, terminales, azar):
+    """Inserta, borra o cambia de uno a tres tokens (a veces por uno que no es de la gramática)."""
+    cadena = list(cadena)
+    for _ in range(azar.randint(1, 3)):
+        i = azar.randint(0, len(cadena))
+        token = azar.choice(terminales) if azar.random() < 0.9 else 'desconocido'
+        cambio = azar.random()
+        if cambio < 0.4 or not cadena:
+            cadena.insert(i, token)
+        elif cambio < 0.7:
+            del cadena[min(i, len(cadena) - 1)]
+        else:
+            cadena[min(i, len(cadena) - 1)] = token
+    return cadena
+
+
+@pytest.mark.parametrize('codigo, tabla, funcion_parse, generar_entrada, escala', PARSERS)
+def test_igual_al_driver_compilado(codigo, tabla, funcion_parse, generar_entrada, escala):
+    modulo = cargar(codigo, 'parser_generado')
+    terminales = [t for t in tabla.simbolos.terminales if t not in ('e', '$')]
+    azar = random.Random(escala)
+    resultados = set()
+    for _ in range(300):
+        cadena = generar_entrada(escala, azar.randint(0, 30), azar)
+        if azar.random() < 0.5:
+            cadena = mutar(cadena, terminales, azar)
+        esperado = funcion_parse(tabla.codificar(cadena), tabla)
+        assert modulo['analizar'](cadena) == esperado, cadena
+        assert modulo['analizar_ids'](iter(tabla.codificar(cadena))) == esperado, cadena
+        resultados.add(esperado)
+    assert resultados == {True, False}
+
+
+def test_anidamiento_mas_profundo_que_el_limite_de_recursion():
+    # Expresiones LL(1): cada paréntesis anida llamadas a las funciones de S, T y F del módulo generado,
+    # asi que pasado el límite de recursión el módulo tiene que seguir con su driver de pila explícita
+    gramatica = {
+        'S': [('T', 'X')],
+        'X': [('+', 'T', 'X'), ()],
+        'T': [('F', 'Y')],
+        'Y': [('*', 'F', 'Y'), ()],
+        'F': [('(', 'S', ')'), ('i',)],
+    }
+    analisis = construir_analisis(gramatica)
+    profundidad = sys.getrecursionlimit() + 100
+    cadena = ['('] * profundidad + ['i'] + [')'] * profundidad + ['+', 'i', '*', 'i']
+    entradas = (cadena, cadena[:-1], cadena[:profundidad] + cadena[profundidad + 1:])
+
+    modulo = cargar(generar_modulo_ll1(analisis.tabla_ll1), 'parser_generado')
+    con_pila = modulo['_analizar_con_pila']
+    llamadas = []
+    modulo['_analizar_con_pila'] = lambda ids: llamadas.append(ids) or con_pila(ids)
+    for entrada in entradas:
+        ids = analisis.tabla_ll1.codificar(entrada)
+        esperado = parse_ll1_compilado(ids, analisis.tabla_ll1)
+        assert modulo['analizar'](entrada) == esperado
+        assert modulo['analizar_ids'](iter(ids)) == esperado
+    assert len(llamadas) == 2 * len(entradas)
+    assert modulo['analizar'](cadena)
+
+    modulo = cargar(generar_modulo_slr1(analisis.tabla_slr1), 'parser_generado')
+    for entrada in entradas:
+        ids = analisis.tabla_slr1.codificar(entrada)
+        assert modulo['analizar'](entrada) == parse_slr1_compilado(ids, analisis.tabla_slr1)
+    assert modulo['analizar'](cadena)
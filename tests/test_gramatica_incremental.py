@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from gramatica_incremental import GramaticaIncremental
+from first import calcular_conjuntos_first, calcular_anulables
+from follow import calcular_conjuntos_follow
+from verificador_ll1 import es_gramatica_ll1
+from tabla_ll1 import construir_tabla_ll1
+from verificador_slr1 import analizar_slr1, construir_automata_lr0
+
+NO_TERMINALES = 'SABCDE'
+TERMINALES = 'abcd'
+
+
+def gramatica_azar(azar, cantidad):
+    """Una gramática de 'cantidad' no terminales, con producciones vacías y recursión de todo tipo."""
+    no_terminales = list(NO_TERMINALES[:cantidad])
+    gramatica = {}
+    for no_terminal in no_terminales:
+        producciones = [tuple(azar.choice(no_terminales + list(TERMINALES)) for _ in range(azar.choice([0, 1, 2, 2, 3])))
+                        for _ in range(azar.randint(1, 3))]
+        gramatica[no_terminal] = list(dict.fromkeys(producciones))
+    return gramatica
+
+
+def comparar_con_recalculo(incremental):
+    """Verifica que todo lo que mantiene GramaticaIncremental sea igual a analizar la gramática desde cero."""
+    gramatica = {no_terminal: list(producciones) for no_terminal, producciones in incremental.gramatica.items()}
+    first = calcular_conjuntos_first(gramatica)
+    follow = calcular_conjuntos_follow(gramatica, first)
+    assert incremental.anulables == calcular_anulables(gramatica)
+    assert dict(incremental.conjuntos_first) == dict(first)
+    assert dict(incremental.conjuntos_follow) == dict(follow)
+    assert incremental.es_ll1 == es_gramatica_ll1(gramatica, first, follow)
+    assert incremental.tabla_ll1 == construir_tabla_ll1(gramatica, first, follow)
+
+    estados, transiciones, _ = construir_automata_lr0(gramatica)
+    estados_incrementales, transiciones_incrementales, _ = incremental.automata()
+    assert transiciones_incrementales == transiciones
+    assert [frozenset(estado) for estado in estados_incrementales] == [frozenset(estado) for estado in estados]
+
+    acciones, goto, conflictos = analizar_slr1(gramatica, follow)
+    acciones_incrementales, goto_incremental, conflictos_incrementales = incremental.tablas_slr1()
+    assert acciones_incrementales == acciones and goto_incremental == goto
+    assert sorted(map(repr, conflictos_incrementales)) == sorted(map(repr, conflictos))
+    assert incremental.es_slr1 == (not conflictos)
+
+
+@pytest.mark.parametrize('semilla', range(8))
+def test_igual_al_recalculo_tras_cada_cambio(semilla):
+    azar = random.Random(semilla)
+    for _ in range(15):
+        incremental = GramaticaIncremental(gramatica_azar(azar, azar.randint(1, 5)))
+        comparar_con_recalculo(incremental)
+        for _ in range(20):
+            no_terminales = list(incremental.gramatica)
+            eleccion = azar.random()
+            if eleccion < 0.5:
+                # Agregar, incluso a un no terminal nuevo o a un símbolo que hasta ahora era terminal
+                no_terminal = azar.choice(no_terminales + ['X', 'a'])
+                produccion = tuple(azar.choice(no_terminales + list(TERMINALES) + ['X']) for _ in range(azar.choice([0, 1, 2, 3])))
+                incremental.agregar_produccion(no_terminal, produccion)
+            elif eleccion < 0.6:
+                nueva = gramatica_azar(azar, len(no_terminales) if azar.random() < 0.7 else azar.randint(1, 5))
+                incremental.sincronizar(nueva)
+                assert all(incremental.gramatica.get(nt) == producciones for nt, producciones in nueva.items())
+            else:
+                candidatas = [(nt, produccion) for nt in no_terminales for produccion in incremental.gramatica[nt]]
+                if not candidatas:
+                    continue
+                incremental.quitar_produccion(*azar.choice(candidatas))
+            comparar_con_recalculo(incremental)
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+import benchmark
+import incremental
+from cache import construir_analisis
+from incremental import ParserIncremental
+from tablas_compiladas import parse_slr1_posicion
+
+
+def tablas_lr():
+    """Las tablas SLR(1) y LALR(1) de las familias del benchmark, con su generador de entradas."""
+    for familia, (generar_gramatica, generar_entrada) in benchmark.FAMILIAS.items():
+        for escala in (1, 3):
+            analisis = construir_analisis(generar_gramatica(escala))
+            for parser, tabla in (('slr1', analisis.tabla_slr1 if analisis.es_slr1 else None),
+                                  ('lalr1', analisis.tabla_lalr1 if analisis.es_lalr1 else None)):
+                if tabla is not None:
+                    yield pytest.param(tabla, generar_entrada, escala, id=f'{familia}-{escala}-{parser}')
+
+TABLAS = list(tablas_lr())
+
+
+def edicion_al_azar(tokens, tabla, generar_entrada, escala, azar):
+    """Un reemplazo [inicio, fin) → nuevos de hasta 3 tokens, con tokens al azar o de otra cadena de la familia."""
+    inicio = azar.randint(0, len(tokens))
+    fin = azar.randint(inicio, min(inicio + 3, len(tokens)))
+    cantidad = azar.randint(0 if fin > inicio else 1, 3)
+    if azar.random() < 0.5:
+        nuevos = [azar.randrange(tabla.ancho) for _ in range(cantidad)]
+    else:
+        otra = tabla.codificar(generar_entrada(escala, 10, azar))
+        desde = azar.randrange(len(otra))
+        nuevos = otra[desde:desde + cantidad]
+    return inicio, fin, nuevos
+
+
+@pytest.mark.parametrize('tabla, generar_entrada, escala', TABLAS)
+@pytest.mark.parametrize('compactar', [False, True], ids=['', 'compactando'])
+def test_editar_igual_a_analizar_desde_cero(tabla, generar_entrada, escala, compactar, monkeypatch):
+    if compactar:
+        # Cada edición vuelve a analizar todo (ver FACTOR_COMPACTACION)
+        monkeypatch.setattr(incremental, 'FACTOR_COMPACTACION', -1024)
+    azar = random.Random(escala)
+    for _ in range(5):
+        tokens = tabla.codificar(generar_entrada(escala, azar.randint(0, 40), azar))
+        parser = ParserIncremental(tabla)
+        assert parser.analizar(tokens) == parse_slr1_posicion(tokens, tabla)[0]
+        deshacer = []
+        for _ in range(60):
+            if deshacer and azar.random() < 0.3:
+                # Deshacer la última edición, para volver a sincronizarse con los análisis anteriores
+                inicio, fin, nuevos = deshacer.pop()
+            else:
+                inicio, fin, nuevos = edicion_al_azar(tokens, tabla, generar_entrada, escala, azar)
+                deshacer.append((inicio, inicio + len(nuevos), tokens[inicio:fin]))
+            tokens[inicio:fin] = nuevos
+            acepta = parser.editar(inicio, fin, nuevos)
+            assert parser.tokens == tokens
+            assert (acepta, -1 if acepta else parser.error) == parse_slr1_posicion(tokens, tabla)
+
+
+def test_reanalisis_acotado_al_cambiar_un_operador():
+    # Expresiones sin paréntesis: cambiar un operador solo cambia la pila hasta el siguiente o0 (el de menor
+    # precedencia), donde todo lo anterior se reduce a S
+    tabla = construir_analisis(benchmark.gramatica_expresiones(3)).tabla_slr1
+    azar = random.Random(0)
+    for largo in (200, 20000):
+        operadores = [f'o{azar.choice((0, 1, 1, 2, 2, 2))}' for _ in range(largo)]
+        tokens = tabla.codificar([s for o in operadores for s in ('id', o)] + ['id'])
+        parser = ParserIncremental(tabla)
+        assert parser.analizar(tokens)
+        for _ in range(100):
+            i = 2 * azar.randrange(largo) + 1
+            assert parser.editar(i, i + 1, tabla.codificar([f'o{azar.randrange(3)}']))
+            # Se desplaza hasta el operador editado, el 'id' siguiente y, a lo sumo, hasta el próximo o0
+            siguiente = next((j for j in range(i + 2, len(tokens), 2) if operadores[j // 2] == 'o0'), len(tokens))
+            assert parser.reanalizados <= siguiente - i + 1
+            operadores[i // 2] = tabla.simbolos.terminales[parser.tokens[i]]
+
+
+def test_reanalisis_constante_en_alternativas():
+    tabla = construir_analisis(benchmark.gramatica_alternativas(10)).tabla_slr1
+    azar = random.Random(0)
+    for largo in (100, 10000):
+        tokens = tabla.codificar(benchmark.entrada_alternativas(10, largo, azar))
+        parser = ParserIncremental(tabla)
+        assert parser.analizar(tokens)
+        valores = tabla.codificar(['id', 'num'])
+        for _ in range(100):
+            i = 2 * azar.randrange(len(tokens) // 2) + 1
+            assert parser.editar(i, i + 1, [azar.choice(valores)])
+            assert parser.reanalizados <= 2
+
+
+def test_rango_invalido():
+    tabla = construir_analisis(benchmark.gramatica_alternativas(2)).tabla_slr1
+    parser = ParserIncremental(tabla)
+    parser.analizar(tabla.codificar(['k0', 'id']))
+    with pytest.raises(ValueError):
+        parser.editar(1, 3, [])
@@ -0,0 +1,48 @@
+import io
+
+from lexer import Lexer
+from simbolos import TablaSimbolos
+
+
+def nombres_de_bloques(lexer, bloques, **opciones):
+    terminales = lexer.simbolos.terminales
+    return [terminales[t] for t in lexer.tokens_de_bloques(bloques, **opciones)]
+
+
+def test_literal_partido_entre_bloques():
+    # 'ab' no es token, pero el literal 'abc' sigue en el próximo bloque
+    lexer = Lexer(TablaSimbolos({'S': [('a',), ('abc',)]}))
+    assert nombres_de_bloques(lexer, ['ab', 'c']) == lexer.nombres('abc') == ['abc']
+
+
+def test_numero_con_decimales_partido_entre_bloques():
+    # '12.' termina antes del final del bloque, pero '12.5' es un solo 'num'
+    lexer = Lexer(TablaSimbolos({'S': [('num', '.', 'num')]}), {'num': r'\d+(\.\d+)?'})
+    assert nombres_de_bloques(lexer, ['12.', '5']) == ['num']
+    assert nombres_de_bloques(lexer, ['1', '2.', '5 ', '.', '7']) == ['num', '.', 'num']
+
+
+def test_bloques_iguales_a_todo_el_texto():
+    lexer = Lexer(TablaSimbolos({'S': [('if', 'id', 'then', 'id', '(', ')')]}),
+                  {'id': r'[a-z]+', 'num': r'\d+(\.\d+)?'})
+    texto = 'if x1 then 12.5 ( ifa then3.25 ) ' * 20
+    esperado = list(lexer.tokens_con_posicion(texto))
+    for tam in (1, 2, 3, 7, 64):
+        bloques = [texto[i:i + tam] for i in range(0, len(texto), tam)]
+        assert list(lexer.tokens_de_bloques(bloques, con_posicion=True)) == esperado
+        assert list(lexer.tokens_de_archivo(io.StringIO(texto), tam, con_posicion=True)) == esperado
+
+
+def test_bloques_asincronos():
+    import asyncio
+
+    lexer = Lexer(TablaSimbolos({'S': [('a',), ('abc',)]}))
+
+    async def bloques():
+        for bloque in ('a', 'bca', 'b', 'c'):
+            yield bloque
+
+    async def leer():
+        return [t async for t in lexer.tokens_de_bloques_async(bloques())]
+
+    assert asyncio.run(leer()) == list(lexer.tokens('abcabc'))
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+import benchmark
+import lote_vectorizado
+from cache import construir_analisis
+from lote_vectorizado import analizar_lote_slr1, parse_slr1_posicion
+from tablas_compiladas import parse_slr1_compilado
+
+
+def tablas_lr():
+    """Las tablas SLR(1) y LALR(1) de las familias del benchmark, con su generador de entradas."""
+    for familia, (generar_gramatica, generar_entrada) in benchmark.FAMILIAS.items():
+        for escala in (1, 3):
+            analisis = construir_analisis(generar_gramatica(escala))
+            for parser, tabla in (('slr1', analisis.tabla_slr1 if analisis.es_slr1 else None),
+                                  ('lalr1', analisis.tabla_lalr1 if analisis.es_lalr1 else None)):
+                if tabla is not None:
+                    yield pytest.param(tabla, generar_entrada, escala, id=f'{familia}-{escala}-{parser}')
+
+
+def lote(tabla, generar_entrada, escala, azar, cantidad=400):
+    """Cadenas generadas de la familia, la mitad con uno a tres tokens insertados, borrados o cambiados."""
+    cadenas = []
+    for _ in range(cantidad):
+        cadena = tabla.codificar(generar_entrada(escala, azar.randint(0, 25), azar))
+        if azar.random() < 0.5:
+            for _ in range(azar.randint(1, 3)):
+                i = azar.randint(0, len(cadena))
+                cambio = azar.random()
+                if cambio < 0.4 or not cadena:
+                    cadena.insert(i, azar.randrange(tabla.ancho))
+                elif cambio < 0.7:
+                    del cadena[min(i, len(cadena) - 1)]
+                else:
+                    cadena[min(i, len(cadena) - 1)] = azar.randrange(tabla.ancho)
+        cadenas.append(cadena)
+    return cadenas
+
+
+@pytest.mark.parametrize('tabla, generar_entrada, escala', list(tablas_lr()))
+@pytest.mark.parametrize('con_numpy', [True, False], ids=['numpy', 'sin_numpy'])
+def test_igual_al_driver_escalar(tabla, generar_entrada, escala, con_numpy, monkeypatch):
+    if con_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(lote_vectorizado, 'np', None)
+    azar = random.Random(escala)
+    cadenas = lote(tabla, generar_entrada, escala, azar)
+    esperados = [parse_slr1_posicion(cadena, tabla) for cadena in cadenas]
+    for tam_grupo in (7, lote_vectorizado.TAM_GRUPO):
+        aceptadas, posiciones = analizar_lote_slr1(cadenas, tabla, tam_grupo)
+        assert [(bool(a), int(p)) for a, p in zip(aceptadas, posiciones)] == esperados
+        assert [bool(a) for a in aceptadas] == [parse_slr1_compilado(cadena, tabla) for cadena in cadenas]
+    assert any(acepta for acepta, _ in esperados) and not all(acepta for acepta, _ in esperados)
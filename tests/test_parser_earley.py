@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from estadisticas import Estadisticas
+from parser_earley import construir_tabla_earley, reconocer_earley, errores_earley
+
+
+def earley_ingenuo(gramatica, cadena, simbolo_inicial='S'):
+    """
+    Earley de libro: cada conjunto se cierra con predicción, completado y scan hasta un punto fijo
+    (asi los anulables no necesitan trucos). Los ítems son (producción, punto, origen).
+
+    Retorna:
+    - (acepta, posicion, esperados): Como reconocer_earley, pero con los nombres de los terminales.
+    """
+    producciones = [("S'", (simbolo_inicial,))] + [(a, p) for a, ps in gramatica.items() for p in ps]
+    conjuntos = [set() for _ in range(len(cadena) + 1)]
+    conjuntos[0].add((0, 0, 0))
+    for i, conjunto in enumerate(conjuntos):
+        cambio = True
+        while cambio:
+            cambio = False
+            for p, punto, origen in list(conjunto):
+                cabeza, cuerpo = producciones[p]
+                if punto == len(cuerpo):
+                    avanzados = {(q, pq + 1, oq) for q, pq, oq in conjuntos[origen]
+                                 if pq < len(producciones[q][1]) and producciones[q][1][pq] == cabeza}
+                elif cuerpo[punto] in gramatica:
+                    avanzados = {(q, 0, i) for q, (c, _) in enumerate(producciones) if c == cuerpo[punto]}
+                    if any(producciones[q][0] == cuerpo[punto] and pq == len(producciones[q][1]) and oq == i
+                           for q, pq, oq in conjunto):
+                        avanzados.add((p, punto + 1, origen))
+                else:
+                    if i < len(cadena) and cuerpo[punto] == cadena[i]:
+                        conjuntos[i + 1].add((p, punto + 1, origen))
+                    continue
+                if not avanzados <= conjunto:
+                    conjunto |= avanzados
+                    cambio = True
+
+    aceptada = [(0, 1, 0) in conjunto for conjunto in conjuntos]
+    if aceptada[-1]:
+        return True, -1, []
+    posicion = max(i for i, conjunto in enumerate(conjuntos) if conjunto)
+    esperados = {producciones[p][1][punto] for p, punto, _ in conjuntos[posicion]
+                 if punto < len(producciones[p][1]) and producciones[p][1][punto] not in gramatica}
+    if aceptada[posicion]:
+        esperados.add('$')
+    return False, posicion, sorted(esperados)
+
+
+def gramatica_al_azar(azar):
+    """Gramática chica al azar en la que siempre hay un no terminal anulable y uno recursivo a derecha."""
+    no_terminales = ['S'] + list('ABC'[:azar.randint(1, 3)])
+    terminales = ['a', 'b', 'c'][:azar.randint(1, 3)]
+    gramatica = {}
+    for no_terminal in no_terminales:
+        producciones = {tuple(azar.choice(no_terminales + terminales) for _ in range(azar.randint(0, 3)))
+                        for _ in range(azar.randint(1, 3))}
+        gramatica[no_terminal] = list(producciones)
+    anulable, recursivo = azar.choice(no_terminales), azar.choice(no_terminales)
+    if () not in gramatica[anulable]:
+        gramatica[anulable].append(())
+    gramatica[recursivo].append((azar.choice(terminales), azar.choice(no_terminales), recursivo))
+    return gramatica, terminales
+
+
+@pytest.mark.parametrize('semilla', range(10))
+def test_igual_a_earley_ingenuo(semilla):
+    azar = random.Random(semilla)
+    for _ in range(20):
+        gramatica, terminales = gramatica_al_azar(azar)
+        tabla = construir_tabla_earley(gramatica)
+        nombres = tabla.simbolos.terminales
+        for _ in range(25):
+            cadena = [azar.choice(terminales) for _ in range(azar.randint(0, 8))]
+            acepta, posicion, esperados = reconocer_earley(tabla.codificar(cadena), tabla)
+            assert (acepta, posicion, sorted(nombres[t] for t in esperados)) == earley_ingenuo(gramatica, cadena), \
+                (gramatica, cadena)
+
+
+def test_errores_earley():
+    # S genera a lo sumo k 'a' seguidas de k 'b' (cada A puede ser vacía)
+    gramatica = {'S': [('A', 'S', 'b'), ()], 'A': [('a',), ()]}
+    tabla = construir_tabla_earley(gramatica)
+    assert errores_earley(tabla.codificar(['a', 'b', 'b']), tabla) == []
+    error, = errores_earley(tabla.codificar(['a', 'c', 'b']), tabla)
+    assert (error.posicion, error.token, error.esperados) == (1, None, ['a', 'b'])
+    error, = errores_earley(tabla.codificar(['a', 'a']), tabla)
+    assert (error.posicion, error.token, error.esperados) == (2, '$', ['a', 'b'])
+    error, = errores_earley(tabla.codificar(['b', 'a']), tabla)
+    assert (error.posicion, error.token, error.esperados) == (1, 'a', ['$', 'b'])
+
+
+@pytest.mark.parametrize('gramatica, generar', [
+    ({'S': [('a', 'S'), ('a',)]}, lambda n: ['a'] * n),
+    ({'S': [('a', 'S'), ()]}, lambda n: ['a'] * n),
+    ({'S': [('a', 'B')], 'B': [('b', 'S'), ()]}, lambda n: ['a', 'b'] * n + ['a']),
+], ids=['derecha', 'derecha-anulable', 'mutua'])
+def test_items_lineales_con_recursion_a_derecha(gramatica, generar):
+    # Cada prefijo es una oración, asi que sin el atajo de Leo cada conjunto completaría toda la cadena
+    # de ítems recursivos abiertos y la cantidad de ítems sería cuadrática
+    tabla = construir_tabla_earley(gramatica)
+    items = []
+    for n in (200, 800, 3200):
+        with Estadisticas() as estadisticas:
+            assert reconocer_earley(tabla.codificar(generar(n)), tabla)[0]
+        items.append(estadisticas.contadores['earley.items'])
+    assert items[1] < 4.2 * items[0] and items[2] < 4.2 * items[1]
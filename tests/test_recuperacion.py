@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+import benchmark
+from cache import construir_analisis
+from parser_earley import construir_tabla_earley, errores_earley
+from recuperacion import errores_ll1, errores_slr1
+from simbolos import ID_FIN
+from tablas_compiladas import parse_slr1_posicion
+
+EXPRESIONES = {
+    'S': [('T', 'X')],
+    'X': [('+', 'T', 'X'), ()],
+    'T': [('F', 'Y')],
+    'Y': [('*', 'F', 'Y'), ()],
+    'F': [('(', 'S', ')'), ('i',)],
+}
+
+
+def errores(gramatica, analisis, parser, cadena):
+    """Los errores de la cadena (nombres de terminales) con el parser dado, como tuplas."""
+    if parser == 'll1':
+        lista = errores_ll1(analisis.tabla_ll1.codificar(cadena), analisis.tabla_ll1, analisis.conjuntos_follow)
+    elif parser == 'slr1':
+        lista = errores_slr1(analisis.tabla_slr1.codificar(cadena), analisis.tabla_slr1, analisis.conjuntos_follow)
+    else:
+        tabla = construir_tabla_earley(gramatica, simbolos=analisis.simbolos)
+        lista = errores_earley(tabla.codificar(cadena), tabla)
+    return [(error.posicion, error.token, error.esperados) for error in lista]
+
+
+@pytest.mark.parametrize('cadena, ll1, slr1', [
+    ('i + ( i * i )', [], []),
+    ('i + + i', [(2, '+', ['(', 'i'])], [(2, '+', ['(', 'i'])]),
+    ('( i', [(2, '$', [')'])], [(2, '$', [')'])]),
+    ('i ) i', [(1, ')', ['$'])], [(1, ')', ['$'])]),
+    ('i i + i * )', [(1, 'i', ['$', ')', '*', '+']), (5, ')', ['(', 'i'])],
+                    [(1, 'i', ['$', ')', '*', '+']), (5, ')', ['(', 'i'])]),
+    ('i ? i', [(1, None, ['$', ')', '*', '+'])], [(1, None, ['$', ')', '*', '+'])]),
+    ('', [(0, '$', ['(', 'i'])], [(0, '$', ['(', 'i'])]),
+])
+def test_errores_conocidos(cadena, ll1, slr1):
+    analisis = construir_analisis(EXPRESIONES)
+    assert errores(EXPRESIONES, analisis, 'll1', cadena.split()) == ll1
+    assert errores(EXPRESIONES, analisis, 'slr1', cadena.split()) == slr1
+
+
+def entrada_expresiones(escala, n, azar):
+    """Una expresión de EXPRESIONES con unos 'n' tokens."""
+    if n <= 1 or azar.random() < 0.2:
+        return ['i']
+    if azar.random() < 0.3:
+        return ['('] + entrada_expresiones(escala, n - 2, azar) + [')']
+    izquierda = azar.randint(1, n - 1)
+    return (entrada_expresiones(escala, izquierda, azar) + [azar.choice('+*')]
+            + entrada_expresiones(escala, n - izquierda - 1, azar))
+
+
+def familias_ll1_y_slr1():
+    """Las gramáticas del benchmark que son LL(1) y SLR(1), con su generador de entradas, y la de expresiones."""
+    casos = [pytest.param(EXPRESIONES, entrada_expresiones, 1, id='expresiones-ll1')]
+    for familia, (generar_gramatica, generar_entrada) in benchmark.FAMILIAS.items():
+        for escala in (1, 3):
+            analisis = construir_analisis(generar_gramatica(escala))
+            if analisis.es_ll1 and analisis.es_slr1:
+                casos.append(pytest.param(generar_gramatica(escala), generar_entrada, escala, id=f'{familia}-{escala}'))
+    return casos
+
+
+def mutar(cadena, terminales, azar):
+    """Inserta, borra o cambia de uno a tres tokens (a veces por uno que no es de la gramática)."""
+    cadena = list(cadena)
+    for _ in range(azar.randint(1, 3)):
+        i = azar.randint(0, len(cadena))
+        token = azar.choice(terminales) if azar.random() < 0.9 else '?'
+        cambio = azar.random()
+        if cambio < 0.4 or not cadena:
+            cadena.insert(i, token)
+        elif cambio < 0.7:
+            del cadena[min(i, len(cadena) - 1)]
+        else:
+            cadena[min(i, len(cadena) - 1)] = token
+    return cadena
+
+
+def revisar(lista, cadena):
+    """Los errores van en orden, con a lo sumo uno por posición, y dentro de la entrada."""
+    posiciones = [posicion for posicion, _, _ in lista]
+    assert posiciones == sorted(set(posiciones))
+    assert all(0 <= posicion <= len(cadena) for posicion in posiciones)
+
+
+@pytest.mark.parametrize('gramatica, generar_entrada, escala', familias_ll1_y_slr1())
+def test_primer_error_en_el_mismo_token(gramatica, generar_entrada, escala):
+    # Los tres parsers detectan el error en el primer token que no puede continuar la entrada leída
+    analisis = construir_analisis(gramatica)
+    terminales = [t for t in analisis.simbolos.terminales if t not in ('e', '$')]
+    azar = random.Random(escala)
+    for _ in range(200):
+        cadena = mutar(generar_entrada(escala, azar.randint(0, 20), azar), terminales, azar)
+        acepta, posicion = parse_slr1_posicion(analisis.tabla_slr1.codificar(cadena), analisis.tabla_slr1)
+        for parser in ('ll1', 'slr1', 'earley'):
+            lista = errores(gramatica, analisis, parser, cadena)
+            assert (not lista) == acepta
+            if lista:
+                assert lista[0][0] == posicion, (parser, cadena)
+            revisar(lista, cadena)
+
+
+@pytest.mark.parametrize('gramatica, generar_entrada, escala', familias_ll1_y_slr1())
+def test_termina_con_tokens_de_sincronizacion_o_desconocidos(gramatica, generar_entrada, escala):
+    # Entradas hechas solo de tokens que están en algún Follow (con los que el modo pánico se sincroniza)
+    # o solo de símbolos desconocidos: la recuperación tiene que avanzar igual hasta el final
+    analisis = construir_analisis(gramatica)
+    simbolos = analisis.simbolos
+    sincronizacion = 0
+    for bits in analisis.conjuntos_follow.bits:
+        sincronizacion |= bits
+    terminales = [simbolos.terminales[t] for t in simbolos.ids(sincronizacion) if t != ID_FIN]
+    azar = random.Random(escala)
+    for largo in (0, 1, 2, 5, 50, 300):
+        cadenas = [['?'] * largo]
+        if terminales:
+            cadenas.append([azar.choice(terminales) for _ in range(largo)])
+        for cadena in cadenas:
+            for parser in ('ll1', 'slr1', 'earley'):
+                lista = errores(gramatica, analisis, parser, cadena)
+                revisar(lista, cadena)
+                assert len(lista) <= len(cadena) + 1
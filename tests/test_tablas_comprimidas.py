@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+import benchmark
+from cache import construir_analisis
+from tablas_compiladas import ERROR, ACEPTAR, parse_slr1_compilado
+from tablas_comprimidas import comprimir_tabla_slr1, empaquetar_filas, parse_slr1_comprimido
+
+
+def tablas_lr():
+    """Las tablas SLR(1) y LALR(1) de las familias del benchmark, con su generador de entradas."""
+    for familia, (generar_gramatica, generar_entrada) in benchmark.FAMILIAS.items():
+        for escala in (1, 3, 8):
+            analisis = construir_analisis(generar_gramatica(escala))
+            for parser, tabla in (('slr1', analisis.tabla_slr1 if analisis.es_slr1 else None),
+                                  ('lalr1', analisis.tabla_lalr1 if analisis.es_lalr1 else None)):
+                if tabla is not None:
+                    yield pytest.param(tabla, generar_entrada, escala, id=f'{familia}-{escala}-{parser}')
+
+TABLAS = list(tablas_lr())
+
+
+@pytest.mark.parametrize('tabla, generar_entrada, escala', TABLAS)
+def test_acciones_como_la_tabla_densa(tabla, generar_entrada, escala):
+    comprimida = comprimir_tabla_slr1(tabla)
+    for estado in range(tabla.num_estados):
+        for terminal in range(tabla.ancho):
+            densa = tabla.acciones[estado * tabla.ancho + terminal]
+            accion = comprimida.accion(estado, terminal)
+            if densa == ERROR:
+                # Un error puede pasar a ser la reducción por defecto de la fila
+                assert accion == ERROR or accion == comprimida.defectos[estado] < ACEPTAR
+            else:
+                assert accion == densa
+
+
+@pytest.mark.parametrize('tabla, generar_entrada, escala', TABLAS)
+def test_goto_como_la_tabla_densa(tabla, generar_entrada, escala):
+    comprimida = comprimir_tabla_slr1(tabla)
+    for estado in range(tabla.num_estados):
+        for no_terminal in range(tabla.ancho_goto):
+            destino = tabla.goto[estado * tabla.ancho_goto + no_terminal]
+            if destino >= 0:
+                assert comprimida.ir_a(estado, no_terminal) == destino
+
+
+@pytest.mark.parametrize('tabla, generar_entrada, escala', TABLAS)
+def test_parse_como_la_tabla_densa(tabla, generar_entrada, escala):
+    comprimida = comprimir_tabla_slr1(tabla)
+    azar = random.Random(escala)
+    for _ in range(300):
+        cadena = tabla.codificar(generar_entrada(escala, azar.randint(0, 25), azar))
+        if azar.random() < 0.5:
+            for _ in range(azar.randint(1, 3)):
+                i = azar.randint(0, len(cadena))
+                if azar.random() < 0.5 or not cadena:
+                    cadena.insert(i, azar.randrange(tabla.ancho))
+                else:
+                    cadena[min(i, len(cadena) - 1)] = azar.randrange(tabla.ancho)
+        assert parse_slr1_comprimido(cadena, comprimida) == parse_slr1_compilado(cadena, tabla)
+
+
+@pytest.mark.parametrize('semilla', range(5))
+def test_empaquetar_filas_recupera_cada_fila(semilla):
+    azar = random.Random(semilla)
+    largo = 300
+    filas = [{c: azar.randint(1, 99) for c in azar.sample(range(largo), azar.choice((0, 1, 3, 20, 150)))}
+             for _ in range(80)]
+    base, valores, verificacion = empaquetar_filas(filas, largo)
+    for k, fila in enumerate(filas):
+        for c in range(largo):
+            i = base[k] + c
+            if c in fila:
+                assert verificacion[i] == k and valores[i] == fila[c]
+            else:
+                assert verificacion[i] != k
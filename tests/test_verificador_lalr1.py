@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from first import calcular_conjuntos_first, calcular_first_bits
+from follow import calcular_conjuntos_follow, calcular_follow_bits
+from simbolos import TablaSimbolos
+from verificador_slr1 import construir_automata_lr0, es_gramatica_slr1
+from verificador_lalr1 import calcular_anticipaciones_lalr1, es_gramatica_lalr1
+
+
+def anticipaciones(gramatica):
+    """Las anticipaciones LALR(1) como conjuntos de nombres, y el autómata LR(0) sobre el que se calcularon."""
+    simbolos = TablaSimbolos(gramatica)
+    automata = construir_automata_lr0(gramatica)
+    bits = calcular_anticipaciones_lalr1(gramatica, automata, simbolos)
+    return {clave: simbolos.a_conjunto(conjunto) for clave, conjunto in bits.items()}, automata
+
+def estado_con(automata, *items):
+    """El único estado LR(0) que contiene todos los ítems (cabeza, cuerpo, punto) dados."""
+    estados, _, _ = automata
+    encontrados = [i for i, estado in enumerate(estados) if all(item in estado for item in items)]
+    assert len(encontrados) == 1
+    return encontrados[0]
+
+
+def test_lalr1_pero_no_slr1():
+    # La gramática clásica de asignaciones: en el estado {S -> L . = R, R -> L .}, Follow(R) tiene '=' y
+    # SLR(1) tiene un conflicto shift/reduce, pero desde ahí R solo puede terminar la cadena
+    gramatica = {'S': [('L', '=', 'R'), ('R',)], 'L': [('*', 'R'), ('id',)], 'R': [('L',)]}
+    assert not es_gramatica_slr1(gramatica, calcular_conjuntos_follow(gramatica, calcular_conjuntos_first(gramatica)))
+    assert es_gramatica_lalr1(gramatica)
+
+    conjuntos, automata = anticipaciones(gramatica)
+    estado = estado_con(automata, ('S', ('L', '=', 'R'), 1), ('R', ('L',), 1))
+    assert conjuntos[(estado, 'R', ('L',))] == {'$'}
+    # Después de '=' o de '*', en cambio, R sí puede seguir con '=' (cuando es parte de un L)
+    estado = estado_con(automata, ('L', ('*', 'R'), 2))
+    assert conjuntos[(estado, 'L', ('*', 'R'))] == {'=', '$'}
+    estado = estado_con(automata, ('S', ('L', '=', 'R'), 3))
+    assert conjuntos[(estado, 'S', ('L', '=', 'R'))] == {'$'}
+
+
+def test_lr1_pero_no_lalr1():
+    # Los estados LR(1) de 'c' después de 'a' y después de 'b' tienen el mismo núcleo: LALR(1) los
+    # fusiona y las anticipaciones de A -> c y B -> c pasan a ser las dos {d, e}
+    gramatica = {
+        'S': [('a', 'A', 'd'), ('b', 'B', 'd'), ('a', 'B', 'e'), ('b', 'A', 'e')],
+        'A': [('c',)],
+        'B': [('c',)],
+    }
+    assert not es_gramatica_lalr1(gramatica)
+
+    conjuntos, automata = anticipaciones(gramatica)
+    estado = estado_con(automata, ('A', ('c',), 1), ('B', ('c',), 1))
+    assert conjuntos[(estado, 'A', ('c',))] == {'d', 'e'}
+    assert conjuntos[(estado, 'B', ('c',))] == {'d', 'e'}
+
+
+def test_anulables():
+    # Lo que sigue a A sale de leer a través de B (reads) y de lo que sigue a S (includes, por T anulable);
+    # después de 'x', de la 'y'. Los dos caminos llegan con 'a' al mismo estado LR(0), asi que se juntan
+    gramatica = {'S': [('A', 'B', 'T'), ('x', 'A', 'y')], 'A': [('a',)], 'B': [('b',), ()], 'T': [('t',), ()]}
+    conjuntos, automata = anticipaciones(gramatica)
+    _, transiciones, _ = automata
+    estado = transiciones[(0, 'a')]
+    assert estado == transiciones[(transiciones[(0, 'x')], 'a')]
+    assert conjuntos[(estado, 'A', ('a',))] == {'b', 't', '$', 'y'}
+    estado = estado_con(automata, ('S', ('A', 'B', 'T'), 1))
+    assert conjuntos[(transiciones[(estado, 'b')], 'B', ('b',))] == {'t', '$'}
+    assert conjuntos[(estado, 'B', ())] == {'t', '$'}
+
+
+def gramatica_al_azar(azar):
+    """Gramática chica al azar, con producciones vacías y recursivas."""
+    no_terminales = ['S'] + list('ABCD'[:azar.randint(0, 4)])
+    terminales = ['a', 'b', 'c', 'd'][:azar.randint(1, 4)]
+    return {no_terminal: list({tuple(azar.choice(no_terminales + terminales) for _ in range(azar.randint(0, 3)))
+                               for _ in range(azar.randint(1, 3))})
+            for no_terminal in no_terminales}
+
+
+@pytest.mark.parametrize('semilla', range(5))
+def test_anticipaciones_incluidas_en_follow(semilla):
+    azar = random.Random(semilla)
+    for _ in range(200):
+        gramatica = gramatica_al_azar(azar)
+        simbolos = TablaSimbolos(gramatica)
+        follow = calcular_follow_bits(gramatica, simbolos, calcular_first_bits(gramatica, simbolos))
+        bits = calcular_anticipaciones_lalr1(gramatica, construir_automata_lr0(gramatica), simbolos)
+        for (_, no_terminal, _), conjunto in bits.items():
+            assert conjunto & ~follow[simbolos.id_no_terminal[no_terminal]] == 0, gramatica
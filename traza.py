@@ -0,0 +1,261 @@
+import sys
+from array import array
+from tablas_compiladas import ACEPTAR
+from simbolos import formatear_produccion, ID_FIN
+
+# Tipos de evento de la traza
+COINCIDIR = 0 # LL(1): el terminal del tope coincide con la entrada
+EXPANDIR = 1  # LL(1): el no terminal del tope se reemplaza por una producción
+DESPLAZAR = 2 # SLR(1): shift
+REDUCIR = 3   # SLR(1): reduce
+ACEPTADA = 4
+ERROR = 5
+
+# Cada evento ocupa CAMPOS enteros seguidos: tipo, posición, símbolo de entrada, tope, valor y profundidad
+CAMPOS = 6
+# Cantidad de eventos que se guardan por defecto (los más recientes)
+CAPACIDAD_TRAZA = 256
+
+
+class Traza:
+    """
+    Registro acotado de los pasos de un parser, para depurar sin pagar el costo de mostrar cada paso.
+
+    Cada paso se guarda como un evento de seis enteros (tipo, posición del token, símbolo de entrada,
+    tope, valor, profundidad de la pila) en un arreglo circular de 'capacidad' eventos: registrar
+    cuesta O(1) y la memoria no depende del largo de la entrada. Los eventos solo se convierten en
+    texto al mostrarlos (formatear, lineas, volcar), asi la traza puede quedar encendida en cada
+    análisis y mostrarse solo cuando uno falla.
+
+    El tope es el código del símbolo del tope de la pila en LL(1) y el estado en SLR(1). El valor es
+    el código de la producción en EXPANDIR y REDUCIR, y el estado destino en DESPLAZAR (-1 en los demás).
+    Los símbolos y producciones se guardan como códigos: los parsers sobre tablas compiladas usan
+    directamente sus ids, y los parsers sobre diccionarios los registran con codigo y codigo_produccion.
+
+    Atributos:
+    - capacidad (int): Cuántos eventos se guardan como máximo (se descartan los más viejos).
+    - total (int): Cuántos eventos se registraron desde el último reiniciar.
+    - ascendente (bool): Si la traza es de un parser SLR(1)/LALR(1) (el tope es un estado).
+    - simbolos (list): código → nombre de cada símbolo.
+    - producciones (list): código → (no_terminal, produccion) de cada producción.
+    - eco (archivo, opcional): Si se da, cada evento se escribe ahí apenas se registra (el modo paso a paso).
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_TRAZA, ascendente=False, simbolos=(), producciones=(), eco=None):
+        self.capacidad = capacidad
+        self.datos = array('q', bytes(8 * CAMPOS * capacidad))
+        self.total = 0
+        self.ascendente = ascendente
+        self.simbolos = list(simbolos)
+        self.producciones = list(producciones)
+        self._id_simbolo = {simbolo: i for i, simbolo in enumerate(self.simbolos)}
+        self._id_produccion = {produccion: i for i, produccion in enumerate(self.producciones)}
+        self.eco = eco
+
+    def __len__(self):
+        return min(self.total, self.capacidad)
+
+    def reiniciar(self):
+        """Descarta los eventos (no los códigos) para empezar la traza de otro análisis."""
+        self.total = 0
+
+    def codigo(self, simbolo):
+        """Devuelve el código del símbolo, registrándolo si es nuevo."""
+        codigo = self._id_simbolo.get(simbolo)
+        if codigo is None:
+            codigo = self._id_simbolo[simbolo] = len(self.simbolos)
+            self.simbolos.append(simbolo)
+        return codigo
+
+    def codigo_produccion(self, no_terminal, produccion):
+        """Devuelve el código de la producción, registrándola si es nueva."""
+        clave = (no_terminal, produccion)
+        codigo = self._id_produccion.get(clave)
+        if codigo is None:
+            codigo = self._id_produccion[clave] = len(self.producciones)
+            self.producciones.append(clave)
+        return codigo
+
+    def registrar(self, tipo, posicion, simbolo, tope, valor, profundidad):
+        """Guarda un evento (ver la clase); si ya hay 'capacidad' eventos, reemplaza al más viejo."""
+        base = self.total % self.capacidad * CAMPOS
+        datos = self.datos
+        datos[base] = tipo
+        datos[base + 1] = posicion
+        datos[base + 2] = simbolo
+        datos[base + 3] = tope
+        datos[base + 4] = valor
+        datos[base + 5] = profundidad
+        self.total += 1
+        if self.eco is not None:
+            print(self.formatear(self.total - 1), file=self.eco)
+
+    def eventos(self, ultimos=None):
+        """
+        Itera los eventos guardados, del más viejo al más reciente.
+
+        Parametros:
+        - ultimos (int, opcional): Solo los últimos 'ultimos' eventos.
+
+        Retorna:
+        - generador de tuplas (paso, tipo, posicion, simbolo, tope, valor, profundidad), con los códigos sin traducir.
+        """
+        cantidad = len(self) if ultimos is None else min(ultimos, len(self))
+        for paso in range(self.total - cantidad, self.total):
+            base = paso % self.capacidad * CAMPOS
+            yield (paso,) + tuple(self.datos[base:base + CAMPOS])
+
+    def formatear(self, paso):
+        """Devuelve el texto de un evento guardado (por su número de paso)."""
+        base = paso % self.capacidad * CAMPOS
+        tipo, posicion, simbolo, tope, valor, profundidad = self.datos[base:base + CAMPOS]
+        if tipo == COINCIDIR:
+            accion = f"Match '{self._nombre(simbolo)}'"
+        elif tipo == EXPANDIR:
+            no_terminal, produccion = self.producciones[valor]
+            accion = f"Produce with {no_terminal} -> {formatear_produccion(produccion)}"
+        elif tipo == DESPLAZAR:
+            accion = f"Shift to state {valor}"
+        elif tipo == REDUCIR:
+            no_terminal, produccion = self.producciones[valor]
+            accion = f"Reduce by {no_terminal} -> {formatear_produccion(produccion)}"
+        elif tipo == ACEPTADA:
+            accion = "Accept"
+        else:
+            accion = "Error"
+        tope = tope if self.ascendente else self._nombre(tope)
+        return f"{paso:>8} {posicion:>8} {self._nombre(simbolo):<12} {tope!s:<12} {profundidad:>6}  {accion}"
+
+    def encabezado(self):
+        """Devuelve la línea de títulos de las columnas de formatear."""
+        tope = 'STATE' if self.ascendente else 'TOP'
+        return f"{'STEP':>8} {'POS':>8} {'INPUT':<12} {tope:<12} {'DEPTH':>6}  ACTION"
+
+    def lineas(self, ultimos=None):
+        """Itera el texto de los eventos guardados (o de los últimos 'ultimos'), del más viejo al más reciente."""
+        for evento in self.eventos(ultimos):
+            yield self.formatear(evento[0])
+
+    def volcar(self, ultimos=None, archivo=None):
+        """
+        Escribe el encabezado y los eventos guardados (o los últimos 'ultimos').
+
+        Parametros:
+        - ultimos (int, opcional): Cuántos eventos mostrar; por defecto, todos los guardados.
+        - archivo (archivo, opcional): Dónde escribir; por defecto, la salida estándar.
+        """
+        archivo = archivo or sys.stdout
+        print(self.encabezado(), file=archivo)
+        for linea in self.lineas(ultimos):
+            print(linea, file=archivo)
+
+    def _nombre(self, codigo):
+        if 0 <= codigo < len(self.simbolos) and self.simbolos[codigo] is not None:
+            return self.simbolos[codigo]
+        return '?'
+
+
+def crear_traza_ll1(tabla, capacidad=CAPACIDAD_TRAZA):
+    """
+    Crea una traza para parse_ll1_trazado con la tabla LL(1) compilada dada.
+
+    Los códigos de los símbolos son los mismos de la pila de la tabla: el id de cada terminal,
+    y ancho + id de cada no terminal (ver TablaLL1Compilada).
+    """
+    simbolos = tabla.simbolos
+    nombres = simbolos.terminales + [None] * (tabla.ancho - len(simbolos.terminales)) + simbolos.no_terminales
+    return Traza(capacidad, False, nombres, tabla.producciones)
+
+def crear_traza_slr1(tabla, capacidad=CAPACIDAD_TRAZA):
+    """Crea una traza para parse_slr1_trazado con las tablas SLR(1) (o LALR(1)) compiladas dadas."""
+    return Traza(capacidad, True, tabla.simbolos.terminales, tabla.producciones)
+
+
+def parse_ll1_trazado(tokens, tabla, traza):
+    """
+    Analiza como parse_ll1_compilado y registra cada paso en la traza (que se reinicia al empezar).
+
+    Usa la tabla sin encadenar (celdas y cuerpos), asi cada expansión es un evento.
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaLL1Compilada): La tabla compilada.
+    - traza (Traza): Una traza creada con crear_traza_ll1(tabla).
+
+    Retorna:
+    - bool: True si la cadena es aceptada, False si no lo es.
+    """
+    ancho = tabla.ancho
+    celdas = tabla.celdas
+    cuerpos = tabla.cuerpos
+    registrar = traza.registrar
+    traza.reiniciar()
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    posicion = 0
+    pila = [ID_FIN, tabla.inicial]
+    while True:
+        tope = pila[-1]
+        if tope < ancho:
+            if tope != actual:
+                registrar(ERROR, posicion, actual, tope, -1, len(pila))
+                return False
+            if tope == ID_FIN:
+                registrar(ACEPTADA, posicion, actual, tope, -1, len(pila))
+                return True
+            registrar(COINCIDIR, posicion, actual, tope, -1, len(pila))
+            pila.pop()
+            posicion += 1
+            actual = next(entrada, ID_FIN)
+        else:
+            p = celdas[(tope - ancho) * ancho + actual]
+            if p < 0:
+                registrar(ERROR, posicion, actual, tope, -1, len(pila))
+                return False
+            registrar(EXPANDIR, posicion, actual, tope, p, len(pila))
+            pila.pop()
+            pila.extend(cuerpos[p])
+
+def parse_slr1_trazado(tokens, tabla, traza):
+    """
+    Analiza como parse_slr1_compilado y registra cada paso en la traza (que se reinicia al empezar).
+
+    Parametros:
+    - tokens (iterable): Ids de los terminales de entrada, sin el '$' final.
+    - tabla (TablaSLR1Compilada): Las tablas compiladas.
+    - traza (Traza): Una traza creada con crear_traza_slr1(tabla).
+
+    Retorna:
+    - bool: True si la cadena es aceptada, False si hay error sintáctico.
+    """
+    ancho = tabla.ancho
+    acciones = tabla.acciones
+    ancho_goto = tabla.ancho_goto
+    goto = tabla.goto
+    cabezas = tabla.cabezas
+    longitudes = tabla.longitudes
+    registrar = traza.registrar
+    traza.reiniciar()
+
+    entrada = iter(tokens)
+    actual = next(entrada, ID_FIN)
+    posicion = 0
+    pila = [0]
+    while True:
+        estado = pila[-1]
+        accion = acciones[estado * ancho + actual]
+        if accion > 0:
+            registrar(DESPLAZAR, posicion, actual, estado, accion - 1, len(pila))
+            pila.append(accion - 1)
+            posicion += 1
+            actual = next(entrada, ID_FIN)
+        elif accion < ACEPTAR:
+            p = -accion - 1
+            registrar(REDUCIR, posicion, actual, estado, p, len(pila))
+            if longitudes[p]:
+                del pila[-longitudes[p]:]
+            pila.append(goto[pila[-1] * ancho_goto + cabezas[p]])
+        else:
+            registrar(ACEPTADA if accion == ACEPTAR else ERROR, posicion, actual, estado, -1, len(pila))
+            return accion == ACEPTAR
@@ -0,0 +1,122 @@
+from first import calcular_anulables
+from grafos import propagar_en_digrafo
+from verificador_slr1 import construir_automata_lr0, llenar_tablas_lr
+from simbolos import TablaSimbolos, cuerpo, FIN
+from estadisticas import medido
+
+@medido('anticipaciones_lalr1')
+def calcular_anticipaciones_lalr1(gramatica, automata, simbolos):
+    """
+    Calcula los símbolos de anticipación LALR(1) de cada reduce con las relaciones de DeRemer y Pennello.
+
+    En vez de construir el autómata LR(1) canónico y fusionar sus estados, se trabaja sobre las
+    transiciones con no terminal (p, A) del mismo autómata LR(0) que usa SLR(1):
+    - DR(p, A): los terminales que se pueden leer justo despues de ir de p con A.
+    - (p, A) reads (r, C): r = GOTO(p, A) y C es anulable, asi que lo que se lee despues de C
+      también puede seguir a A. Read(p, A) = DR(p, A) ∪ Read de todo lo que lee.
+    - (p, A) includes (p', B): B -> βAγ con γ anulable y p' lleva a p leyendo β, asi que lo que
+      sigue a B desde p' también sigue a A desde p. Follow(p, A) = Read(p, A) ∪ Follow de lo que incluye.
+    - (q, A -> ω) lookback (p, A): p lleva a q leyendo ω. La anticipación del reduce por A -> ω
+      en q es la unión de los Follow(p, A) de sus lookback.
+    Read y Follow se resuelven con propagar_en_digrafo (una pasada por componente fuertemente conexa).
+
+    Parametros:
+    - gramatica (dict): La gramática del lenguaje.
+    - automata (tuple): El resultado de construir_automata_lr0(gramatica).
+    - simbolos (TablaSimbolos): La tabla de símbolos con la que se expresan las anticipaciones.
+
+    Retorna:
+    - dict: (estado, no_terminal, produccion) → bitmask de los terminales con los que se reduce.
+    """
+    estados, transiciones, _ = automata
+    anulables = calcular_anulables(gramatica)
+
+    # Las transiciones con no terminal, numeradas, y los terminales que se pueden leer en cada estado
+    numero = {}
+    lectura = [0] * len(estados)
+    salidas_anulables = [[] for _ in estados] # Por estado, las transiciones con no terminales anulables
+    for i, simbolo in transiciones:
+        if simbolo in gramatica:
+            numero[(i, simbolo)] = len(numero)
+            if simbolo in anulables:
+                salidas_anulables[i].append(numero[(i, simbolo)])
+        else:
+            lectura[i] |= simbolos.bit(simbolo)
+    pares = list(numero)
+
+    # DR y reads. Despues de S desde el estado inicial se puede leer '$' (el ítem S' -> S. del accept)
+    directos = [0] * len(pares)
+    lee = [None] * len(pares)
+    for k, (p, no_terminal) in enumerate(pares):
+        r = transiciones[(p, no_terminal)]
+        directos[k] = lectura[r]
+        if p == 0 and no_terminal == 'S':
+            directos[k] |= simbolos.bit(FIN)
+        lee[k] = salidas_anulables[r]
+    read = propagar_en_digrafo(range(len(pares)), lee, directos)
+
+    # includes y lookback, recorriendo cada producción de B desde cada p' con transición (p', B)
+    incluye = [[] for _ in pares]
+    lookback = {} # (estado, no_terminal, produccion) → transiciones (p, A) cuyo Follow recibe
+    for k, (origen, cabeza) in enumerate(pares):
+        for produccion in gramatica[cabeza]:
+            simbolos_prod = cuerpo(produccion)
+            # anulable_desde[i]: si todo lo que sigue a la posición i de la producción es anulable
+            anulable_desde = [True] * (len(simbolos_prod) + 1)
+            for i in range(len(simbolos_prod) - 1, -1, -1):
+                anulable_desde[i] = anulable_desde[i + 1] and simbolos_prod[i] in anulables
+
+            estado = origen
+            for i, simbolo in enumerate(simbolos_prod):
+                if simbolo in gramatica and anulable_desde[i + 1]:
+                    incluye[numero[(estado, simbolo)]].append(k)
+                estado = transiciones[(estado, simbolo)]
+            lookback.setdefault((estado, cabeza, produccion), []).append(k)
+    follow = propagar_en_digrafo(range(len(pares)), incluye, read)
+
+    anticipaciones = {}
+    for clave, origenes in lookback.items():
+        bits = 0
+        for k in origenes:
+            bits |= follow[k]
+        anticipaciones[clave] = bits
+    return anticipaciones
+
+
+def analizar_lalr1(gramatica, simbolos=None):
+    """
+    Construye las tablas ACTION y GOTO LALR(1) y la lista de conflictos.
+
+    Usa el mismo autómata LR(0) que SLR(1), asi que las tablas tienen el mismo tamaño y formato
+    (y se analizan con los mismos parsers: parse_slr1, parse_slr1_compilado, ...). Solo cambia la
+    anticipación de cada reduce, que en vez de Follow(A) es el conjunto, más preciso, que calcula
+    calcular_anticipaciones_lalr1. Los conflictos se resuelven igual que en analizar_slr1.
+
+    Parametros:
+    - gramatica (dict): La gramática del lenguaje.
+    - simbolos (TablaSimbolos, opcional): La tabla de símbolos a usar. Si no se da, se crea una.
+
+    Retorna:
+    - (tabla_acciones, tabla_goto, conflictos): Como en analizar_slr1. La lista de conflictos
+      está vacía si y solo si la gramática es LALR(1).
+    """
+    if simbolos is None:
+        simbolos = TablaSimbolos(gramatica)
+    automata = construir_automata_lr0(gramatica)
+    anticipaciones = calcular_anticipaciones_lalr1(gramatica, automata, simbolos)
+    return llenar_tablas_lr(gramatica, automata, simbolos,
+                            lambda i, no_terminal, produccion: anticipaciones.get((i, no_terminal, produccion), 0))
+
+
+def es_gramatica_lalr1(gramatica):
+    """
+    Verifica si una gramática dada es LALR(1).
+
+    Parametros:
+    - gramatica (dict): La gramática del lenguaje.
+
+    Retorna:
+    - bool: True si la gramática es LALR(1), False si no.
+    """
+    _, _, conflictos = analizar_lalr1(gramatica)
+    return not conflictos
@@ -1,3 +1,7 @@
+from simbolos import VistaConjuntos, como_bits, BIT_EPSILON, EPSILON
+from estadisticas import medido
+
+@medido('ll1')
 def es_gramatica_ll1(gramatica, conjuntos_first, conjuntos_follow):
     """
     Verifica si una gramática dada cumple con las condiciones para ser LL(1).
@@ -8,6 +12,8 @@ def es_gramatica_ll1(gramatica, conjuntos_first, conjuntos_follow):
     2. Si una de las producciones puede derivar en épsilon (ej: β ->* e), entonces
        First(α) y Follow(A) deben ser disjuntos.
 
+    Las comparaciones se hacen sobre los conjuntos en forma de bitmask (ver simbolos.py).
+
     Parametros:
     - gramatica (dict): La gramática en forma de diccionario.
     - conjuntos_first (dict): Los conjuntos First precalculados.
@@ -16,34 +22,47 @@ def es_gramatica_ll1(gramatica, conjuntos_first, conjuntos_follow):
     Retorna:
     - bool: True si la gramática es LL(1), False en caso contrario.
     """
+    simbolos, first_bits = como_bits(conjuntos_first, gramatica)
+    _, follow_bits = como_bits(conjuntos_follow, gramatica, simbolos)
 
     for no_terminal, producciones in gramatica.items():
-        # Condición 1: First(α) y First(β) deben ser disjuntos para A -> α | β 
-        # Comparamos cada par distinto de producciones de un mismo no-terminal
-        for i in range(len(producciones)):
-            for j in range(i + 1, len(producciones)):
-                p1 = producciones[i]
-                p2 = producciones[j]
-                first_p1 = calcular_first_de_produccion(p1, conjuntos_first)
-                first_p2 = calcular_first_de_produccion(p2, conjuntos_first)
-                
-                # Condición 1: La intersección de los First de dos producciones debe ser vacía.
-                if not first_p1.isdisjoint(first_p2):
-                    # Si ambas derivan en 'e', el conflicto real es First/Follow, no First/First.
-                    if 'e' in first_p1 and 'e' in first_p2:
-                        continue
-                    return False
-
-                # Condición 2: Si una producción deriva en 'e', su First no puede intersectar el Follow del no-terminal.
-                # (Esta condición se simplifica al verificar First(A) y Follow(A) al final)
-    
-        # Si un no-terminal puede derivar en épsilon, su conjunto First y Follow no deben tener elementos en común.
-        if 'e' in conjuntos_first[no_terminal]:
-            if not conjuntos_first[no_terminal].isdisjoint(conjuntos_follow[no_terminal]):
-                return False
-                
+        if not no_terminal_es_ll1(no_terminal, producciones, simbolos, first_bits, follow_bits):
+            return False
     return True
 
+def no_terminal_es_ll1(no_terminal, producciones, simbolos, first_bits, follow_bits):
+    """
+    Verifica las dos condiciones LL(1) (ver es_gramatica_ll1) para las producciones de un solo no terminal.
+
+    Parametros:
+    - no_terminal (str): El no terminal.
+    - producciones (list): Sus producciones.
+    - simbolos (TablaSimbolos): La tabla de símbolos de la gramática.
+    - first_bits (list), follow_bits (list): Los bitmasks First y Follow, indexados por id.
+
+    Retorna:
+    - bool: True si ninguna de sus celdas de la tabla LL(1) tiene conflicto.
+    """
+    # El First de cada producción se calcula una sola vez
+    firsts = [first_de_produccion_bits(p, simbolos, first_bits) for p in producciones]
+
+    # Condición 1: First(α) y First(β) deben ser disjuntos para A -> α | β 
+    # Comparamos cada par distinto de producciones de un mismo no-terminal
+    for i in range(len(firsts)):
+        for j in range(i + 1, len(firsts)):
+            comunes = firsts[i] & firsts[j]
+            # Condición 1: La intersección de los First de dos producciones debe ser vacía.
+            # Si ambas derivan en 'e', el conflicto real es First/Follow, no First/First.
+            if comunes and not comunes & BIT_EPSILON:
+                return False
+
+            # Condición 2: Si una producción deriva en 'e', su First no puede intersectar el Follow del no-terminal.
+            # (Esta condición se simplifica al verificar First(A) y Follow(A) al final)
+
+    # Si un no-terminal puede derivar en épsilon, su conjunto First y Follow no deben tener elementos en común.
+    k = simbolos.id_no_terminal[no_terminal]
+    return not (first_bits[k] & BIT_EPSILON and first_bits[k] & follow_bits[k])
+
 def calcular_first_de_produccion(produccion, conjuntos_first):
     """
     Calcula el conjunto First para una cadena de símbolos específica (una producción).
@@ -55,9 +74,14 @@ def calcular_first_de_produccion(produccion, conjuntos_first):
     Retorna:
     - set: El conjunto First de la cadena de producción.
     """
+    # Si los First vienen como vista de bitmasks, se calcula con bits y se decodifica solo el resultado
+    if isinstance(conjuntos_first, VistaConjuntos):
+        simbolos = conjuntos_first.simbolos
+        return simbolos.a_conjunto(first_de_produccion_bits(produccion, simbolos, conjuntos_first.bits))
+
     # Caso base: Si la producción es directamente 'e', su First es {e}.
-    if produccion == 'e':
-        return {'e'}
+    if produccion == EPSILON:
+        return {EPSILON}
     
     first_set = set()
     todos_tienen_epsilon = True
@@ -66,15 +90,40 @@ def calcular_first_de_produccion(produccion, conjuntos_first):
         simbolo_first = conjuntos_first.get(simbolo, {simbolo})
         
         # Agrega todo el First del símbolo actual, excepto épsilon
-        first_set.update(simbolo_first - {'e'})
+        first_set.update(simbolo_first - {EPSILON})
         
         # Si el símbolo actual no puede producir épsilon entonces la producción completa no puede derivar en épsilon y detenemos el análisis de esta producción
-        if 'e' not in simbolo_first:
+        if EPSILON not in simbolo_first:
             todos_tienen_epsilon = False
             break
             
     # Si todos los símbolos en la producción pueden derivar en épsilon, entonces la producción entera puede hacerlo.
     if todos_tienen_epsilon:
-        first_set.add('e')
+        first_set.add(EPSILON)
         
-    return first_set
\ No newline at end of file
+    return first_set
+
+def first_de_produccion_bits(produccion, simbolos, first_bits):
+    """
+    Calcula el First de una producción como bitmask.
+
+    Parametros:
+    - produccion (str): La cadena de producción a analizar.
+    - simbolos (TablaSimbolos): La tabla de símbolos de la gramática.
+    - first_bits (list): El bitmask First de cada no terminal, indexado por id.
+
+    Retorna:
+    - int: El bitmask First de la producción (con el bit de 'e' si puede derivar en épsilon).
+    """
+    id_no_terminal = simbolos.id_no_terminal
+    resultado = 0
+    for simbolo in produccion:
+        # First del símbolo actual: el suyo si es no-terminal, o él mismo si es terminal
+        id_simbolo = id_no_terminal.get(simbolo)
+        simbolo_first = first_bits[id_simbolo] if id_simbolo is not None else simbolos.bit(simbolo)
+        resultado |= simbolo_first & ~BIT_EPSILON
+        # Si el símbolo no puede producir épsilon, la producción tampoco
+        if not simbolo_first & BIT_EPSILON:
+            return resultado
+    # Todos los símbolos pueden derivar en épsilon
+    return resultado | BIT_EPSILON
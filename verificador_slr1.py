@@ -1,38 +1,69 @@
-def closure(items, gramatica):
+from simbolos import como_bits, cuerpo, FIN
+from estadisticas import activas, medido
+
+def calcular_cierres(gramatica):
+    """
+    Calcula, una sola vez por gramática, el aporte de cada no-terminal a una cerradura.
+
+    Si un ítem tiene el punto justo antes de B, la cerradura añade [B -> .γ] para cada
+    producción de B y, recursivamente, los ítems de los no-terminales con los que empiezan
+    esas producciones. Ese conjunto depende solo de B, así que se calcula aquí y luego
+    closure lo reutiliza con una unión en vez de repetir el recorrido.
+
+    Parametros:
+    - gramatica (dict): La gramática del lenguaje.
+
+    Retorna:
+    - dict: no_terminal → frozenset de ítems (cabeza, cuerpo, 0) que aporta a la cerradura.
+    """
+    # No-terminales con los que empieza directamente alguna producción de cada no-terminal
+    iniciales = {nt: {cuerpo(p)[0] for p in producciones if cuerpo(p)} & gramatica.keys()
+                 for nt, producciones in gramatica.items()}
+
+    cierres = {}
+    for no_terminal in gramatica:
+        # Recorrido en profundidad (iterativo) de los no-terminales alcanzables por la izquierda
+        alcanzados = {no_terminal}
+        pendientes = [no_terminal]
+        while pendientes:
+            for siguiente in iniciales[pendientes.pop()]:
+                if siguiente not in alcanzados:
+                    alcanzados.add(siguiente)
+                    pendientes.append(siguiente)
+        cierres[no_terminal] = frozenset((nt, p, 0) for nt in alcanzados for p in gramatica[nt])
+    return cierres
+
+
+def closure(items, gramatica, cierres=None):
     """
     Calcula la cerradura (closure) de un conjunto de ítems LR(0).
 
     La cerradura expande un conjunto de ítems. Si un ítem tiene el punto '.'
     justo antes de un no-terminal (ej: [A -> α.Bβ]), se añaden todos los
-    ítems correspondientes a las producciones de ese no-terminal (ej: [B -> .γ]).
-    Este proceso se repite hasta que no se puedan añadir más ítems.
+    ítems correspondientes a las producciones de ese no-terminal (ej: [B -> .γ]),
+    y así sucesivamente. Ese aporte de cada no-terminal ya viene calculado en 'cierres',
+    de modo que basta con una pasada sobre los ítems iniciales.
 
     Parametros:
     - items (set): Un conjunto de ítems LR(0) iniciales. Un ítem es una tupla (cabeza, cuerpo, pos_punto).
     - gramatica (dict): La gramática del lenguaje.
+    - cierres (dict, opcional): El resultado de calcular_cierres(gramatica). Si no se da, se calcula.
 
     Retorna:
     - set: El conjunto de ítems LR(0) cerrado y completo.
     """
+    if cierres is None:
+        cierres = calcular_cierres(gramatica)
+
     cerrado = set(items)
-    cambios = True
-    while cambios:
-        cambios = False
-        # Se itera sobre una copia de la lista para poder modificar el conjunto 'cerrado' durante la iteración
-        for (no_terminal, produccion, punto) in list(cerrado):
-            # Si el punto no está al final y le sigue un no-terminal (ej: [A -> α.Bβ])
-            if punto < len(produccion) and produccion[punto] in gramatica:
-                siguiente_no_terminal = produccion[punto] # Obtiene el no-terminal que sigue al punto
-                # ...añadir todas las producciones de ese no-terminal al conjunto de ítems.
-                for prod_cuerpo in gramatica[siguiente_no_terminal]:
-                    item = (siguiente_no_terminal, prod_cuerpo, 0) # crea un nuevo ítem con el punto al inicio (ej: [B -> .γ])
-                    if item not in cerrado:
-                        cerrado.add(item)
-                        cambios = True
+    for (no_terminal, produccion, punto) in items:
+        # Si el punto no está al final y le sigue un no-terminal (ej: [A -> α.Bβ]), se añade su aporte
+        if punto < len(cuerpo(produccion)) and produccion[punto] in gramatica:
+            cerrado |= cierres[produccion[punto]]
     return cerrado
 
 
-def goto(items, simbolo, gramatica):
+def goto(items, simbolo, gramatica, cierres=None):
     """
     Calcula la función de transición GOTO para un conjunto de ítems y un símbolo.
 
@@ -42,106 +73,266 @@ def goto(items, simbolo, gramatica):
     de este nuevo conjunto de ítems.
 
     Representa el movimiento de un estado a otro al leer el símbolo 'X'.
+    Para recorrer todas las transiciones de un estado es mejor usar agrupar_sucesores.
 
     Parametros:
     - items (set): El conjunto de ítems LR(0) actual (un estado).
     - simbolo (str): El símbolo de transición (terminal o no-terminal).
     - gramatica (dict): La gramática del lenguaje.
+    - cierres (dict, opcional): El resultado de calcular_cierres(gramatica).
 
     Retorna:
     - set: El nuevo conjunto de ítems (el nuevo estado) tras la transición.
     """
-    # Inicializa un conjunto para almacenar los ítems que resultan de mover el punto.
-    nuevos_items = set()
-    for (no_terminal, produccion, punto) in items:
-        # Si el punto no está al final y si el símbolo después del punto coincide con el 'simbolo' de transición que estamos buscando
-        # Ejemplo: Si tenemos [A -> α.Xβ] y 'simbolo' es 'X'.
-        if punto < len(produccion) and produccion[punto] == simbolo:
-            # Si coincide, crea un nuevo ítem moviendo el punto una posición a la derecha
-            nuevos_items.add((no_terminal, produccion, punto + 1))
-    
+    nuevos_items = agrupar_sucesores(items).get(simbolo, ())
     # Devolvemos la cerradura del nuevo conjunto de ítems.
-    return closure(nuevos_items, gramatica)
+    return closure(nuevos_items, gramatica, cierres)
 
 
-def es_gramatica_slr1(gramatica, conjuntos_follow):
+def agrupar_sucesores(items):
     """
-    Verifica si una gramática dada es SLR(1).
+    Agrupa en una sola pasada los ítems de un estado según el símbolo que sigue al punto.
 
-    Construye la colección canónica de ítems LR(0) (los estados del autómata)
-    y luego verifica en cada estado si existen conflictos de tipo Shift/Reduce
-    o Reduce/Reduce.
+    Para cada símbolo X que aparece tras el punto se obtiene el núcleo de GOTO(I, X):
+    los ítems [A -> αX.β] que resultan de mover el punto. Los símbolos que no aparecen
+    tras ningún punto no generan entrada, así que no hay GOTO vacíos que descartar.
+
+    Parametros:
+    - items (set): El conjunto de ítems LR(0) actual (un estado).
+
+    Retorna:
+    - dict: símbolo → lista de ítems con el punto movido (el núcleo del estado destino).
+    """
+    grupos = {}
+    for (no_terminal, produccion, punto) in items:
+        if punto < len(cuerpo(produccion)):
+            grupos.setdefault(produccion[punto], []).append((no_terminal, produccion, punto + 1))
+    return grupos
+
+
+@medido('automata_lr0')
+def construir_automata_lr0(gramatica):
+    """
+    Construye la colección canónica de ítems LR(0) (los estados del autómata) de la gramática aumentada.
+
+    Cada estado se identifica por su núcleo (kernel): los ítems que lo originan, antes de la cerradura.
+    Los núcleos se guardan como frozenset en un diccionario núcleo → número de estado, asi saber si
+    un estado ya existe (y cual es su número) cuesta O(1) en vez de comparar contra toda la lista.
 
     Parametros:
     - gramatica (dict): La gramática del lenguaje.
-    - conjuntos_follow (dict): Los conjuntos Follow precalculados.
 
     Retorna:
-    - bool: True si la gramática es SLR(1), False si no.
+    - (estados, transiciones, simbolo_inicial_aumentado):
+      - estados (list): Los conjuntos de ítems LR(0), indexados por número de estado (el 0 es el inicial).
+      - transiciones (dict): (estado, símbolo) → estado destino.
+      - simbolo_inicial_aumentado (str): El no terminal S' añadido para aumentar la gramática.
     """
     # Aumentar la gramática con una nueva regla inicial S' -> S
     gramatica_aumentada = gramatica.copy()
     simbolo_inicial_aumentado = "S'"
     if simbolo_inicial_aumentado in gramatica:
-        simbolo_inicial_aumentado = "S''"
-    
-    gramatica_aumentada[simbolo_inicial_aumentado] = ['S']
-
-    # Generar todos los estados del autómata LR(0)
-    estado_inicial = closure({(simbolo_inicial_aumentado, 'S', 0)}, gramatica_aumentada)
-    estados = [estado_inicial]
-    pendientes = [estado_inicial]
-
-    while pendientes:
-        estado_actual = pendientes.pop(0)
-        simbolos = list(gramatica.keys()) + list(set(c for prod_list in gramatica.values() for p in prod_list for c in p if c not in gramatica and c != 'e'))
-
-         # Para cada posible símbolo de transición
-        for simbolo in simbolos:
-            # Calcula el siguiente estado al que se transiciona con este símbolo
-            nuevo_estado = goto(estado_actual, simbolo, gramatica_aumentada)
-            if nuevo_estado and nuevo_estado not in estados:
-                estados.append(nuevo_estado) # lo añade a la lista de estados generados
-                pendientes.append(nuevo_estado) # y lo añade a la cola para procesar sus transiciones.
-
-    # --- Verificar cada estado en busca de conflictos
-    for estado in estados:
-        items_reduce = [] # Lista para almacenar los no-terminales que pueden reducirse en este estado
-        simbolos_shift = set()  # Conjunto de símbolos por los que se puede hacer 'shift' en este estado
-
-        # Separar los ítems del estado en acciones de shift y de reduce
-        for (no_terminal, produccion, punto) in estado:
-             # Caso especial: Si la producción es 'e', siempre es un ítem de reducción
-            if produccion == 'e':
-                 # Solo se añade si no es el símbolo inicial aumentado (S' -> S)
-                if no_terminal != simbolo_inicial_aumentado:
-                    items_reduce.append(no_terminal)
-                continue
-
-            # Si el punto no está al final de la producción es un ítem de Shift
-            if punto < len(produccion):
-                simbolo_siguiente = produccion[punto]  # Obtiene el símbolo que sigue al punto
-                if simbolo_siguiente not in gramatica:
-                    simbolos_shift.add(simbolo_siguiente)  # lo añade al conjunto de símbolos de shift.
-            else: # El punto está al final, es un ítem de reducción
-                if no_terminal != simbolo_inicial_aumentado:
-                    items_reduce.append(no_terminal)
-
-        # Detección de conflictos
-        # Conflicto Shift/Reduce: si un símbolo de shift está en el Follow de un no-terminal que puede reducirse.
-        for nt_reduce in items_reduce:
-            # Comprueba si la intersección entre los símbolos de shift y el Follow del no-terminal que reduce no es vacía
-            if not simbolos_shift.isdisjoint(conjuntos_follow[nt_reduce]):
-                return False # Conflicto S/R encontrado
-
-        # Conflicto Reduce/Reduce: si hay múltiples no-terminales que pueden reducirse en ese estado y sus Follow sets se solapan
-        if len(items_reduce) > 1:
-             # Se obtienen los conjuntos Follow de todos los no-terminales que pueden reducirse
-            conjuntos_follow_reduce = [conjuntos_follow[nt] for nt in items_reduce]
-             # Compara cada par de conjuntos Follow
-            for r_i in range(len(conjuntos_follow_reduce)):
-                for r_j in range(r_i + 1, len(conjuntos_follow_reduce)):
-                    if not conjuntos_follow_reduce[r_i].isdisjoint(conjuntos_follow_reduce[r_j]):
-                        return False # Conflicto R/R encontrado
-                        
-    return True # Si no se encontraron conflictos, la gramática es SLR(1)
\ No newline at end of file
+        simbolo_inicial_aumentado = "S''" # Evita colisión de nombres
+
+    gramatica_aumentada[simbolo_inicial_aumentado] = [('S',)]
+
+    # El aporte a la cerradura de cada no-terminal se calcula una sola vez para toda la construcción
+    cierres = calcular_cierres(gramatica_aumentada)
+
+    # Orden fijo de los símbolos (no terminales y luego terminales, en orden de aparición), para que
+    # la numeración de los estados no dependa del orden de iteración de los conjuntos
+    orden_simbolos = {}
+    for nt in gramatica_aumentada:
+        orden_simbolos.setdefault(nt, len(orden_simbolos))
+    for prod_list in gramatica.values():
+        for p in prod_list:
+            for c in cuerpo(p):
+                orden_simbolos.setdefault(c, len(orden_simbolos))
+
+    # Estado inicial: closure de S' → •S
+    nucleo_inicial = frozenset({(simbolo_inicial_aumentado, ('S',), 0)})
+    estados = [closure(nucleo_inicial, gramatica_aumentada, cierres)]
+    ids_estados = {nucleo_inicial: 0} # Registro núcleo → número de estado
+    transiciones = {}
+
+    # Los estados se procesan en orden de creación: 'i' recorre la lista mientras esta crece
+    i = 0
+    while i < len(estados):
+        # Una sola pasada por los ítems da el núcleo de cada GOTO no vacío del estado
+        grupos = agrupar_sucesores(estados[i])
+        for simbolo in sorted(grupos, key=orden_simbolos.__getitem__):
+            nucleo = frozenset(grupos[simbolo])
+            j = ids_estados.get(nucleo)
+            if j is None:
+                # Es un estado nuevo: solo ahora calculamos su cerradura y lo registramos
+                j = len(estados)
+                ids_estados[nucleo] = j
+                estados.append(closure(nucleo, gramatica_aumentada, cierres))
+            transiciones[(i, simbolo)] = j
+        i += 1
+
+    # Cada estado calcula su cerradura una vez, y cada transición es un GOTO
+    registro = activas()
+    if registro is not None:
+        registro.contar('lr0.estados', len(estados))
+        registro.contar('lr0.closure', len(estados))
+        registro.contar('lr0.goto', len(transiciones))
+        registro.contar('lr0.items', sum(len(estado) for estado in estados))
+    return estados, transiciones, simbolo_inicial_aumentado
+
+
+@medido('tablas_lr')
+def llenar_tablas_lr(gramatica, automata, simbolos, anticipacion):
+    """
+    Llena las tablas ACTION y GOTO de un autómata LR(0) dados los símbolos de anticipación de cada reduce.
+
+    Es la parte común de SLR(1) y LALR(1): los shift, los GOTO y el accept salen directamente del
+    autómata; solo cambia el conjunto de terminales con los que se reduce cada ítem completo.
+    Si una celda de ACTION recibe más de una acción, se registra un conflicto y la tabla conserva
+    la primera acción registrada (los shift se registran antes que los reduce, y los reduce en el
+    orden de las producciones en la gramática).
+
+    Parametros:
+    - gramatica (dict): La gramática del lenguaje.
+    - automata (tuple): El resultado de construir_automata_lr0(gramatica).
+    - simbolos (TablaSimbolos): La tabla de símbolos con la que se expresan las anticipaciones.
+    - anticipacion (callable): (estado, no_terminal, produccion) → bitmask de los terminales con los que se reduce.
+
+    Retorna:
+    - (tabla_acciones, tabla_goto, conflictos): Como en analizar_slr1.
+    """
+    estados, transiciones, simbolo_inicial_aumentado = automata
+
+    # Orden de las producciones en la gramática, para registrar los reduce de forma determinista
+    orden_producciones = {(nt, prod): k for k, (nt, prod) in enumerate((nt, p) for nt in gramatica for p in gramatica[nt])}
+    orden = lambda item: orden_producciones.get(item, -1)
+
+    # Transiciones de cada estado, en el orden en que se crearon
+    sucesores = [{} for _ in estados]
+    for (i, simbolo), j in transiciones.items():
+        sucesores[i][simbolo] = j
+
+    tabla_acciones = {}
+    tabla_goto = {}
+    conflictos = []
+    for i, estado in enumerate(estados):
+        # Ítems completos (o de producción 'e')
+        completos = [(nt, prod) for (nt, prod, punto) in estado if punto == len(cuerpo(prod))]
+        tabla_acciones[i], tabla_goto[i], candidatas = llenar_fila_lr(
+            completos, sucesores[i], gramatica, simbolos, simbolo_inicial_aumentado,
+            lambda no_terminal, produccion: anticipacion(i, no_terminal, produccion), orden)
+        conflictos.extend((i, simbolo, tuple(acciones)) for simbolo, acciones in candidatas.items())
+
+    registro = activas()
+    if registro is not None:
+        registro.contar('tablas_lr.acciones', sum(len(fila) for fila in tabla_acciones.values()))
+        registro.contar('tablas_lr.goto', sum(len(fila) for fila in tabla_goto.values()))
+        registro.contar('tablas_lr.conflictos', len(conflictos))
+    return tabla_acciones, tabla_goto, conflictos
+
+
+def llenar_fila_lr(completos, sucesores, gramatica, simbolos, simbolo_inicial_aumentado, anticipacion, orden):
+    """
+    Llena las filas ACTION y GOTO de un solo estado del autómata LR(0) (ver llenar_tablas_lr).
+
+    Parametros:
+    - completos (iterable): Los ítems completos del estado, como tuplas (no_terminal, produccion).
+    - sucesores (dict): símbolo → estado destino, las transiciones del estado.
+    - gramatica (dict): La gramática del lenguaje.
+    - simbolos (TablaSimbolos): La tabla de símbolos con la que se expresan las anticipaciones.
+    - simbolo_inicial_aumentado (str): El no terminal S' de la gramática aumentada.
+    - anticipacion (callable): (no_terminal, produccion) → bitmask de los terminales con los que se reduce.
+    - orden (callable): Recibe la tupla (no_terminal, produccion) y da la clave con la que se ordenan los reduce.
+
+    Retorna:
+    - (acciones, goto, candidatas): terminal → acción, no_terminal → estado destino, y por cada celda
+      con conflicto, terminal → lista de las acciones que compiten por ella.
+    """
+    terminales = simbolos.terminales
+    acciones = {}
+    fila_goto = {}
+    ocupados = 0 # Bitmask de los terminales que ya tienen acción
+    candidatas = {}
+
+    def registrar(simbolo, accion):
+        if simbolo not in acciones:
+            acciones[simbolo] = accion
+        elif acciones[simbolo] != accion:
+            competidoras = candidatas.setdefault(simbolo, [acciones[simbolo]])
+            if accion not in competidoras:
+                competidoras.append(accion)
+
+    # Shift en terminales y GOTO en no terminales, directamente desde las transiciones
+    for simbolo, j in sucesores.items():
+        if simbolo in gramatica:
+            fila_goto[simbolo] = j
+        else:
+            registrar(simbolo, ('shift', j))
+            ocupados |= simbolos.bit(simbolo)
+
+    # Ítems completos: reduce por cada símbolo de la anticipación, o accept para S' → S.
+    for no_terminal, produccion in sorted(completos, key=orden):
+        if no_terminal == simbolo_inicial_aumentado:
+            registrar(FIN, ('accept', None))
+            ocupados |= simbolos.bit(FIN)
+            continue
+
+        accion = ('reduce', (no_terminal, produccion))
+        bits = anticipacion(no_terminal, produccion)
+        if bits & ocupados:
+            # Alguna celda ya está ocupada: puede haber conflicto, se registra una por una
+            for t in simbolos.ids(bits):
+                registrar(terminales[t], accion)
+        else:
+            # Ninguna celda está ocupada: se llenan directamente
+            for t in simbolos.ids(bits):
+                acciones[terminales[t]] = accion
+        ocupados |= bits
+
+    return acciones, fila_goto, candidatas
+
+
+def analizar_slr1(gramatica, conjuntos_follow):
+    """
+    Construye el autómata LR(0) una sola vez y a partir de él las tablas ACTION y GOTO
+    junto con la lista completa de conflictos SLR(1).
+
+    En SLR(1) cada ítem completo [A -> α.] se reduce con todos los terminales de Follow(A).
+    Si una celda de ACTION recibe más de una acción, se registra un conflicto y la tabla
+    conserva la primera acción registrada (los shift se registran antes que los reduce, y
+    los reduce en el orden de las producciones en la gramática).
+
+    Parametros:
+    - gramatica (dict): La gramática del lenguaje.
+    - conjuntos_follow (dict): Los conjuntos Follow precalculados.
+
+    Retorna:
+    - (tabla_acciones, tabla_goto, conflictos):
+      - tabla_acciones (dict): estado → {terminal: acción}, con acciones ('shift', j),
+        ('reduce', (no_terminal, produccion)) o ('accept', None).
+      - tabla_goto (dict): estado → {no_terminal: estado destino}.
+      - conflictos (list): Tuplas (estado, simbolo, acciones) con todas las acciones que compiten
+        por esa celda. La lista está vacía si y solo si la gramática es SLR(1).
+    """
+    simbolos, follow_bits = como_bits(conjuntos_follow, gramatica)
+    id_no_terminal = simbolos.id_no_terminal
+    return llenar_tablas_lr(gramatica, construir_automata_lr0(gramatica), simbolos,
+                            lambda i, no_terminal, produccion: follow_bits[id_no_terminal[no_terminal]])
+
+
+def es_gramatica_slr1(gramatica, conjuntos_follow):
+    """
+    Verifica si una gramática dada es SLR(1).
+
+    Construye el autómata LR(0) y sus tablas con analizar_slr1; la gramática es SLR(1)
+    si no aparece ningún conflicto de tipo Shift/Reduce o Reduce/Reduce.
+
+    Parametros:
+    - gramatica (dict): La gramática del lenguaje.
+    - conjuntos_follow (dict): Los conjuntos Follow precalculados.
+
+    Retorna:
+    - bool: True si la gramática es SLR(1), False si no.
+    """
+    _, _, conflictos = analizar_slr1(gramatica, conjuntos_follow)
+    return not conflictos